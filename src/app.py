@@ -3,25 +3,89 @@ import webbrowser
 import os
 
 from sqlalchemy import false
-from db import db
+from db import db, engine_options_for, configure_sqlite_pragmas, DEFAULT_SQLITE_PRAGMAS
 
 def create_app():
     app = Flask(__name__, static_folder='../img', static_url_path='/img')
-    app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite:///boats.db'
+    # DB 는 환경변수 DATABASE_URL 로 교체 가능 (예: postgresql+psycopg://user:pw@host/db)
+    database_uri = os.environ.get('DATABASE_URL', 'sqlite:///boats.db')
+    app.config['SQLALCHEMY_DATABASE_URI'] = database_uri
     app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
+    app.config['SQLALCHEMY_ENGINE_OPTIONS'] = engine_options_for(
+        database_uri,
+        pool_size=int(os.environ.get('DB_POOL_SIZE', 10)),
+        max_overflow=int(os.environ.get('DB_MAX_OVERFLOW', 20)),
+        pool_timeout=int(os.environ.get('DB_POOL_TIMEOUT', 30)),
+    )
+    app.config['SQLITE_PRAGMAS'] = dict(DEFAULT_SQLITE_PRAGMAS)
+    # 시작 시 미적용 스키마 마이그레이션 자동 실행 (migrations.py)
+    app.config['AUTO_MIGRATE'] = os.environ.get('AUTO_MIGRATE', '1') != '0'
     app.config['SECRET_KEY'] = 'change_this_in_production'
     app.config['DEBUG_LOGGING_ENABLED'] = False
+    # 좌석 변화 감지: 웹훅 URL 이 있으면 변화 이벤트를 POST
+    app.config['SEAT_WATCH_WEBHOOK_URL'] = os.environ.get('SEAT_WATCH_WEBHOOK_URL')
+    app.config['SEAT_WATCH_QUEUE_SIZE'] = 1000
+    # 조회 파이프라인: 페이지 받아오기 스레드 수 / 파싱 프로세스 수. 웹 프로세스는 기본 0 (조회 스레드에서
+    # 파싱), 조회 워커 CLI(services/scrape.py)는 기본으로 CPU 수만큼 파서 프로세스를 띄움
+    app.config['SCRAPE_FETCH_WORKERS'] = int(os.environ.get('SCRAPE_FETCH_WORKERS', 10))
+    app.config['SCRAPE_PARSE_WORKERS'] = int(os.environ.get('SCRAPE_PARSE_WORKERS', 0))
+    app.config['SCRAPE_WORKER_PARSE_WORKERS'] = int(os.environ.get('SCRAPE_WORKER_PARSE_WORKERS', os.cpu_count() or 1))
+    # 동시 요청 한도 자동 조절 (AIMD). SCRAPE_FETCH_WORKERS 는 시작 값, 범위는 MIN~MAX / host 별 최대
+    app.config['SCRAPE_ADAPTIVE_CONCURRENCY'] = os.environ.get('SCRAPE_ADAPTIVE_CONCURRENCY', '1') != '0'
+    app.config['SCRAPE_CONCURRENCY_MIN'] = int(os.environ.get('SCRAPE_CONCURRENCY_MIN', 2))
+    app.config['SCRAPE_CONCURRENCY_MAX'] = int(os.environ.get('SCRAPE_CONCURRENCY_MAX', 64))
+    app.config['SCRAPE_PER_HOST_MAX'] = int(os.environ.get('SCRAPE_PER_HOST_MAX', 6))
+    # 연속 실패 중인 운영사 host 는 잠시 조회하지 않음 (기본: 맨 뒤로 미루기만 함)
+    app.config['SCRAPE_SKIP_DEAD_HOSTS'] = os.environ.get('SCRAPE_SKIP_DEAD_HOSTS', '0') == '1'
+    # 첫 요청이 host 의 p90 응답 시간을 넘기면 중복 요청 (host 별 요청 수의 SCRAPE_HEDGE_BUDGET 비율까지)
+    app.config['SCRAPE_HEDGE_ENABLED'] = os.environ.get('SCRAPE_HEDGE_ENABLED', '0') == '1'
+    app.config['SCRAPE_HEDGE_BUDGET'] = float(os.environ.get('SCRAPE_HEDGE_BUDGET', 0.1))
+    # 바다타임 주간 예보 저장본 재사용 시간(초). 이보다 오래된 날짜는 다시 받아옴
+    app.config['TIDE_FORECAST_TTL'] = int(os.environ.get('TIDE_FORECAST_TTL', 3 * 3600))
+    # 수온 지도 파싱 결과를 port_id 별로 재사용하는 시간(초)
+    app.config['SEA_TEMP_CACHE_TTL'] = int(os.environ.get('SEA_TEMP_CACHE_TTL', 600))
+    # 백그라운드 조회 결과를 날짜/지역별 정적 JSON 으로 게시할 디렉터리 (없으면 게시 안 함)
+    app.config['SNAPSHOT_PUBLISH_DIR'] = os.environ.get('SNAPSHOT_PUBLISH_DIR')
+    app.config['SNAPSHOT_FORMATS'] = tuple(f for f in os.environ.get('SNAPSHOT_FORMATS', 'gzip').split(',') if f)
+    # status.html 이 게시된 파일을 조회 대신 쓰는 최대 경과 시간(초)
+    app.config['SNAPSHOT_MAX_AGE'] = int(os.environ.get('SNAPSHOT_MAX_AGE', 600))
+    # 응답에 조회 단계별 시간(Server-Timing 헤더) 포함 여부. 지표는 /metrics 에서 항상 제공
+    app.config['SERVER_TIMING_ENABLED'] = os.environ.get('SERVER_TIMING_ENABLED', '0') == '1'
+    # 실시간 좌석 변화 채널 (SSE / Web Push). VAPID 키가 없으면 Web Push 는 비활성
+    app.config['LIVE_POLL_INTERVAL'] = 60
+    # 구독 가능한 날짜 범위(오늘~N일 후) / Web Push 구독 유지 시간(초)과 최대 개수
+    app.config['LIVE_MAX_DAYS_AHEAD'] = int(os.environ.get('LIVE_MAX_DAYS_AHEAD', 60))
+    app.config['LIVE_PUSH_TTL'] = int(os.environ.get('LIVE_PUSH_TTL', 7 * 86400))
+    app.config['LIVE_MAX_PUSH_SUBSCRIPTIONS'] = int(os.environ.get('LIVE_MAX_PUSH_SUBSCRIPTIONS', 1000))
+    # 동시 SSE 연결 수 상한(넘으면 503) / SSE 연결 최대 유지 시간, 이벤트 없이 유지하는 시간(초)
+    app.config['LIVE_MAX_SSE_SUBSCRIPTIONS'] = int(os.environ.get('LIVE_MAX_SSE_SUBSCRIPTIONS', 50))
+    app.config['LIVE_SSE_TTL'] = int(os.environ.get('LIVE_SSE_TTL', 3600))
+    app.config['LIVE_SSE_IDLE_TIMEOUT'] = int(os.environ.get('LIVE_SSE_IDLE_TIMEOUT', 900))
+    app.config['VAPID_PUBLIC_KEY'] = os.environ.get('VAPID_PUBLIC_KEY')
+    app.config['VAPID_PRIVATE_KEY'] = os.environ.get('VAPID_PRIVATE_KEY')
+    app.config['VAPID_CLAIMS_SUB'] = os.environ.get('VAPID_CLAIMS_SUB', 'mailto:admin@example.com')
 
     db.init_app(app)
 
+    from services.scrape_engine import init_scrape_engine
+    init_scrape_engine(app)
+    from services.seat_watcher import init_seat_watcher
+    init_seat_watcher(app)
+    from services.live_updates import init_live_updates
+    init_live_updates(app)
+
     from routes.views import views
     app.register_blueprint(views, url_prefix='')
 
     import models
 
     with app.app_context():
+        configure_sqlite_pragmas(db.engine, app.config.get('SQLITE_PRAGMAS'))
         db.create_all()
 
+    from migrations import init_migrations
+    init_migrations(app)
+
     return app
 
 if __name__ == '__main__':
@@ -1,10 +1,76 @@
+from datetime import datetime, timezone
+
 from flask_sqlalchemy import SQLAlchemy
+from sqlalchemy import event
 
 db = SQLAlchemy()
 
+# 잠금 대기 시간(ms): 다른 커넥션이 쓰는 중이면 바로 실패하지 않고 기다림
+SQLITE_BUSY_TIMEOUT_MS = 5000
+
+# 운영용 SQLite 기본 PRAGMA: 읽기/쓰기가 서로 막지 않도록 WAL + 적당한 캐시/타임아웃
+DEFAULT_SQLITE_PRAGMAS = {
+    'journal_mode': 'WAL',
+    'synchronous': 'NORMAL',
+    'busy_timeout': SQLITE_BUSY_TIMEOUT_MS,
+    'cache_size': -20000,        # 음수 = KiB 단위 (약 20MB)
+    'mmap_size': 268435456,      # 256MB
+    'temp_store': 'MEMORY',
+    'foreign_keys': 'ON',
+}
+
+def utc_now() -> datetime:
+    """DB 에 저장하는 시각 기준 (UTC, tzinfo 없는 naive datetime)"""
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+def engine_options_for(uri: str, pool_size: int = 10, max_overflow: int = 20,
+                       pool_timeout: int = 30, busy_timeout_ms: int = SQLITE_BUSY_TIMEOUT_MS) -> dict:
+    """DB URI 에 맞는 SQLALCHEMY_ENGINE_OPTIONS 구성.
+
+    - 파일 SQLite: 멀티스레드 Flask 에서 커넥션을 공유하도록 check_same_thread=False,
+      드라이버 레벨 잠금 대기(timeout) 설정 + QueuePool 크기 지정
+    - 메모리 SQLite: Flask-SQLAlchemy 기본 풀(StaticPool)을 그대로 사용
+    - 그 외(PostgreSQL 등): 커넥션 풀 + pre_ping/recycle
+    """
+    if uri.startswith('sqlite'):
+        if ':memory:' in uri or uri.rstrip('/') in ('sqlite:', 'sqlite:/'):
+            return {}
+        return {
+            'connect_args': {'check_same_thread': False, 'timeout': busy_timeout_ms / 1000},
+            'pool_size': pool_size,
+            'max_overflow': max_overflow,
+            'pool_timeout': pool_timeout,
+        }
+    return {
+        'pool_size': pool_size,
+        'max_overflow': max_overflow,
+        'pool_timeout': pool_timeout,
+        'pool_pre_ping': True,
+        'pool_recycle': 1800,
+    }
+
+def configure_sqlite_pragmas(engine, pragmas: dict):
+    """SQLite 엔진의 새 커넥션마다 PRAGMA 를 적용 (다른 DB 는 무시)"""
+    if engine.dialect.name != 'sqlite' or not pragmas:
+        return
+
+    @event.listens_for(engine, 'connect')
+    def _set_pragmas(dbapi_conn, _record):
+        cursor = dbapi_conn.cursor()
+        try:
+            for key, value in pragmas.items():
+                cursor.execute(f"PRAGMA {key}={value}")
+        finally:
+            cursor.close()
+
+def url_fields(url: str) -> dict:
+    """url 에서 파생 컬럼(host, base_url, parser_type) 계산"""
+    from services.reservation_checker import site_info
+    return site_info(url)
+
 def add_boat_instance(name: str, url: str, city: str, port: str, note: str = None):
     from models import Boat
-    boat = Boat(name=name, url=url, city=city, port=port, note=note)
+    boat = Boat(name=name, url=url, city=city, port=port, note=note, **url_fields(url))
     db.session.add(boat)
     try:
         db.session.commit()
@@ -17,6 +83,30 @@ def get_all_boats():
     from models import Boat
     return Boat.query.order_by(Boat.id).all()
 
+def iter_boats(batch_size: int = 1000):
+    """배 목록을 batch_size 단위로 나누어 읽는 iterator (대량 내보내기용)"""
+    from models import Boat
+    return Boat.query.order_by(Boat.id).yield_per(batch_size)
+
+def get_boats(cities=None):
+    """지역(city) 필터를 DB 쿼리에서 적용하여 배 목록 반환. cities 가 비어 있으면 전체."""
+    from models import Boat
+    query = Boat.query
+    if cities:
+        query = query.filter(Boat.city.in_(list(cities)))
+    return query.order_by(Boat.id).all()
+
+def count_boats_by_city():
+    """지역별 등록 배 수를 GROUP BY 집계로 반환: {city: count} (빈 지역은 제외)"""
+    from models import Boat
+    rows = (
+        db.session.query(Boat.city, db.func.count(Boat.id))
+        .filter(Boat.city.isnot(None), Boat.city != '')
+        .group_by(Boat.city)
+        .all()
+    )
+    return {city: count for city, count in rows}
+
 def get_boat_by_id(boat_id: int):
     from models import Boat
     return Boat.query.get(boat_id)
@@ -34,12 +124,47 @@ def delete_boat(boat_id: int):
         db.session.rollback()
         raise
 
+# SQLite 바인드 변수 제한을 넘지 않도록 IN (...) 목록을 나누는 크기
+_IN_CHUNK_SIZE = 500
+
+def bulk_delete_boats(boat_ids):
+    """여러 배를 하나의 트랜잭션에서 DELETE ... WHERE id IN (...) 로 삭제.
+    (삭제된 id 목록, 존재하지 않던 id 목록)을 반환합니다."""
+    from models import Boat
+    ids = list(dict.fromkeys(int(i) for i in boat_ids))
+    if not ids:
+        return [], []
+
+    table = Boat.__table__
+    use_returning = db.engine.dialect.delete_returning
+    deleted = []
+    try:
+        for start in range(0, len(ids), _IN_CHUNK_SIZE):
+            chunk = ids[start:start + _IN_CHUNK_SIZE]
+            stmt = table.delete().where(table.c.id.in_(chunk))
+            if use_returning:
+                deleted.extend(row[0] for row in db.session.execute(stmt.returning(table.c.id)))
+            else:
+                found = [row[0] for row in db.session.execute(db.select(table.c.id).where(table.c.id.in_(chunk)))]
+                db.session.execute(stmt)
+                deleted.extend(found)
+        db.session.commit()
+    except Exception:
+        db.session.rollback()
+        raise
+
+    deleted_set = set(deleted)
+    return [i for i in ids if i in deleted_set], [i for i in ids if i not in deleted_set]
+
 def update_boat(boat_id: int, name: str, url: str, city: str, port: str, note: str = None):
     from models import Boat
     boat = Boat.query.get(boat_id)
     if not boat:
         raise ValueError("등록된 배를 찾을 수 없습니다.")
     boat.name = name
+    if boat.url != url or not boat.host:
+        for key, value in url_fields(url).items():
+            setattr(boat, key, value)
     boat.url = url
     boat.city = city
     boat.port = port
@@ -49,4 +174,226 @@ def update_boat(boat_id: int, name: str, url: str, city: str, port: str, note: s
         return boat
     except Exception:
         db.session.rollback()
-        raise
\ No newline at end of file
+        raise
+
+def update_parser_types(parser_by_id: dict):
+    """조회에서 선박을 찾아낸 파서 어댑터 이름을 배별로 기억 ({boat_id: parser_type})"""
+    from models import Boat
+    if not parser_by_id:
+        return 0
+    groups = {}
+    for boat_id, parser_type in parser_by_id.items():
+        groups.setdefault(parser_type, []).append(boat_id)
+    try:
+        for parser_type, ids in groups.items():
+            for i in range(0, len(ids), _IN_CHUNK_SIZE):
+                Boat.query.filter(Boat.id.in_(ids[i:i + _IN_CHUNK_SIZE])) \
+                    .update({Boat.parser_type: parser_type}, synchronize_session=False)
+        db.session.commit()
+    except Exception:
+        db.session.rollback()
+        raise
+    return len(parser_by_id)
+
+def _upsert_insert(table):
+    """dialect 별 INSERT ... ON CONFLICT 구문 (SQLite / PostgreSQL)"""
+    dialect = db.engine.dialect.name
+    if dialect == 'sqlite':
+        from sqlalchemy.dialects.sqlite import insert
+    elif dialect == 'postgresql':
+        from sqlalchemy.dialects.postgresql import insert
+    else:
+        return None
+    return insert(table)
+
+def upsert_boats(rows):
+    """배 정보 dict 목록을 이름(name) 기준으로 일괄 upsert 하고 (신규 수, 변경 수) 반환.
+
+    기존 업로드 규칙을 유지: 지역/항구/URL 은 값이 있을 때만, 비고는 None 이 아니면 갱신.
+    host/base_url/parser_type 은 URL 이 바뀐 행(과 신규 행)만 다시 계산합니다.
+    변경이 없는 행은 쓰지 않으며, 한 배치는 하나의 트랜잭션으로 커밋됩니다.
+    """
+    from models import Boat
+    # 같은 배치 안의 중복 이름은 마지막 행 기준
+    by_name = {r['name']: r for r in rows}
+    if not by_name:
+        return 0, 0
+
+    existing, derived = {}, {}
+    for name, city, port, url, note, host, base_url, parser_type in db.session.query(
+            Boat.name, Boat.city, Boat.port, Boat.url, Boat.note, Boat.host, Boat.base_url, Boat.parser_type
+    ).filter(Boat.name.in_(list(by_name))):
+        existing[name] = (city, port, url, note)
+        derived[name] = {'host': host, 'base_url': base_url, 'parser_type': parser_type}
+
+    created, updated = 0, 0
+    to_write = []
+    for name, r in by_name.items():
+        current = existing.get(name)
+        if current is None:
+            created += 1
+            to_write.append(r)
+            continue
+        city, port, url, note = current
+        merged = {
+            'name': name,
+            'city': r.get('city') or city,
+            'port': r.get('port') or port,
+            'url': r.get('url') or url,
+            'note': r['note'] if r.get('note') is not None else note,
+        }
+        if (merged['city'], merged['port'], merged['url'], merged['note']) != current:
+            updated += 1
+            # URL 이 그대로면 파생 컬럼(학습된 parser_type 포함)은 기존 값 유지
+            if merged['url'] == url and derived[name]['host']:
+                merged.update(derived[name])
+            to_write.append(merged)
+
+    if not to_write:
+        return created, updated
+    for r in to_write:
+        if 'host' not in r:
+            r.update(url_fields(r['url']))
+
+    table = Boat.__table__
+    stmt = _upsert_insert(table)
+    try:
+        if stmt is not None:
+            stmt = stmt.on_conflict_do_update(
+                index_elements=[table.c.name],
+                set_={c: stmt.excluded[c] for c in ('city', 'port', 'url', 'note', 'host', 'base_url', 'parser_type')},
+            )
+            db.session.execute(stmt, to_write)
+        else:
+            # ON CONFLICT 를 지원하지 않는 DB: 신규는 INSERT, 기존은 UPDATE 로 executemany
+            from sqlalchemy import bindparam
+            new_rows = [r for r in to_write if r['name'] not in existing]
+            old_rows = [dict(r, b_name=r['name']) for r in to_write if r['name'] in existing]
+            if new_rows:
+                db.session.execute(table.insert(), new_rows)
+            if old_rows:
+                db.session.execute(
+                    table.update().where(table.c.name == bindparam('b_name')).values(
+                        city=bindparam('city'), port=bindparam('port'),
+                        url=bindparam('url'), note=bindparam('note'), host=bindparam('host'),
+                        base_url=bindparam('base_url'), parser_type=bindparam('parser_type')),
+                    old_rows,
+                )
+        db.session.commit()
+    except Exception:
+        db.session.rollback()
+        raise
+    return created, updated
+
+def save_status_snapshots(records):
+    """조회 결과를 (boat_id, query_date) 기준으로 upsert. records 는
+    {boat_id, query_date, scraped_at, tide, parser, error, entries_json} dict 목록"""
+    from models import StatusSnapshot
+    records = list(records)
+    if not records:
+        return 0
+    table = StatusSnapshot.__table__
+    stmt = _upsert_insert(table)
+    try:
+        if stmt is not None:
+            stmt = stmt.on_conflict_do_update(
+                index_elements=[table.c.boat_id, table.c.query_date],
+                set_={c: stmt.excluded[c] for c in ('scraped_at', 'tide', 'parser', 'error', 'entries_json')},
+            )
+            db.session.execute(stmt, records)
+        else:
+            for r in records:
+                db.session.execute(table.delete().where(
+                    (table.c.boat_id == r['boat_id']) & (table.c.query_date == r['query_date'])))
+            db.session.execute(table.insert(), records)
+        db.session.commit()
+    except Exception:
+        db.session.rollback()
+        raise
+    return len(records)
+
+def get_status_snapshots(query_date: str, cities=None):
+    """해당 날짜의 저장된 조회 결과를 (boat, snapshot) 목록으로 반환"""
+    from models import Boat, StatusSnapshot
+    query = db.session.query(Boat, StatusSnapshot).join(StatusSnapshot, StatusSnapshot.boat_id == Boat.id) \
+        .filter(StatusSnapshot.query_date == query_date)
+    if cities:
+        query = query.filter(Boat.city.in_(list(cities)))
+    return query.order_by(Boat.id).all()
+
+def save_tide_forecasts(records):
+    """주간 예보를 (port_id, forecast_date) 기준으로 upsert. records 는
+    {port_id, forecast_date, fetched_at, source_url, rows_json} dict 목록"""
+    from models import TideForecast
+    records = list(records)
+    if not records:
+        return 0
+    table = TideForecast.__table__
+    stmt = _upsert_insert(table)
+    try:
+        if stmt is not None:
+            stmt = stmt.on_conflict_do_update(
+                index_elements=[table.c.port_id, table.c.forecast_date],
+                set_={c: stmt.excluded[c] for c in ('fetched_at', 'source_url', 'rows_json')},
+            )
+            db.session.execute(stmt, records)
+        else:
+            for r in records:
+                db.session.execute(table.delete().where(
+                    (table.c.port_id == r['port_id']) & (table.c.forecast_date == r['forecast_date'])))
+            db.session.execute(table.insert(), records)
+        db.session.commit()
+    except Exception:
+        db.session.rollback()
+        raise
+    return len(records)
+
+def get_tide_forecasts(port_id: int, first_date: str, last_date: str, fetched_after=None):
+    """저장된 항구 예보 중 first_date~last_date 범위 (날짜순). fetched_after 보다 오래된 것은 제외"""
+    from models import TideForecast
+    query = TideForecast.query.filter(TideForecast.port_id == port_id,
+                                      TideForecast.forecast_date >= first_date,
+                                      TideForecast.forecast_date <= last_date)
+    if fetched_after is not None:
+        query = query.filter(TideForecast.fetched_at >= fetched_after)
+    return query.order_by(TideForecast.forecast_date).all()
+
+def save_sea_temp_readings(records):
+    """수온 관측값 추가. records 는 {name, observed, fetched_at, temp_c, lat, lng} dict 목록이며
+    (name, observed) 가 이미 있거나 같은 목록 안에서 겹치면 건너뜀. 실제로 추가한 행 수를 반환"""
+    from models import SeaTempReading
+    unique = {}
+    for r in records:
+        unique.setdefault((r['name'], r['observed']), r)
+    records = list(unique.values())
+    if not records:
+        return 0
+    table = SeaTempReading.__table__
+    stmt = _upsert_insert(table)
+    try:
+        if stmt is not None:
+            result = db.session.execute(
+                stmt.on_conflict_do_nothing(index_elements=[table.c.name, table.c.observed]), records)
+            inserted = result.rowcount
+        else:
+            existing = {
+                (name, observed) for name, observed in db.session.query(SeaTempReading.name, SeaTempReading.observed)
+                .filter(SeaTempReading.name.in_({r['name'] for r in records}))
+            }
+            new_rows = [r for r in records if (r['name'], r['observed']) not in existing]
+            if new_rows:
+                db.session.execute(table.insert(), new_rows)
+            inserted = len(new_rows)
+        db.session.commit()
+    except Exception:
+        db.session.rollback()
+        raise
+    return inserted
+
+def get_sea_temp_history(since, names=None):
+    """since 이후 받아온 수온 기록 (관측소, 시각 순)"""
+    from models import SeaTempReading
+    query = SeaTempReading.query.filter(SeaTempReading.fetched_at >= since)
+    if names:
+        query = query.filter(SeaTempReading.name.in_(list(names)))
+    return query.order_by(SeaTempReading.name, SeaTempReading.fetched_at).all()
@@ -0,0 +1,258 @@
+"""버전 관리되는 스키마 마이그레이션.
+
+db.create_all()은 새 테이블만 만들고 기존 테이블은 바꾸지 않으므로, 기존
+instance/boats.db 에 컬럼/인덱스를 추가하는 변경은 여기에 순서대로 등록합니다.
+
+- 적용 이력은 schema_migrations 테이블에 기록되며, 각 마이그레이션은 자체적으로도
+  "이미 있으면 건너뜀" 방식이라 여러 번 실행하거나 여러 프로세스가 동시에 실행해도 안전합니다.
+- 앱 시작 시 자동 실행 (AUTO_MIGRATE), 또는 CLI 로 직접 실행:
+    python migrations.py                 # instance/boats.db
+    python migrations.py --db path/to.db
+    flask --app app db-upgrade
+"""
+from urllib.parse import parse_qs, urlencode, urlparse, urlunparse
+import argparse
+import os
+
+from sqlalchemy import (Column, DateTime, Float, ForeignKey, Integer, MetaData, String, Table, Text,
+                        UniqueConstraint, create_engine, inspect, text)
+
+from db import utc_now
+
+MIGRATIONS_TABLE = 'schema_migrations'
+
+# (버전, 이름, 함수, 트랜잭션 밖에서 실행 여부)
+MIGRATIONS = []
+
+
+def migration(version: int, name: str, transactional: bool = True):
+    """마이그레이션 등록 데코레이터. transactional=False 는 PostgreSQL 의
+    CREATE INDEX CONCURRENTLY 처럼 트랜잭션 안에서 실행할 수 없는 작업용."""
+    def decorator(fn):
+        MIGRATIONS.append((version, name, fn, transactional))
+        MIGRATIONS.sort(key=lambda m: m[0])
+        return fn
+    return decorator
+
+
+# ---- 헬퍼 ----
+def has_table(conn, table: str) -> bool:
+    return inspect(conn).has_table(table)
+
+
+def column_names(conn, table: str) -> set:
+    return {c['name'] for c in inspect(conn).get_columns(table)}
+
+
+def add_column_if_missing(conn, table: str, column: str, ddl_type: str):
+    if has_table(conn, table) and column not in column_names(conn, table):
+        conn.execute(text(f"ALTER TABLE {table} ADD COLUMN {column} {ddl_type}"))
+
+
+def create_index_if_missing(conn, name: str, table: str, columns, unique: bool = False):
+    """인덱스 생성. PostgreSQL 은 쓰기를 막지 않도록 CONCURRENTLY 로 생성
+    (이 경우 해당 마이그레이션은 transactional=False 로 등록해야 함)."""
+    if not has_table(conn, table):
+        return
+    cols = ', '.join(columns)
+    unique_sql = 'UNIQUE ' if unique else ''
+    concurrently = 'CONCURRENTLY ' if conn.dialect.name == 'postgresql' else ''
+    conn.execute(text(f"CREATE {unique_sql}INDEX {concurrently}IF NOT EXISTS {name} ON {table} ({cols})"))
+
+
+def create_table_if_missing(conn, table: Table):
+    """마이그레이션 안에 고정해 둔 Table 정의(제약/인덱스 포함)로 테이블 생성"""
+    table.create(conn, checkfirst=True)
+
+
+# 새 테이블 정의는 모델(models.py)이 나중에 바뀌어도 그 시점 스키마로 남도록 여기에 고정.
+# 외래키 대상은 이름만 맞추면 되므로 boats 는 id 만 선언
+_tables = MetaData()
+Table('boats', _tables, Column('id', Integer, primary_key=True))
+
+_status_snapshots = Table(
+    'status_snapshots', _tables,
+    Column('id', Integer, primary_key=True),
+    Column('boat_id', Integer, ForeignKey('boats.id', ondelete='CASCADE'), nullable=False),
+    Column('query_date', String(10), nullable=False, index=True),
+    Column('scraped_at', DateTime, nullable=False),
+    Column('tide', String(100)),
+    Column('parser', String(32)),
+    Column('error', String(500)),
+    Column('entries_json', Text, nullable=False),
+    UniqueConstraint('boat_id', 'query_date', name='uq_status_snapshots_boat_date'),
+)
+
+_tide_forecasts = Table(
+    'tide_forecasts', _tables,
+    Column('id', Integer, primary_key=True),
+    Column('port_id', Integer, nullable=False),
+    Column('forecast_date', String(10), nullable=False),
+    Column('fetched_at', DateTime, nullable=False),
+    Column('source_url', String(2083)),
+    Column('rows_json', Text, nullable=False),
+    UniqueConstraint('port_id', 'forecast_date', name='uq_tide_forecasts_port_date'),
+)
+
+_sea_temp_readings = Table(
+    'sea_temp_readings', _tables,
+    Column('id', Integer, primary_key=True),
+    Column('name', String(100), nullable=False),
+    Column('observed', String(40), nullable=False),
+    Column('fetched_at', DateTime, nullable=False, index=True),
+    Column('temp_c', Float),
+    Column('lat', Float),
+    Column('lng', Float),
+    UniqueConstraint('name', 'observed', name='uq_sea_temp_readings_name_observed'),
+)
+
+
+# ---- 마이그레이션 목록 ----
+@migration(1, 'boats.note 컬럼 추가')
+def _add_boat_note(conn):
+    add_column_if_missing(conn, 'boats', 'note', 'TEXT')
+
+
+@migration(2, 'boats.city 인덱스', transactional=False)
+def _index_boat_city(conn):
+    create_index_if_missing(conn, 'ix_boats_city', 'boats', ['city'])
+
+
+# 마이그레이션 3 시점의 URL → host/base_url/parser_type 계산 (services/reservation_checker.site_info
+# 의 당시 규칙). 이후 site_info 가 바뀌어도 이 마이그레이션이 기록하는 값은 바뀌지 않도록 복사해 둠
+_V3_DATE_QUERY_KEYS = {'year', 'month', 'day', 'mode', 'won', 'PA_N_UID', 'sel'}
+
+
+def _v3_site_info(url: str) -> dict:
+    parsed = urlparse((url or '').strip())
+    scheme = (parsed.scheme or 'https').lower()
+    host = (parsed.netloc or '').lower()
+    if 'sunsang24.com' in host or 'schedule_fleet' in (parsed.path or ''):
+        return {'host': host, 'base_url': urlunparse((scheme, host, '/ship/schedule_fleet', '', '', '')),
+                'parser_type': 'schedule_fleet'}
+    kept = sorted((k, v[0]) for k, v in parse_qs(parsed.query or '').items() if k not in _V3_DATE_QUERY_KEYS)
+    return {'host': host, 'base_url': urlunparse((scheme, host, parsed.path or '/', '', urlencode(kept), '')),
+            'parser_type': 'board'}
+
+
+@migration(3, 'boats.host/base_url/parser_type 파생 컬럼')
+def _add_boat_site_columns(conn):
+    add_column_if_missing(conn, 'boats', 'host', 'VARCHAR(255)')
+    add_column_if_missing(conn, 'boats', 'base_url', 'VARCHAR(2083)')
+    add_column_if_missing(conn, 'boats', 'parser_type', 'VARCHAR(32)')
+    if not has_table(conn, 'boats'):
+        return
+    # 기존 행 채우기
+    rows = conn.execute(text("SELECT id, url FROM boats WHERE host IS NULL")).fetchall()
+    if rows:
+        conn.execute(
+            text("UPDATE boats SET host = :host, base_url = :base_url, parser_type = :parser_type WHERE id = :id"),
+            [dict(_v3_site_info(url), id=boat_id) for boat_id, url in rows],
+        )
+
+
+@migration(4, 'boats.host 인덱스', transactional=False)
+def _index_boat_host(conn):
+    create_index_if_missing(conn, 'ix_boats_host', 'boats', ['host'])
+
+
+@migration(5, 'status_snapshots 테이블')
+def _create_status_snapshots(conn):
+    create_table_if_missing(conn, _status_snapshots)
+
+
+@migration(6, 'tide_forecasts 테이블')
+def _create_tide_forecasts(conn):
+    create_table_if_missing(conn, _tide_forecasts)
+
+
+@migration(7, 'sea_temp_readings 테이블')
+def _create_sea_temp_readings(conn):
+    create_table_if_missing(conn, _sea_temp_readings)
+
+
+# ---- 실행 ----
+def _ensure_migrations_table(engine):
+    with engine.begin() as conn:
+        conn.execute(text(
+            f"CREATE TABLE IF NOT EXISTS {MIGRATIONS_TABLE} ("
+            "version INTEGER PRIMARY KEY, name VARCHAR(255) NOT NULL, applied_at VARCHAR(32) NOT NULL)"
+        ))
+
+
+def applied_versions(engine) -> set:
+    _ensure_migrations_table(engine)
+    with engine.connect() as conn:
+        return {row[0] for row in conn.execute(text(f"SELECT version FROM {MIGRATIONS_TABLE}"))}
+
+
+def _record(conn, version: int, name: str):
+    # 다른 프로세스가 먼저 기록했으면 무시
+    exists = conn.execute(text(f"SELECT 1 FROM {MIGRATIONS_TABLE} WHERE version = :v"), {'v': version}).first()
+    if not exists:
+        conn.execute(text(f"INSERT INTO {MIGRATIONS_TABLE} (version, name, applied_at) VALUES (:v, :n, :t)"),
+                     {'v': version, 'n': name, 't': utc_now().isoformat(timespec='seconds')})
+
+
+def upgrade(engine, log=print) -> list:
+    """미적용 마이그레이션을 버전 순서대로 적용하고 적용한 버전 목록을 반환"""
+    done = applied_versions(engine)
+    applied = []
+    for version, name, fn, transactional in MIGRATIONS:
+        if version in done:
+            continue
+        if transactional:
+            with engine.begin() as conn:
+                fn(conn)
+                _record(conn, version, name)
+        else:
+            with engine.connect().execution_options(isolation_level='AUTOCOMMIT') as conn:
+                fn(conn)
+                _record(conn, version, name)
+        applied.append(version)
+        if log:
+            log(f"migration {version:03d} 적용: {name}")
+    return applied
+
+
+def init_migrations(app):
+    """앱 시작 시 자동 마이그레이션 + `flask db-upgrade` CLI 명령 등록"""
+    from db import db
+
+    @app.cli.command('db-upgrade')
+    def db_upgrade_command():
+        """미적용 스키마 마이그레이션 실행"""
+        applied = upgrade(db.engine)
+        print(f"{len(applied)}개 마이그레이션 적용" if applied else "이미 최신 스키마입니다.")
+
+    if app.config.get('AUTO_MIGRATE', True):
+        with app.app_context():
+            upgrade(db.engine, log=app.logger.info)
+
+
+def main():
+    default_db = os.path.join(os.path.dirname(__file__), 'instance', 'boats.db')
+    parser = argparse.ArgumentParser(description='스키마 마이그레이션 실행')
+    parser.add_argument('--db', default=None, help=f'SQLite 파일 경로 (기본: {default_db})')
+    parser.add_argument('--url', default=None, help='SQLAlchemy DB URL (DATABASE_URL 보다 우선)')
+    args = parser.parse_args()
+
+    url = args.url or (f"sqlite:///{os.path.abspath(args.db)}" if args.db else None) \
+        or os.environ.get('DATABASE_URL') or f"sqlite:///{default_db}"
+    if url.startswith('sqlite:///') and not os.path.exists(url[len('sqlite:///'):]):
+        print(f"데이터베이스 파일을 찾을 수 없습니다: {url}")
+        print("app.py를 먼저 실행하여 데이터베이스를 생성하세요.")
+        return
+
+    engine = create_engine(url)
+    applied = upgrade(engine)
+    print(f"{len(applied)}개 마이그레이션 적용" if applied else "이미 최신 스키마입니다.")
+    with engine.connect() as conn:
+        if has_table(conn, 'boats'):
+            print("\n현재 boats 테이블 구조:")
+            for col in inspect(conn).get_columns('boats'):
+                print(f"  {col['name']} ({col['type']})")
+
+
+if __name__ == '__main__':
+    main()
@@ -1,15 +1,19 @@
 from datetime import datetime
-from db import db
+from db import db, utc_now
 
 class Boat(db.Model):
     __tablename__ = 'boats'
     id = db.Column(db.Integer, primary_key=True)
     name = db.Column(db.String(255), nullable=False, unique=True)
     url = db.Column(db.String(2083), nullable=False)
-    city = db.Column(db.String(100), nullable=False)
+    city = db.Column(db.String(100), nullable=False, index=True)
     port = db.Column(db.String(100), nullable=False)
     note = db.Column(db.Text, nullable=True)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    # url 에서 파생된 값 (등록/수정 시 db.py 에서 계산): 호스트별 묶음 조회용
+    host = db.Column(db.String(255), nullable=True, index=True)
+    base_url = db.Column(db.String(2083), nullable=True)
+    parser_type = db.Column(db.String(32), nullable=True)
 
     def __repr__(self):
         return f'<Boat {self.name}>'
@@ -23,5 +27,78 @@ class Boat(db.Model):
             'city': self.city,
             'port': self.port,
             'note': self.note,
+            'host': self.host,
+            'parser_type': self.parser_type,
             'created_at': self.created_at.isoformat() if self.created_at else None
-        }
\ No newline at end of file
+        }
+
+
+class StatusSnapshot(db.Model):
+    """배 × 조회 날짜별 마지막 조회 결과 (services/scrape.py 워커가 기록)"""
+    __tablename__ = 'status_snapshots'
+    __table_args__ = (db.UniqueConstraint('boat_id', 'query_date', name='uq_status_snapshots_boat_date'),)
+    id = db.Column(db.Integer, primary_key=True)
+    boat_id = db.Column(db.Integer, db.ForeignKey('boats.id', ondelete='CASCADE'), nullable=False)
+    query_date = db.Column(db.String(10), nullable=False, index=True)  # YYYY-MM-DD
+    scraped_at = db.Column(db.DateTime, nullable=False, default=utc_now)
+    tide = db.Column(db.String(100), nullable=True)
+    parser = db.Column(db.String(32), nullable=True)
+    error = db.Column(db.String(500), nullable=True)
+    entries_json = db.Column(db.Text, nullable=False, default='[]')
+
+    def to_dict(self):
+        import json
+        return {
+            'boat_id': self.boat_id,
+            'date': self.query_date,
+            'scraped_at': self.scraped_at.isoformat() if self.scraped_at else None,
+            'tide': self.tide,
+            'parser': self.parser,
+            'error': self.error,
+            'entries': json.loads(self.entries_json or '[]'),
+        }
+
+
+class TideForecast(db.Model):
+    """바다타임 주간 예보를 항구(port_id) × 날짜별로 나눠 저장 (/api/tide 가 기록/재사용)"""
+    __tablename__ = 'tide_forecasts'
+    __table_args__ = (db.UniqueConstraint('port_id', 'forecast_date', name='uq_tide_forecasts_port_date'),)
+    id = db.Column(db.Integer, primary_key=True)
+    port_id = db.Column(db.Integer, nullable=False)
+    forecast_date = db.Column(db.String(10), nullable=False)  # YYYY-MM-DD
+    fetched_at = db.Column(db.DateTime, nullable=False, default=utc_now)
+    source_url = db.Column(db.String(2083), nullable=True)
+    rows_json = db.Column(db.Text, nullable=False, default='[]')
+
+    def to_dict(self):
+        import json
+        return {
+            'port_id': self.port_id,
+            'date': self.forecast_date,
+            'fetched_at': self.fetched_at.isoformat() if self.fetched_at else None,
+            'source_url': self.source_url,
+            'data': json.loads(self.rows_json or '[]'),
+        }
+
+
+class SeaTempReading(db.Model):
+    """바다타임 수온 지도 관측소별 수온 기록 (/api/sea_temp 가 받아올 때마다 추가, 같은 관측 시각은 한 번만)"""
+    __tablename__ = 'sea_temp_readings'
+    __table_args__ = (db.UniqueConstraint('name', 'observed', name='uq_sea_temp_readings_name_observed'),)
+    id = db.Column(db.Integer, primary_key=True)
+    name = db.Column(db.String(100), nullable=False)
+    observed = db.Column(db.String(40), nullable=False)  # 페이지 표기 관측 시각 (없으면 받아온 시각)
+    fetched_at = db.Column(db.DateTime, nullable=False, default=utc_now, index=True)
+    temp_c = db.Column(db.Float, nullable=True)
+    lat = db.Column(db.Float, nullable=True)
+    lng = db.Column(db.Float, nullable=True)
+
+    def to_dict(self):
+        return {
+            'name': self.name,
+            'time': self.observed,
+            'fetched_at': self.fetched_at.isoformat() if self.fetched_at else None,
+            'temp_c': self.temp_c,
+            'lat': self.lat,
+            'lng': self.lng,
+        }
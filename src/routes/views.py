@@ -1,16 +1,19 @@
-import io
-import openpyxl
-from flask import Blueprint, render_template, redirect, url_for, flash, request, jsonify, current_app, Response
+from flask import Blueprint, render_template, redirect, url_for, flash, request, jsonify, current_app, Response, stream_with_context
 from flask import send_from_directory
 from forms import BoatRegistrationForm, StatusCheckForm, BoatEditForm
-from db import add_boat_instance, get_all_boats, delete_boat, get_boat_by_id, update_boat
-from services.reservation_checker import check_single_boat
+from db import add_boat_instance, get_all_boats, get_boats, iter_boats, count_boats_by_city, delete_boat, bulk_delete_boats, get_boat_by_id, update_boat, update_parser_types
+from services.scrape_engine import scrape_boats, build_status_rows, learned_parsers
+from services.scrape_metrics import REGISTRY, summarize_results, server_timing_header
+from services.tide_calc import day_info, scheme_for, tide_phase
+from services.live_updates import SubscriptionLimitReached
+from services.boat_excel import import_boats, iter_csv, iter_xlsx, boat_export_rows, EXCEL_HEADERS, STATUS_EXPORT_HEADERS
 from forms import REGION_CHOICES
 from datetime import date as dt_date
 from urllib.parse import urlparse
 from models import Boat
-from concurrent.futures import ThreadPoolExecutor, as_completed
+import os
 import re
+import time
 
 views = Blueprint('views', __name__, template_folder='templates')
 
@@ -31,36 +34,66 @@ def index():
         city_port_map=city_port_mapping
     )
 
-@views.route('/download_excel')
-def download_excel():
-    boats = get_all_boats()
-    
-    # Create a new workbook and select the active worksheet
-    wb = openpyxl.Workbook()
-    ws = wb.active
-    ws.title = "Registered Boats"
-    
-    # Add header row (비고 포함)
-    headers = ["No", "지역", "항구", "등록된 배", "URL", "비고"]
-    ws.append(headers)
-    
-    # Add data rows
-    for i, boat in enumerate(boats, start=1):
-        row = [i, boat.city, boat.port, boat.name, boat.url, (boat.note or '')]
-        ws.append(row)
-        
-    # Create a virtual file to save the workbook
-    output = io.BytesIO()
-    wb.save(output)
-    output.seek(0)
-    
-    # Create a response
+XLSX_MIMETYPE = "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+# 조회 결과 내보내기 최대 기간(일)
+STATUS_EXPORT_MAX_DAYS = 31
+
+def _export_response(headers, rows, filename, fmt, title):
+    """행 iterator 를 CSV 또는 XLSX 스트리밍 응답으로 변환"""
+    if fmt == 'csv':
+        body, mimetype, ext = iter_csv(headers, rows), "text/csv; charset=utf-8", "csv"
+    else:
+        body, mimetype, ext = iter_xlsx(headers, rows, title=title), XLSX_MIMETYPE, "xlsx"
     return Response(
-        output,
-        mimetype="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
-        headers={"Content-Disposition": "attachment;filename=boat_list.xlsx"}
+        stream_with_context(body),
+        mimetype=mimetype,
+        headers={"Content-Disposition": f"attachment;filename={filename}.{ext}"}
     )
 
+@views.route('/download_excel')
+def download_excel():
+    # 배 목록을 배치 단위로 읽어 write_only 워크북으로 내보냄
+    return _export_response(EXCEL_HEADERS, boat_export_rows(iter_boats()), "boat_list", 'xlsx', title="Registered Boats")
+
+@views.route('/download_csv')
+def download_csv():
+    return _export_response(EXCEL_HEADERS, boat_export_rows(iter_boats()), "boat_list", 'csv', title="Registered Boats")
+
+@views.route('/export/status')
+def export_status():
+    """기간(start~end)의 조회 결과를 날짜 × 배 × 선박 단위 행으로 내보내기.
+    요청: /export/status?start=2025-11-22&end=2025-11-23&regions=보령&format=csv
+    날짜별로 조회가 끝나는 대로 행을 흘려보냅니다.
+    """
+    from datetime import datetime, timedelta
+    try:
+        start = datetime.strptime(request.args.get('start', ''), '%Y-%m-%d').date()
+        end = datetime.strptime(request.args.get('end') or request.args.get('start', ''), '%Y-%m-%d').date()
+    except ValueError:
+        return jsonify({"error": "start/end 는 YYYY-MM-DD 형식이어야 합니다."}), 400
+    if end < start or (end - start).days >= STATUS_EXPORT_MAX_DAYS:
+        return jsonify({"error": f"기간은 1~{STATUS_EXPORT_MAX_DAYS}일이어야 합니다."}), 400
+
+    regions = [r for r in request.args.getlist('regions') if r and r != '전체']
+    boats = get_boats(cities=regions)
+    debug_enabled = current_app.config.get('DEBUG_LOGGING_ENABLED', False)
+
+    def rows():
+        d = start
+        while d <= end:
+            date_str = d.isoformat()
+            for boat, check in scrape_boats(boats, d.year, d.month, d.day, debug_enabled=debug_enabled):
+                status_rows = build_status_rows(boat, check)
+                _fill_calculated_tide(status_rows, d)
+                for r in status_rows:
+                    yield [date_str, r['city'], r['port'], r['registered_name'], r['ship_name'],
+                           r['display_status'] or r['status'], r['available'], r['fish'], r['tide'], r['url']]
+            d += timedelta(days=1)
+
+    filename = f"status_{start:%Y%m%d}_{end:%Y%m%d}"
+    return _export_response(STATUS_EXPORT_HEADERS, rows(), filename,
+                            request.args.get('format', 'csv'), title="Status")
+
 city_port_mapping = {
     '인천': ['남항(인천항)', '연안부두', '영흥항'],
     '안산': ['오이도항'],
@@ -135,18 +168,9 @@ def status():
     region_names = [label for value, label in REGION_CHOICES if value]
     selected_regions = request.args.getlist("regions") or ['전체']
 
-    # --- added: compute region_counts immediately so status page shows counts on load ---
-    registered_boats = get_all_boats()
-    region_sets = {}
-    for b in registered_boats:
-        city = getattr(b, 'city', None) or ''
-        rn = getattr(b, 'name', None) or getattr(b, 'registered_name', None) or ''
-        if not city:
-            continue
-        region_sets.setdefault(city, set()).add(rn or '')
-    region_counts = { r: len(s) for r, s in region_sets.items() }
+    # 지역별 등록 수는 GROUP BY 집계 한 번으로 계산 (조회 전후 동일하게 사용)
+    region_counts = count_boats_by_city()
     total_registered = sum(region_counts.values())
-    # --- end added ---
 
     # 날짜 미입력 시 조회하지 않고 화면만 렌더링
     if not (y_arg and m_arg and d_arg):
@@ -181,17 +205,14 @@ def status():
             total_registered=0          # { changed code }
         )
 
-    # 지역 필터링(OR). '전체'만 선택 시 전체 조회
-    registered_boats = get_all_boats()
-
-    # { changed code } : 선택된 지역에 따라 쿼리 대상 목록 생성
+    # 지역 필터링(OR)은 DB 쿼리에서 처리. '전체'만 선택 시 전체 조회
     filter_targets = [r for r in selected_regions if r != '전체']
-    boats_to_query = [b for b in registered_boats if b.city in filter_targets] if filter_targets else registered_boats
+    boats_to_query = get_boats(cities=filter_targets)
 
-    # DEBUG: get_all_boats() 반환값 검사 — 터미널에 출력
+    # DEBUG: 조회 대상 배 목록 검사 — 터미널에 출력
     if current_app.config['DEBUG_LOGGING_ENABLED']:
-        print("DEBUG: get_all_boats() returned", len(registered_boats), "boats")
-        for i, b in enumerate(registered_boats, start=1):
+        print("DEBUG: get_boats() returned", len(boats_to_query), "boats")
+        for i, b in enumerate(boats_to_query, start=1):
             try:
                 info = {
                     'repr': repr(b),
@@ -207,78 +228,33 @@ def status():
                 info = {'error': str(exc), 'repr': repr(b)}
             print(f"DEBUG boat[{i}]:", info)
 
-    # 조회 실행 - 병렬 처리로 속도 개선
+    # 조회 실행 - 병렬 처리로 속도 개선 (최대 10개 동시 처리)
     date_str = f"{year:04d}-{month:02d}-{day:02d}"
-    results = []
-    
-    # Flask application context를 스레드에서 사용하기 위해 미리 저장
     debug_enabled = current_app.config.get('DEBUG_LOGGING_ENABLED', False)
-    
-    # 병렬 처리 함수 정의
-    def process_boat(boat):
-        boat_name = getattr(boat, "name", None) or getattr(boat, "registered_name", "unknown")
-        boat_url = getattr(boat, "url", "")
-        try:
-            check = check_single_boat(boat_url, year, month, day, debug_enabled=debug_enabled)
-            check_source = check.get("source_url") or boat_url or ""
-            
-            boat_results = []
-            for e in check.get("entries", []):
-                full_url = (e.get("used_url") or e.get("source_url") or e.get("url") or check_source or boat_url) or ""
-                url_path = e.get("used_url_path") or e.get("url_path") or full_url
-                boat_results.append({
-                     "registered_name": boat_name,
-                     "city": getattr(boat, "city", ""),
-                     "port": getattr(boat, "port", ""),
-                     "ship_name": e.get("ship_name"),
-                     "status": e.get("status"),
-                     "available": e.get("available"),
-                     "display_status": e.get("display_status"),
-                     "raw_status_text": e.get("raw_status_text"),
-                     "url": full_url,
-                     "url_path": url_path,
-                     "fish": e.get("fish"),
-                     "row_html": e.get("row_html"),
-                     "tide": check.get("tide"),
-                })
-            return boat_results
-        except Exception as e:
-            if debug_enabled:
-                import traceback
-                print(f"Error processing boat {boat_name}: {e}")
-                print(traceback.format_exc())
-            return []
-    
-    # ThreadPoolExecutor로 병렬 처리 (최대 10개 동시 처리)
-    max_workers = min(10, len(boats_to_query)) if boats_to_query else 1
-    
-    with ThreadPoolExecutor(max_workers=max_workers) as executor:
-        future_to_boat = {executor.submit(process_boat, boat): boat for boat in boats_to_query}
-        for future in as_completed(future_to_boat):
-            try:
-                boat_results = future.result()
-                results.extend(boat_results)
-            except Exception as e:
-                if debug_enabled:
-                    import traceback
-                    print(f"Error getting future result: {e}")
-                    print(traceback.format_exc())
-
-    # { changed code } : 등록된 배 목록(registered_boats)에서 지역별 등록 수 계산
-    region_sets = {}
-    for b in get_all_boats():
-        city = getattr(b, 'city', None) or ''
-        rn = getattr(b, 'name', None) or getattr(b, 'registered_name', None) or ''
-        if not city:
-            continue
-        region_sets.setdefault(city, set()).add(rn or '')
-    region_counts = { r: len(s) for r, s in region_sets.items() }
-    total_registered = sum(region_counts.values())
+    started = time.perf_counter()
+    scraped = scrape_boats(boats_to_query, year, month, day, debug_enabled=debug_enabled)
+    scrape_ms = (time.perf_counter() - started) * 1000
+
+    results = []
+    for boat, check in scraped:
+        results.extend(build_status_rows(boat, check))
+    _fill_calculated_tide(results, dt_date(year, month, day))
+
+    # 선박을 찾아낸 파서 어댑터를 기억해 다음 조회에서 바로 사용
+    try:
+        update_parser_types(learned_parsers(scraped))
+    except Exception as e:
+        current_app.logger.warning(f"parser_type 저장 실패: {e}")
+
+    # 좌석 변화 감지: 이전 조회 대비 열림/잔여석 변경/마감만 싱크로 전달
+    watcher = current_app.extensions.get('seat_watcher')
+    if watcher:
+        watcher.observe_many(scraped, date_str)
 
     # 예약가능 상태 배를 먼저 보여주도록 정렬
     results_sorted = sorted(results, key=lambda x: x.get('status') != 'open')
     # 템플릿에는 실제 보여줄 결과 리스트(results)를 전달
-    return render_template('status.html',
+    html = render_template('status.html',
                            form=form,
                            entries=results_sorted,
                            region_names=region_names,
@@ -288,6 +264,14 @@ def status():
                            day=day,
                            region_counts=region_counts,
                            total_registered=total_registered)
+    return _with_server_timing(html, scraped, scrape_ms)
+
+def _with_server_timing(body, scraped, scrape_ms):
+    """SERVER_TIMING_ENABLED 이면 조회 단계별 시간을 Server-Timing 헤더로 추가"""
+    response = current_app.make_response(body)
+    if current_app.config.get('SERVER_TIMING_ENABLED'):
+        response.headers['Server-Timing'] = server_timing_header(summarize_results(scraped), scrape_ms)
+    return response
 
 # API endpoint: JSON으로 파싱결과 반환 (클라이언트가 fetch로 호출)
 @views.route('/api/status', methods=['POST'])
@@ -302,8 +286,13 @@ def api_status():
 
     boats = get_all_boats()
     out = []
-    for b in boats:
-        info = check_single_boat(b.url, year, month, day, debug_enabled=current_app.config['DEBUG_LOGGING_ENABLED'])
+    started = time.perf_counter()
+    # /status 와 같은 파이프라인(동시 요청 한도, 파서 프로세스 풀)으로 조회. 응답은 등록 순서 유지
+    checked = scrape_boats(boats, year, month, day, debug_enabled=current_app.config['DEBUG_LOGGING_ENABLED'])
+    order = {id(b): i for i, b in enumerate(boats)}
+    checked.sort(key=lambda pair: order.get(id(pair[0]), len(order)))
+    scrape_ms = (time.perf_counter() - started) * 1000
+    for b, info in checked:
         entries_out = []
         source_url = info.get("source_url") or b.url
         for entry in info.get("entries", []):
@@ -336,10 +325,95 @@ def api_status():
             "port": b.port,
             "query_date": f"{int(year):04d}-{int(month):02d}-{int(day):02d}",
             "date_id": info.get("date_id"),
-            "tide": info.get("tide"),   # 추가: 물때 정보
+            "tide": info.get("tide") or calculated_tide(b.port, dt_date(year, month, day)),   # 추가: 물때 정보
             "entries": entries_out
         })
-    return jsonify(out)
+    return _with_server_timing(jsonify(out), checked, scrape_ms)
+
+# Prometheus 수집용 조회 단계별 지표 (services/scrape_metrics.py)
+@views.route('/metrics', methods=['GET'])
+def metrics():
+    return Response(REGISTRY.render(), content_type='text/plain; version=0.0.4; charset=utf-8')
+
+# API endpoint: 좌석 변화 이벤트(열림/잔여석 변경/마감)를 앱 내부 버퍼에서 커서 이후만 반환.
+# 이벤트를 지우지 않으므로 클라이언트마다 받은 cursor 를 다음 요청의 since 로 넘기면 됨
+@views.route('/api/seat_events', methods=['GET'])
+def api_seat_events():
+    watcher = current_app.extensions.get('seat_watcher')
+    since = request.args.get('since', default=0, type=int)
+    if not watcher or not watcher.queue:
+        return jsonify({'events': [], 'cursor': since})
+    limit = request.args.get('limit', type=int)
+    events, cursor = watcher.queue.since(since, limit)
+    return jsonify({'events': events, 'cursor': cursor})
+
+def _parse_live_target(data):
+    """year/month/day/regions 를 읽어 ('YYYY-MM-DD', [지역...]) 반환. 날짜가 잘못됐거나
+    오늘~LIVE_MAX_DAYS_AHEAD 범위 밖이거나 등록된 배가 없는 지역이면 ValueError (메시지는 그대로 응답)"""
+    try:
+        year, month, day = int(data.get('year')), int(data.get('month')), int(data.get('day'))
+        target = dt_date(year, month, day)
+    except (TypeError, ValueError):
+        raise ValueError('invalid date')
+    # 지난 날짜나 너무 먼 날짜는 폴링 대상이 되지 않도록 거부
+    days_ahead = (target - dt_date.today()).days
+    if not 0 <= days_ahead <= current_app.config.get('LIVE_MAX_DAYS_AHEAD', 60):
+        raise ValueError('date out of range')
+    regions = data.getlist('regions') if hasattr(data, 'getlist') else (data.get('regions') or [])
+    if not isinstance(regions, list) or not all(isinstance(r, str) for r in regions):
+        raise ValueError('invalid regions')
+    known = set(count_boats_by_city()) | {'전체'}
+    unknown = [r for r in regions if r and r not in known]
+    if unknown:
+        raise ValueError(f"unknown regions: {', '.join(unknown[:5])}")
+    return f"{year:04d}-{month:02d}-{day:02d}", regions
+
+# SSE: 열린 /status 페이지에 해당 날짜·지역의 좌석 변화 이벤트를 실시간 전송
+@views.route('/api/status/stream', methods=['GET'])
+def api_status_stream():
+    try:
+        date_str, regions = _parse_live_target(request.args)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+
+    hub = current_app.extensions['live_status']
+    try:
+        sub = hub.subscribe(date_str, regions)
+    except SubscriptionLimitReached as e:
+        current_app.logger.warning(str(e))
+        return jsonify({"error": "too many live subscriptions"}), 503
+    return Response(
+        hub.stream(sub),
+        mimetype='text/event-stream',
+        headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'}
+    )
+
+@views.route('/api/push/key', methods=['GET'])
+def api_push_key():
+    """Web Push 구독에 필요한 VAPID 공개키 (미설정 시 null)"""
+    return jsonify({'publicKey': current_app.config.get('VAPID_PUBLIC_KEY')})
+
+@views.route('/api/push/subscribe', methods=['POST'])
+def api_push_subscribe():
+    data = request.get_json() or {}
+    subscription = data.get('subscription') or {}
+    if not subscription.get('endpoint'):
+        return jsonify({'success': False, 'message': 'subscription 이 필요합니다.'}), 400
+    try:
+        date_str, regions = _parse_live_target(data)
+    except ValueError as e:
+        return jsonify({'success': False, 'message': str(e)}), 400
+
+    current_app.extensions['live_status'].add_push_subscription(subscription, date_str, regions)
+    return jsonify({'success': True})
+
+@views.route('/api/push/unsubscribe', methods=['POST'])
+def api_push_unsubscribe():
+    data = request.get_json() or {}
+    endpoint = data.get('endpoint')
+    if endpoint:
+        current_app.extensions['live_status'].remove_push_subscription(endpoint)
+    return jsonify({'success': True})
 
 @views.route('/weather')
 def weather():
@@ -382,6 +456,17 @@ def get_port_coordinates():
         '녹동방파제': {'lat': 34.52298050694286, 'lon': 127.14353349262528},
     }
 
+def calculated_tide(port, d):
+    """항구·날짜의 계산된 물때 (services/tide_calc.py). 좌표를 모르는 항구는 서해안 7물때식"""
+    coords = get_port_coordinates().get(port or '')
+    return tide_phase(d, scheme_for(coords['lat'] if coords else None))
+
+def _fill_calculated_tide(rows, d):
+    """조회로 물때를 얻지 못한 행(조회 실패, 물때 표기가 없는 사이트)은 계산값으로 채움"""
+    for r in rows:
+        if not r.get('tide'):
+            r['tide'] = calculated_tide(r.get('port'), d)
+
 def get_city_port_mapping():
     """지역별 항구 매핑 정보를 반환"""
     return {
@@ -718,99 +803,86 @@ def generate_sample_weather_data(port_name, lat, lon):
 @views.route('/api/tide')
 def api_tide():
     """바다타임 특정 항구 번호(port_id)의 주간(week_container) 정보를 파싱하여 시간대별 데이터 반환.
-    요청: /api/tide?port_id=118
-    반환 필드: time, wind_dir, wind_speed, weather, temperature, wave_info
-    바다타임 페이지에 풍향/풍속/날씨/기온/파고가 모두 없을 수 있으므로 가용한 정보만 구성하고 나머지는 추정/빈값 처리.
+    요청: /api/tide?port_id=118&date=2025-11-22
+    반환: data(요청 날짜의 시간대 행: time, wind_dir, wind_speed, weather, temperature, wave_info),
+          series(같은 행의 숫자 계열), week(저장된 이후 날짜들의 숫자 계열)
+    주간 페이지 하나에 며칠치가 들어 있으므로 날짜별로 나눠 저장하고, TIDE_FORECAST_TTL 안에
+    같은 항구의 다른 날짜를 요청하면 다시 받아오지 않고 저장본으로 응답합니다. 저장본은 요청
+    날짜부터 7일이 모두 있을 때만 쓰고, 하나라도 없으면 다시 받아옵니다 (week 가 잘리지 않게).
     """
+    import json
     import requests
-    from bs4 import BeautifulSoup
+    from datetime import datetime, timedelta
+    from db import get_tide_forecasts, save_tide_forecasts, utc_now
+    from services.badatime import WeekParseError, numeric_series, parse_week
     port_id = request.args.get('port_id', type=int)
     if not port_id:
         return jsonify({'error': 'port_id 파라미터가 필요합니다.'}), 400
 
     # 날짜는 /{port_id}/tide/YYYY-MM-DD 형태의 경로로 전달됨
     date_str = request.args.get('date')  # YYYY-MM-DD
+    try:
+        start = datetime.strptime(date_str, '%Y-%m-%d').date() if date_str else dt_date.today()
+    except ValueError:
+        return jsonify({'error': 'date 는 YYYY-MM-DD 형식이어야 합니다.'}), 400
+    day_key = start.isoformat()
     base_url = f"https://www.badatime.com/{port_id}/tide"
-    headers = {
-        'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/118.0 Safari/537.36'
-    }
+    used_url = f"{base_url}/{date_str}" if date_str else base_url
+
+    fresh_after = utc_now() - timedelta(seconds=current_app.config.get('TIDE_FORECAST_TTL', 3 * 3600))
+    week_end = (start + timedelta(days=6)).isoformat()
+    stored = get_tide_forecasts(port_id, day_key, week_end, fetched_after=fresh_after)
+    by_date = {f.forecast_date: json.loads(f.rows_json or '[]') for f in stored}
+    week_keys = [(start + timedelta(days=i)).isoformat() for i in range(7)]
+    cached = all(k in by_date for k in week_keys)
+    if cached:
+        used_url = next(f.source_url for f in stored if f.forecast_date == day_key) or used_url
+    else:
+        headers = {
+            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/118.0 Safari/537.36'
+        }
+        try:
+            # 날짜가 있으면 경로 세그먼트로 전달: /{port}/tide/YYYY-MM-DD
+            resp = requests.get(used_url, headers=headers, timeout=10)
+            if resp.status_code != 200:
+                return jsonify({'error': f'페이지 응답 오류: {resp.status_code}'}), 502
+        except Exception as e:
+            return jsonify({'error': f'요청 실패: {e}'}), 500
+        try:
+            by_date = parse_week(resp.text, start)
+        except WeekParseError as e:
+            return jsonify({'error': str(e)}), 500
+        fetched_at = utc_now()
+        try:
+            save_tide_forecasts({'port_id': port_id, 'forecast_date': d, 'fetched_at': fetched_at,
+                                 'source_url': used_url, 'rows_json': json.dumps(rows, ensure_ascii=False)}
+                                for d, rows in by_date.items())
+        except Exception as e:
+            current_app.logger.warning(f"바다타임 예보 저장 실패 (port_id={port_id}): {e}")
+
+    data_out = by_date.get(day_key, [])
+    week = [{'date': d, 'series': numeric_series(rows)}
+            for d, rows in sorted(by_date.items()) if day_key <= d <= week_end]
+    return jsonify({'port_id': port_id, 'source_url': used_url, 'data': data_out, 'date': date_str,
+                    'series': numeric_series(data_out), 'week': week, 'cached': cached})
+
+@views.route('/api/tide_calc')
+def api_tide_calc():
+    """네트워크 없이 계산한 물때·음력일·일출/일몰.
+    요청: /api/tide_calc?port=오천항&date=2025-11-22&days=7  (days 기본 1, 최대 62)
+    """
+    from datetime import datetime, timedelta
+    port = request.args.get('port', '')
+    coords = get_port_coordinates().get(port)
+    if not coords:
+        return jsonify({'error': f'{port}의 좌표 정보를 찾을 수 없습니다.'}), 404
     try:
-        # 날짜가 있으면 경로 세그먼트로 전달: /{port}/tide/YYYY-MM-DD
-        used_url = f"{base_url}/{date_str}" if date_str else base_url
-        resp = requests.get(used_url, headers=headers, timeout=10)
-        if resp.status_code != 200:
-            return jsonify({'error': f'페이지 응답 오류: {resp.status_code}'}), 502
-    except Exception as e:
-        return jsonify({'error': f'요청 실패: {e}'}), 500
-
-    soup = BeautifulSoup(resp.text, 'html.parser')
-    week_container = soup.select_one('.week_container')
-    if not week_container:
-        return jsonify({'error': 'week_container(class)를 찾을 수 없습니다.'}), 500
-
-    table = week_container.select_one('table.week_table')
-    if not table:
-        return jsonify({'error': 'week_table을 찾을 수 없습니다.'}), 500
-
-    import re
-    rows = table.select('tbody > tr')
-    if not rows or len(rows) < 5:
-        return jsonify({'error': '예상보다 적은 행. 구조 변경 가능성.'}), 500
-
-    # 1행: 날짜 + 시간 헤더들
-    time_cells = rows[0].find_all('td')[1:]  # 첫번째는 날짜
-    times = []
-    for c in time_cells:
-        t = c.get_text(strip=True).replace('현재','').strip()
-        # Normalize '07시' -> '07시'
-        times.append(t)
-
-    count = len(times)
-
-    def extract_icon_row(tr):
-        icons = []
-        for td in tr.find_all('td')[1:]:
-            img = td.find('img')
-            icons.append(img['src'] if img else '')
-        return icons
-
-    def extract_text_cells(tr):
-        return [td.get_text(strip=True) for td in tr.find_all('td')[1:]]
-
-    # 행 식별: 두번째 행 아이콘, 세번째 행 날씨텍스트(맑음), 네번째 기온(첫셀 '기온'), 다섯번째 풍향(첫셀 '풍향'), 여섯번째 풍속, 일곱번째 파고, 여덟번째 습도, 아홉번째 강수량
-    icon_urls      = extract_icon_row(rows[1])
-    weather_texts  = extract_text_cells(rows[2])
-    temp_values    = extract_text_cells(rows[3]) if '기온' in rows[3].find('td').get_text() else ['']*count
-    wind_dir_cells = rows[4].find_all('td')[1:]
-    wind_dirs = []
-    wind_dir_icons = []
-    for td in wind_dir_cells:
-        img = td.find('img')
-        wind_dir_icons.append(img['src'] if img else '')
-        # span 또는 텍스트
-        txt = td.get_text(strip=True)
-        wind_dirs.append(txt)
-    wind_speeds    = extract_text_cells(rows[5]) if '풍속' in rows[5].find('td').get_text() else ['']*count
-    wave_heights   = extract_text_cells(rows[6]) if '파고' in rows[6].find('td').get_text() else ['']*count
-    humidities     = extract_text_cells(rows[7]) if len(rows) > 7 and '습도' in rows[7].find('td').get_text() else ['']*count
-    precipitations = extract_text_cells(rows[8]) if len(rows) > 8 and '강수' in rows[8].find('td').get_text() else ['']*count
-
-    data_out = []
-    for i in range(count):
-        data_out.append({
-            'time': times[i],
-            'weather_icon_url': icon_urls[i] if i < len(icon_urls) else '',
-            'weather_text': weather_texts[i] if i < len(weather_texts) else '',
-            'temperature': temp_values[i] if i < len(temp_values) else '',
-            'wind_dir': wind_dirs[i] if i < len(wind_dirs) else '',
-            'wind_dir_icon_url': wind_dir_icons[i] if i < len(wind_dir_icons) else '',
-            'wind_speed': wind_speeds[i] if i < len(wind_speeds) else '',
-            'wave_height': wave_heights[i] if i < len(wave_heights) else '',
-            'humidity': humidities[i] if i < len(humidities) else '',
-            'precipitation': precipitations[i] if i < len(precipitations) else ''
-        })
-
-    return jsonify({'port_id': port_id, 'source_url': used_url if date_str else base_url, 'data': data_out, 'date': date_str})
+        start = datetime.strptime(request.args.get('date') or dt_date.today().isoformat(), '%Y-%m-%d').date()
+    except ValueError:
+        return jsonify({'error': 'date 는 YYYY-MM-DD 형식이어야 합니다.'}), 400
+    days = max(1, min(62, request.args.get('days', default=1, type=int) or 1))
+    data = [day_info(start + timedelta(days=i), coords['lat'], coords['lon']) for i in range(days)]
+    return jsonify({'port': port, 'lat': coords['lat'], 'lon': coords['lon'], 'data': data})
 
 # New: Parse Badatime graph page and return only summary table + chart script
 @views.route('/api/tide_graph', methods=['GET'])
@@ -951,21 +1023,18 @@ def delete_boats():
     if not ids:
         flash('삭제할 배를 선택하세요.', 'warning')
         return redirect(url_for('views.index'))
-    deleted = 0
-    for bid in ids:
-        try:
-            # delete_boat 함수가 id를 받는다고 가정
-            delete_boat(int(bid))
-            deleted += 1
-        except Exception as e:
-            # continue on error, but notify
-            print(f"delete_boat error for id={bid}: {e}")
-    flash(f'{deleted}개의 배가 삭제되었습니다.', 'success')
+    try:
+        deleted, missing = bulk_delete_boats(i for i in ids if str(i).isdigit())
+    except Exception as e:
+        flash(f'삭제 중 오류: {e}', 'danger')
+        return redirect(url_for('views.index'))
+    flash(f'{len(deleted)}개의 배가 삭제되었습니다.', 'success')
+    if missing:
+        flash(f'이미 없는 배 {len(missing)}개는 건너뛰었습니다.', 'warning')
     return redirect(url_for('views.index'))
 
 @views.route('/upload_excel', methods=['POST'])
 def upload_excel():
-    from models import Boat
     from db import db
 
     if 'excel_file' not in request.files:
@@ -977,67 +1046,29 @@ def upload_excel():
 
     if file and (file.filename.endswith('.xlsx') or file.filename.endswith('.xls')):
         try:
-            workbook = openpyxl.load_workbook(file)
-            sheet = workbook.active
-
-            # Map existing boats by name for updates
-            existing_by_name = {b.name: b for b in Boat.query.all()}
-            
-            new_boats_count = 0
-            updated_boats_count = 0
-            # Iterate over rows, skipping the header (row 1)
-            for row in sheet.iter_rows(min_row=2, values_only=True):
-                # Column order from download_excel: No, 지역, 항구, 등록된 배, URL, 비고
-                # We ignore 'No' (index 0)
-                if len(row) < 5:
-                    continue # Skip malformed rows
-
-                city = row[1]
-                port = row[2]
-                name = row[3]
-                url = row[4]
-                note = row[5] if len(row) > 5 else None
-
-                # Basic validation
-                if not all([city, port, name, url]):
-                    current_app.logger.warning(f"Skipping row due to missing data: {row}")
-                    continue
-
-                existing = existing_by_name.get(name)
-                if not existing:
-                    new_boat = Boat(name=name, url=url, city=city, port=port, note=note)
-                    db.session.add(new_boat)
-                    existing_by_name[name] = new_boat  # track to avoid duplicates
-                    new_boats_count += 1
-                else:
-                    # Update existing boat fields (including 비고)
-                    changed = False
-                    if existing.city != city and city:
-                        existing.city = city; changed = True
-                    if existing.port != port and port:
-                        existing.port = port; changed = True
-                    if existing.url != url and url:
-                        existing.url = url; changed = True
-                    # note can be empty string; update even if '' provided
-                    if note is not None and existing.note != note:
-                        existing.note = note; changed = True
-                    if changed:
-                        updated_boats_count += 1
-            
-            db.session.commit()
-            
-            if new_boats_count > 0 or updated_boats_count > 0:
-                message = f'성공: 신규 {new_boats_count}척, 업데이트 {updated_boats_count}척 처리했습니다.'
-            else:
-                message = '변경 사항이 없습니다. 모든 배가 이미 최신입니다.'
-
-            return jsonify({'success': True, 'message': message})
-
+            # read_only 스트리밍 읽기 + 배치 upsert (행별 오류는 모아서 보고)
+            result = import_boats(file)
         except Exception as e:
             db.session.rollback()
             current_app.logger.error(f"Excel upload failed: {e}")
             return jsonify({'success': False, 'message': f'파일 처리 중 오류가 발생했습니다: {e}'}), 500
 
+        new_boats_count = result['created']
+        updated_boats_count = result['updated']
+        if new_boats_count > 0 or updated_boats_count > 0:
+            message = f'성공: 신규 {new_boats_count}척, 업데이트 {updated_boats_count}척 처리했습니다.'
+        else:
+            message = '변경 사항이 없습니다. 모든 배가 이미 최신입니다.'
+        if result['error_count']:
+            preview = ', '.join(f"{e['row']}행({e['message']})" for e in result['errors'][:5])
+            message += f"\n건너뛴 행 {result['error_count']}개: {preview}"
+            if result['error_count'] > 5:
+                message += ' ...'
+            for e in result['errors']:
+                current_app.logger.warning(f"Skipping row {e['row']}: {e['message']}")
+
+        return jsonify({'success': True, 'message': message, **result})
+
     return jsonify({'success': False, 'message': '엑셀 파일(.xlsx, .xls)만 업로드할 수 있습니다.'}), 400
 
 # API 엔드포인트: 선박 목록 JSON으로 반환
@@ -1092,6 +1123,26 @@ def api_add_ship():
         current_app.logger.error(f"API add ship error: {e}")
         return jsonify({'error': '선박 등록 중 오류가 발생했습니다.'}), 500
 
+# API 엔드포인트: 선박 일괄 삭제 {"ids": [1, 2, ...]}
+@views.route('/api/ships', methods=['DELETE'])
+def api_delete_ships():
+    """여러 선박을 한 번에 삭제하고 삭제/누락 id 를 반환하는 API 엔드포인트"""
+    data = request.get_json(silent=True) or {}
+    ids = data.get('ids')
+    if not isinstance(ids, list) or not ids:
+        return jsonify({'error': 'ids 목록이 필요합니다.'}), 400
+    try:
+        ids = [int(i) for i in ids]
+    except (TypeError, ValueError):
+        return jsonify({'error': 'ids 는 정수 목록이어야 합니다.'}), 400
+
+    try:
+        deleted, missing = bulk_delete_boats(ids)
+    except Exception as e:
+        current_app.logger.error(f"API delete ships error: {e}")
+        return jsonify({'error': '선박 삭제 중 오류가 발생했습니다.'}), 500
+    return jsonify({'success': True, 'deleted': deleted, 'missing': missing})
+
 @views.route('/sea-temp-test')
 @views.route('/sea-temp-test/<int:port_id>')
 def sea_temp_test(port_id=None):
@@ -1109,17 +1160,35 @@ def sea_temp_test(port_id=None):
         bada_port_ids=get_bada_port_ids(),
     )
 
+def _record_sea_temp(port_id, markers):
+    """수온 마커를 기록(sea_temp_readings)에 추가. 실패해도 응답은 그대로"""
+    from datetime import datetime
+    from db import save_sea_temp_readings, utc_now
+    from services.badatime import reading_rows
+    try:
+        save_sea_temp_readings(reading_rows(markers, utc_now(), datetime.now()))
+    except Exception as e:
+        current_app.logger.warning(f"수온 기록 저장 실패 (port_id={port_id}): {e}")
+
 @views.route('/api/sea_temp')
 def api_sea_temp():
-    """바다타임에서 수온 정보를 가져와서 자체 Kakao Maps API로 재구성"""
+    """바다타임에서 수온 정보를 가져와서 자체 Kakao Maps API로 재구성.
+    lean=1 이면 HTML 을 다시 쓰지 않고 지도 마커(name, temp, time, lat, lng)만 반환하며,
+    같은 port_id 는 SEA_TEMP_CACHE_TTL 동안 다시 받아오지 않습니다.
+    """
     import requests
     from bs4 import BeautifulSoup
-    import re
-    import json
+    from services.badatime import cached_sea_temp, parse_sea_temp, remember_sea_temp
     
     port_id = request.args.get('port_id', type=int, default=443)
+    lean = request.args.get('lean') in ('1', 'true')
     url = f"https://www.badatime.com/{port_id}/sea-temp"
     
+    if lean:
+        cached = cached_sea_temp(port_id, current_app.config.get('SEA_TEMP_CACHE_TTL', 600))
+        if cached is not None:
+            return jsonify(dict(cached, cached=True))
+    
     headers = {
         'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
     }
@@ -1128,6 +1197,19 @@ def api_sea_temp():
         response = requests.get(url, headers=headers, timeout=10)
         response.raise_for_status()
         
+        # 지도 스크립트에서 마커 데이터 추출 (위도, 경도, 라벨, 온도)
+        map_info = parse_sea_temp(response.text)
+        _record_sea_temp(port_id, map_info['markers'])
+        lean_result = {
+            'success': True,
+            'port_id': port_id,
+            'map_data': dict(map_info, zoom=8),
+            'source_url': url,
+        }
+        remember_sea_temp(port_id, lean_result, current_app.config.get('SEA_TEMP_CACHE_TTL', 600))
+        if lean:
+            return jsonify(dict(lean_result, cached=False))
+        
         soup = BeautifulSoup(response.content, 'html.parser')
         
         # main.content 영역 찾기
@@ -1136,44 +1218,6 @@ def api_sea_temp():
         if not content:
             return jsonify({'error': 'main.content 영역을 찾을 수 없습니다.'}), 404
         
-        # 지도 스크립트에서 마커 데이터 추출
-        map_markers = []
-        center_coords = {'lat': 34.5049, 'lng': 127.1228}  # 기본값
-        
-        for script in soup.find_all('script'):
-            if script.string and 'mapOption' in script.string:
-                script_text = script.string
-                
-                # 중심 좌표 추출
-                center_match = re.search(r'center:\s*new\s+daum\.maps\.LatLng\(([^,]+),\s*([^)]+)\)', script_text)
-                if center_match:
-                    center_coords = {
-                        'lat': float(center_match.group(1)),
-                        'lng': float(center_match.group(2))
-                    }
-                
-                # 마커 데이터 추출 (위도, 경도, 라벨, 온도)
-                # customOverlay content 추출
-                overlay_pattern = r"var content = '(.+?)';\s*var position = new daum\.maps\.LatLng\(([^,]+),\s*([^)]+)\);"
-                for match in re.finditer(overlay_pattern, script_text, re.DOTALL):
-                    content_html = match.group(1)
-                    lat = float(match.group(2))
-                    lng = float(match.group(3))
-                    
-                    # HTML에서 지역명과 온도 추출
-                    name_match = re.search(r'font-weight:600[^>]*>([^<]+?)\s*<span', content_html)
-                    temp_match = re.search(r'font-size:15px[^>]*>([^<]+)</span>', content_html)
-                    time_match = re.search(r'font-size:12px[^>]*>([^<]+)</div>', content_html)
-                    
-                    if name_match and temp_match:
-                        map_markers.append({
-                            'name': name_match.group(1).strip(),
-                            'temp': temp_match.group(1).strip(),
-                            'time': time_match.group(1).strip() if time_match else '',
-                            'lat': lat,
-                            'lng': lng
-                        })
-        
         # 이미지 경로를 절대 경로로 변환
         for img in content.find_all('img'):
             src = img.get('src', '')
@@ -1213,11 +1257,7 @@ def api_sea_temp():
         return jsonify({
             'success': True,
             'html': content_html,
-            'map_data': {
-                'center': center_coords,
-                'markers': map_markers,
-                'zoom': 8
-            },
+            'map_data': lean_result['map_data'],
             'highcharts_scripts': highcharts_scripts,
             'source_url': url
         })
@@ -1227,6 +1267,46 @@ def api_sea_temp():
     except Exception as e:
         return jsonify({'error': f'파싱 중 오류 발생: {str(e)}'}), 500
 
+@views.route('/api/sea_temp/history')
+def api_sea_temp_history():
+    """저장된 관측소별 수온 기록 (지도에 지난 수온 표시용).
+    요청: /api/sea_temp/history?days=7&name=여수  (name 은 여러 번 지정 가능, 없으면 전체)
+    """
+    from datetime import timedelta
+    from db import get_sea_temp_history, utc_now
+    days = max(1, min(365, request.args.get('days', default=7, type=int) or 7))
+    readings = get_sea_temp_history(utc_now() - timedelta(days=days), request.args.getlist('name'))
+    stations = {}
+    for r in readings:
+        station = stations.setdefault(r.name, {'name': r.name, 'lat': r.lat, 'lng': r.lng, 'series': []})
+        station['lat'], station['lng'] = r.lat, r.lng
+        station['series'].append({'time': r.observed, 'fetched_at': r.fetched_at.isoformat(), 'temp_c': r.temp_c})
+    return jsonify({'days': days, 'stations': list(stations.values())})
+
+@views.route('/snapshots/<date_str>/<region>.json')
+def published_snapshot(date_str, region):
+    """services/snapshot_publisher.py 가 게시한 날짜/지역별 JSON. 리버스 프록시가 같은 경로를
+    직접 내보내면 이 라우트는 쓰이지 않음. 클라이언트가 받으면 미리 압축된 .br/.gz 를 그대로 전송"""
+    from services.snapshot_publisher import is_safe_region, snapshot_path
+    out_dir = current_app.config.get('SNAPSHOT_PUBLISH_DIR')
+    if not out_dir or not re.fullmatch(r'\d{4}-\d{2}-\d{2}', date_str) or not is_safe_region(region):
+        return jsonify({'error': '게시된 스냅샷이 없습니다.'}), 404
+    out_dir = os.path.abspath(out_dir)
+    accepted = request.headers.get('Accept-Encoding', '')
+    for fmt, encoding in (('br', 'br'), ('gzip', 'gzip'), (None, None)):
+        if encoding and encoding not in accepted:
+            continue
+        path = snapshot_path(out_dir, date_str, region, fmt)
+        if not os.path.isfile(path):
+            continue
+        response = send_from_directory(out_dir, os.path.relpath(path, out_dir), mimetype='application/json',
+                                       max_age=60)
+        if encoding:
+            response.headers['Content-Encoding'] = encoding
+        response.vary.add('Accept-Encoding')
+        return response
+    return jsonify({'error': '게시된 스냅샷이 없습니다.'}), 404
+
 @views.route('/manifest.json')
 def pwa_manifest():
     """Serve the PWA manifest (root scope)."""
@@ -0,0 +1,99 @@
+"""저장된 운영사 페이지로 파서 성능 측정 + 골든 결과 검사 (네트워크 사용 안 함).
+
+scripts/log*.txt 와 tests/fixtures/pages/*.html 캡처를 parse_page 로 반복 파싱하여
+파서 경로(어댑터)별 pages/sec, p50/p95 파싱 시간, tracemalloc 최대 메모리를 출력하고,
+추출된 선박 목록이 tests/fixtures/parser_golden.json 과 같은지 확인합니다.
+
+사용 예:
+    python scripts/bench_parsers.py                  # 처음 조회(어댑터 탐색) 기준
+    python scripts/bench_parsers.py --remembered     # 기억된 어댑터로 바로 파싱
+    python scripts/bench_parsers.py --repeat 50
+    python scripts/bench_parsers.py --update-golden  # 파서 동작을 의도적으로 바꾼 경우
+"""
+import argparse
+import os
+import statistics
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from services.parser_corpus import (
+    discover_captures, load_capture, parse_capture, summarize, load_golden, write_golden, GOLDEN_PATH,
+)
+
+
+def _percentile(sorted_ms, q):
+    return sorted_ms[min(len(sorted_ms) - 1, int(len(sorted_ms) * q))]
+
+
+def main():
+    parser = argparse.ArgumentParser(description='오프라인 파서 벤치마크')
+    parser.add_argument('captures', nargs='*', help='캡처 파일 (기본: scripts/log*.txt, tests/fixtures/pages/*.html)')
+    parser.add_argument('--repeat', type=int, default=20, help='페이지당 반복 횟수')
+    parser.add_argument('--remembered', action='store_true', help='골든의 parser 를 parser_type 으로 넘겨 측정')
+    parser.add_argument('--update-golden', action='store_true', help='현재 결과로 골든 파일 갱신')
+    parser.add_argument('--golden', default=GOLDEN_PATH)
+    args = parser.parse_args()
+
+    captures = [load_capture(p) for p in (args.captures or discover_captures())]
+    if not captures:
+        print("캡처 파일이 없습니다.")
+        return 1
+    golden = load_golden(args.golden)
+
+    stats = {}  # 파서 경로 -> {'times': [...], 'peak': bytes, 'bytes': total}
+    current = {}
+    for cap in captures:
+        parser_type = (golden.get(cap['name']) or {}).get('parser') if args.remembered else None
+
+        # 메모리는 별도 1회 측정 (tracemalloc 이 시간 측정을 왜곡하지 않도록)
+        tracemalloc.start()
+        result = parse_capture(cap, parser_type=parser_type)
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        current[cap['name']] = summarize(result)
+
+        times = []
+        for _ in range(args.repeat):
+            t0 = time.perf_counter()
+            parse_capture(cap, parser_type=parser_type)
+            times.append(time.perf_counter() - t0)
+
+        path = result.get('parser') or '(none)'
+        s = stats.setdefault(path, {'times': [], 'peak': 0, 'bytes': 0, 'pages': 0})
+        s['times'].extend(times)
+        s['peak'] = max(s['peak'], peak)
+        s['bytes'] += len(cap['content'])
+        s['pages'] += 1
+        ms = sorted(t * 1000 for t in times)
+        print(f"{cap['name']:<34} {len(cap['content']) / 1024:7.1f}KB  parser={path:<14} "
+              f"entries={len(result.get('entries', [])):<3} p50 {statistics.median(ms):7.2f}ms  "
+              f"peak {peak / 1024 / 1024:6.2f}MB")
+
+    print()
+    print(f"{'parser':<16}{'pages':>6}{'pages/s':>10}{'p50 ms':>10}{'p95 ms':>10}{'peak MB':>10}")
+    for path, s in sorted(stats.items()):
+        ms = sorted(t * 1000 for t in s['times'])
+        print(f"{path:<16}{s['pages']:>6}{len(ms) / (sum(ms) / 1000):>10.1f}{statistics.median(ms):>10.2f}"
+              f"{_percentile(ms, 0.95):>10.2f}{s['peak'] / 1024 / 1024:>10.2f}")
+
+    if args.update_golden:
+        golden.update(current)
+        write_golden(golden, args.golden)
+        print(f"\n골든 파일 갱신: {args.golden} ({len(current)}개)")
+        return 0
+
+    mismatched = [name for name, summary in current.items() if golden.get(name) != summary]
+    if mismatched:
+        print("\n골든 결과와 다른 페이지:")
+        for name in mismatched:
+            print(f"  {name}" + ("" if name in golden else " (골든 없음: --update-golden 으로 추가)"))
+        return 1
+    print(f"\n골든 결과 일치: {len(current)}개 페이지")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
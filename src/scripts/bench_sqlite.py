@@ -0,0 +1,109 @@
+"""SQLite 동시 읽기/쓰기 벤치마크.
+
+임시 DB 파일에 배 데이터를 채운 뒤, 읽기 스레드(지역별 집계 + 지역 필터 조회)와
+쓰기 스레드(배치 upsert)를 동시에 돌려 처리량과 잠금 오류 수를 측정합니다.
+--no-pragmas 로 기본 SQLite 설정(rollback journal)과 비교할 수 있습니다.
+
+사용 예:
+    python scripts/bench_sqlite.py --readers 8 --writers 2 --seconds 10
+    python scripts/bench_sqlite.py --no-pragmas
+"""
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import threading
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+
+def main():
+    parser = argparse.ArgumentParser(description='SQLite 동시성 벤치마크')
+    parser.add_argument('--boats', type=int, default=2000)
+    parser.add_argument('--readers', type=int, default=8)
+    parser.add_argument('--writers', type=int, default=2)
+    parser.add_argument('--seconds', type=float, default=10)
+    parser.add_argument('--no-pragmas', action='store_true', help='WAL 등 PRAGMA 없이 측정')
+    args = parser.parse_args()
+
+    tmpdir = tempfile.mkdtemp(prefix='bench_sqlite_')
+    os.environ['DATABASE_URL'] = f"sqlite:///{os.path.join(tmpdir, 'bench.db')}"
+
+    import app as app_module
+    import db as db_module
+    if args.no_pragmas:
+        db_module.DEFAULT_SQLITE_PRAGMAS.clear()
+    app = app_module.create_app()
+
+    from db import db, upsert_boats, count_boats_by_city, get_boats
+    from forms import REGION_CHOICES
+    regions = [v for v, _ in REGION_CHOICES if v]
+
+    with app.app_context():
+        upsert_boats([{'name': f'bench{i}', 'url': f'http://h{i % 50}.example/index.php?mid=bk',
+                       'city': regions[i % len(regions)], 'port': '항구', 'note': None}
+                      for i in range(args.boats)])
+        mode = db.session.execute(db.text('PRAGMA journal_mode')).scalar()
+
+    stop = threading.Event()
+    stats = {'read': [], 'write': [], 'errors': 0}
+    lock = threading.Lock()
+
+    def reader(n):
+        while not stop.is_set():
+            t0 = time.perf_counter()
+            try:
+                with app.app_context():
+                    count_boats_by_city()
+                    get_boats(cities=[regions[n % len(regions)]])
+                elapsed = time.perf_counter() - t0
+                with lock:
+                    stats['read'].append(elapsed)
+            except Exception:
+                with lock:
+                    stats['errors'] += 1
+
+    def writer(n):
+        i = 0
+        while not stop.is_set():
+            rows = [{'name': f'bench{(n * 7919 + i * 50 + k) % args.boats}', 'url': 'http://w.example/',
+                     'city': regions[k % len(regions)], 'port': '항구', 'note': f'w{n}-{i}'} for k in range(50)]
+            t0 = time.perf_counter()
+            try:
+                with app.app_context():
+                    upsert_boats(rows)
+                elapsed = time.perf_counter() - t0
+                with lock:
+                    stats['write'].append(elapsed)
+            except Exception:
+                with lock:
+                    stats['errors'] += 1
+            i += 1
+
+    threads = [threading.Thread(target=reader, args=(n,)) for n in range(args.readers)]
+    threads += [threading.Thread(target=writer, args=(n,)) for n in range(args.writers)]
+    for t in threads:
+        t.start()
+    time.sleep(args.seconds)
+    stop.set()
+    for t in threads:
+        t.join()
+
+    def summary(samples):
+        if not samples:
+            return "0 ops"
+        ms = sorted(s * 1000 for s in samples)
+        p95 = ms[min(len(ms) - 1, int(len(ms) * 0.95))]
+        return (f"{len(ms) / args.seconds:8.1f} ops/s  p50 {statistics.median(ms):7.2f}ms  "
+                f"p95 {p95:7.2f}ms  max {ms[-1]:7.2f}ms")
+
+    print(f"journal_mode={mode}  readers={args.readers}  writers={args.writers}  boats={args.boats}")
+    print(f"read : {summary(stats['read'])}")
+    print(f"write: {summary(stats['write'])}")
+    print(f"errors (database is locked 등): {stats['errors']}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,130 @@
+"""/status, /api/status 종단 간 부하 테스트 (로컬 흉내 서버 사용, 외부 사이트 접속 없음).
+
+mock_operator_server 로 여러 host 를 띄우고, 임시 DB 에 배 N 척(기본 10/100/500)을
+등록한 뒤 Flask test client 로 /status 와 /api/status 를 동시에 호출하여 지연 시간과
+처리량을 측정합니다. 배 5척 중 1척은 sunsang24 선단(schedule_fleet) 형식입니다.
+
+사용 예:
+    python scripts/load_test_status.py
+    python scripts/load_test_status.py --boats 500 --hosts 50 --latency 200 --requests 4
+    python scripts/load_test_status.py --forbidden-rate 0.3 --error-rate 0.05 --skip-api
+"""
+from concurrent.futures import ThreadPoolExecutor
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from scripts.mock_operator_server import (
+    MockOperatorSite, start_servers, stop_servers, host_addresses, board_url, schedule_url, slow_host_map,
+)
+
+QUERY_DATE = (2025, 11, 22)
+
+
+def boat_rows(count: int, addrs, port: int, regions):
+    rows = []
+    for i in range(count):
+        addr = addrs[i % len(addrs)]
+        url = schedule_url(addr, port) if i % 5 == 4 else board_url(addr, port, i)
+        rows.append({'name': f'부하{i:04d}호', 'url': url, 'city': regions[i % len(regions)],
+                     'port': '항구', 'note': None})
+    return rows
+
+
+def measure(call, requests: int, concurrency: int):
+    """call() 을 requests 번 (동시 concurrency) 실행하여 지연/처리량 요약"""
+    latencies, failures = [], 0
+
+    def one(_):
+        t0 = time.perf_counter()
+        ok = call()
+        return time.perf_counter() - t0, ok
+
+    t_start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        for elapsed, ok in pool.map(one, range(requests)):
+            latencies.append(elapsed)
+            failures += 0 if ok else 1
+    wall = time.perf_counter() - t_start
+    ms = sorted(t * 1000 for t in latencies)
+    p95 = ms[min(len(ms) - 1, int(len(ms) * 0.95))]
+    return (f"{requests / wall:6.2f} req/s  p50 {statistics.median(ms):8.1f}ms  p95 {p95:8.1f}ms  "
+            f"max {ms[-1]:8.1f}ms  실패 {failures}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='/status 부하 테스트')
+    parser.add_argument('--boats', type=int, nargs='+', default=[10, 100, 500])
+    parser.add_argument('--hosts', type=int, default=20)
+    parser.add_argument('--port', type=int, default=8900)
+    parser.add_argument('--latency', type=float, default=100)
+    parser.add_argument('--jitter', type=float, default=50)
+    parser.add_argument('--error-rate', type=float, default=0.0)
+    parser.add_argument('--forbidden-rate', type=float, default=0.0)
+    parser.add_argument('--slow-hosts', type=int, default=0, help='마지막 N 개 host 를 느리게')
+    parser.add_argument('--slow-factor', type=float, default=5.0)
+    parser.add_argument('--stall-rate', type=float, default=0.0, help='응답이 멈추는 요청 비율')
+    parser.add_argument('--stall-ms', type=float, default=8000)
+    parser.add_argument('--requests', type=int, default=6, help='구간별 요청 수')
+    parser.add_argument('--concurrency', type=int, default=3, help='동시 요청 수')
+    parser.add_argument('--skip-api', action='store_true', help='/api/status (순차 조회) 측정 생략')
+    args = parser.parse_args()
+
+    tmpdir = tempfile.mkdtemp(prefix='load_test_')
+    os.environ['DATABASE_URL'] = f"sqlite:///{os.path.join(tmpdir, 'load.db')}"
+
+    import app as app_module
+    app = app_module.create_app()
+    # 부하 테스트 중에는 실시간 폴링/좌석 감시 출력이 측정에 섞이지 않도록 싱크 비활성
+    app.extensions['seat_watcher'].sinks.clear()
+
+    from db import db, upsert_boats
+    from models import Boat
+    from forms import REGION_CHOICES
+    from services.host_stats import HOSTS
+    regions = [v for v, _ in REGION_CHOICES if v]
+
+    site = MockOperatorSite(args.latency, args.jitter, args.error_rate, args.forbidden_rate,
+                            slow_hosts=slow_host_map(args.hosts, args.slow_hosts, args.slow_factor),
+                            stall_rate=args.stall_rate, stall_ms=args.stall_ms)
+    servers = start_servers(site, args.hosts, args.port)
+    addrs = host_addresses(args.hosts)
+    client = app.test_client()
+    year, month, day = QUERY_DATE
+
+    def status_call():
+        resp = client.get(f'/status?year={year}&month={month}&day={day}&regions=전체')
+        return resp.status_code == 200
+
+    def api_call():
+        resp = client.post('/api/status', json={'year': year, 'month': month, 'day': day})
+        return resp.status_code == 200
+
+    print(f"mock host {args.hosts}개, 지연 {args.latency}±{args.jitter}ms, "
+          f"오류 {args.error_rate:.0%}, 403 {args.forbidden_rate:.0%}, 느린 host {args.slow_hosts}개 "
+          f"(x{args.slow_factor:g}), 동시 요청 {args.concurrency}")
+    try:
+        for count in args.boats:
+            with app.app_context():
+                Boat.query.delete()
+                db.session.commit()
+                upsert_boats(boat_rows(count, addrs, args.port, regions))
+            before = site.requests
+            print(f"\n[배 {count}척]")
+            print(f"  /status     : {measure(status_call, args.requests, args.concurrency)}")
+            if not args.skip_api:
+                print(f"  /api/status : {measure(api_call, max(1, args.requests // 3), 1)}")
+            print(f"  mock 요청 수: {site.requests - before}")
+            slowest = HOSTS.snapshot()[:3]
+            print("  느린 host  : " + ", ".join(f"{r['host']} {r['ewma_ms']:.0f}ms" for r in slowest if r['ewma_ms']))
+    finally:
+        stop_servers(servers)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,224 @@
+"""부하 테스트용 로컬 운영사 사이트 흉내 서버.
+
+실제 낚시배 사이트 대신, 저장해 둔 캡처(scripts/log*.txt, tests/fixtures/pages)를
+바탕으로 게시판(index.php?mid=bk) 과 sunsang24 선단 스케줄(/ship/schedule_fleet/YYYYMM)
+페이지를 돌려줍니다. 127.0.0.2, 127.0.0.3 ... 주소마다 서버를 하나씩 띄워 서로 다른
+운영사 host 처럼 보이게 합니다 (Linux 는 127.0.0.0/8 전체가 loopback. macOS 는
+`sudo ifconfig lo0 alias 127.0.0.2` 등으로 별칭을 추가해야 함).
+
+응답 지연, 오류(500) 비율, 403 동작(첫 시도의 Chrome UA 는 403, 재시도 UA 는 통과),
+일부 host 만 느리게 하는 지연 배수, 가끔 몇 초씩 멈추는 비율을 옵션으로 조절할 수 있습니다.
+
+사용 예:
+    python scripts/mock_operator_server.py --hosts 20 --port 8900 --latency 150 --jitter 100
+    python scripts/mock_operator_server.py --error-rate 0.05 --forbidden-rate 0.2
+"""
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse, parse_qs
+import argparse
+import calendar
+import os
+import random
+import re
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from services.parser_corpus import discover_captures, load_capture
+
+SCHEDULE_PATH_RE = re.compile(r'/ship/schedule_fleet/(\d{4})(\d{2})')
+
+
+def host_addresses(count: int):
+    """127.0.0.2 부터 count 개 (127.0.0.1 은 앱 서버용으로 남겨 둠)"""
+    return [f"127.0.0.{2 + i}" for i in range(count)]
+
+
+def _board_templates():
+    templates = []
+    for path in discover_captures():
+        cap = load_capture(path)
+        if 'mid=bk' in cap['url'] and b'new-div-' in cap['content']:
+            date8 = f"{cap['year']:04d}{cap['month']:02d}{cap['day']:02d}"
+            templates.append((cap['name'], date8, cap['content'].decode('utf-8', 'replace')))
+    if not templates:
+        raise RuntimeError("게시판 캡처(scripts/log*.txt)를 찾을 수 없습니다.")
+    return templates
+
+
+def schedule_page(year: int, month: int, seed: str) -> str:
+    """한 달치 선단 스케줄 페이지 생성 (날짜/선박별 잔여석은 seed 로 고정)"""
+    rnd = random.Random(seed)
+    days = []
+    for day in range(1, calendar.monthrange(year, month)[1] + 1):
+        tables = []
+        for n in range(1, 4):
+            seats = rnd.choice([0, 0, 3, 7, 12])
+            status = ('<span class="shipping_status">예약가능</span> 남은자리 '
+                      f'<span class="number blink_me n_blue f_20">{seats}</span>명') if seats else \
+                '<span class="shipping_status" data-status_code="END">예약마감</span>'
+            tables.append(
+                f'<table class="ship_unit"><tr><td><div class="ship_info"><span class="title">모의{n}호</span>'
+                f'<span class="fish">쭈꾸미</span></div><div class="ship_info2">{status}</div></td></tr></table>')
+        days.append(f'<div class="shipsinfo_daywarp" id="d{year:04d}-{month:02d}-{day:02d}">'
+                    f'<div class="date_info2">{month}.{day} {(day % 14) + 1}물</div>'
+                    f'<div class="ships_warp">{"".join(tables)}</div></div>')
+    return ('<!DOCTYPE html><html lang="ko"><head><meta charset="utf-8"><title>선단 스케줄</title></head>'
+            f'<body>{"".join(days)}</body></html>')
+
+
+class MockOperatorSite:
+    """응답 생성과 지연/오류 설정. 모든 host 서버가 공유"""
+
+    def __init__(self, latency_ms: float = 0, jitter_ms: float = 0, error_rate: float = 0,
+                 forbidden_rate: float = 0, seed: int = 0, slow_hosts: dict = None,
+                 stall_rate: float = 0, stall_ms: float = 8000):
+        self.latency_ms = latency_ms
+        # 가끔 몇 초씩 멈추는 사이트 흉내 (요청 stall_rate 비율로 stall_ms 만큼 지연)
+        self.stall_rate = stall_rate
+        self.stall_ms = stall_ms
+        # {host 주소: 지연 배수} — 느린 운영사 흉내
+        self.slow_hosts = dict(slow_hosts or {})
+        self.jitter_ms = jitter_ms
+        self.error_rate = error_rate
+        self.forbidden_rate = forbidden_rate
+        self.templates = _board_templates()
+        self._rnd = random.Random(seed)
+        self._lock = threading.Lock()
+        self.requests = 0
+
+    def _roll(self) -> float:
+        with self._lock:
+            return self._rnd.random()
+
+    def delay(self, host: str = None) -> float:
+        with self._lock:
+            jitter = self._rnd.uniform(-self.jitter_ms, self.jitter_ms) if self.jitter_ms else 0
+            stall = self.stall_ms if self.stall_rate and self._rnd.random() < self.stall_rate else 0
+        return (max(0.0, self.latency_ms + jitter) * self.slow_hosts.get(host, 1) + stall) / 1000.0
+
+    def respond(self, host: str, path: str, user_agent: str):
+        """(status, body) 반환"""
+        with self._lock:
+            self.requests += 1
+        if self.error_rate and self._roll() < self.error_rate:
+            return 500, "<html><body>Internal Server Error</body></html>"
+        # 운영사 방화벽 흉내: 첫 시도(Chrome UA)는 막고, 재시도(Firefox UA)는 통과
+        if self.forbidden_rate and 'Firefox' not in user_agent and self._roll() < self.forbidden_rate:
+            return 403, "<html><body>Forbidden</body></html>"
+
+        parsed = urlparse(path)
+        m = SCHEDULE_PATH_RE.match(parsed.path)
+        if m:
+            return 200, schedule_page(int(m.group(1)), int(m.group(2)), seed=f"{host}{parsed.path}")
+
+        query = parse_qs(parsed.query)
+        if query.get('mid', [''])[0] != 'bk':
+            return 404, "<html><body>Not Found</body></html>"
+        try:
+            date8 = f"{int(query['year'][0]):04d}{int(query['month'][0]):02d}{int(query['day'][0]):02d}"
+        except (KeyError, ValueError):
+            return 400, "<html><body>Bad Request</body></html>"
+        # host+boat 별로 항상 같은 캡처를 사용하고, 캡처 날짜를 요청 날짜로 바꿔 돌려줌
+        key = f"{host}{query.get('b', [''])[0]}"
+        _, capture_date8, html = self.templates[sum(key.encode()) % len(self.templates)]
+        return 200, html.replace(capture_date8, date8)
+
+
+class _QuietServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def handle_error(self, request, client_address):
+        # 조기 종료로 클라이언트가 끊은 연결은 무시
+        if isinstance(sys.exc_info()[1], ConnectionError):
+            return
+        super().handle_error(request, client_address)
+
+
+def _make_handler(site: MockOperatorSite):
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = 'HTTP/1.1'
+
+        def do_GET(self):
+            time.sleep(site.delay(self.server.server_address[0]))
+            status, body = site.respond(self.server.server_address[0], self.path, self.headers.get('User-Agent', ''))
+            data = body.encode('utf-8')
+            self.send_response(status)
+            self.send_header('Content-Type', 'text/html; charset=utf-8')
+            self.send_header('Content-Length', str(len(data)))
+            self.end_headers()
+            try:
+                self.wfile.write(data)
+            except (BrokenPipeError, ConnectionResetError):
+                # 클라이언트가 필요한 블록까지만 받고 연결을 끊은 경우
+                self.close_connection = True
+
+        def log_message(self, format, *args):
+            pass
+
+    return Handler
+
+
+def start_servers(site: MockOperatorSite, hosts: int, port: int):
+    """host 마다 ThreadingHTTPServer 를 데몬 스레드로 실행하고 서버 목록 반환"""
+    servers = []
+    handler = _make_handler(site)
+    for addr in host_addresses(hosts):
+        server = _QuietServer((addr, port), handler)
+        threading.Thread(target=server.serve_forever, name=f'mock-{addr}', daemon=True).start()
+        servers.append(server)
+    return servers
+
+
+def stop_servers(servers):
+    for server in servers:
+        server.shutdown()
+        server.server_close()
+
+
+def slow_host_map(hosts: int, slow: int, factor: float) -> dict:
+    """마지막 slow 개 host 주소 → 지연 배수 (id 순 제출 시 가장 늦게 제출되는 host)"""
+    return {addr: factor for addr in host_addresses(hosts)[hosts - slow:]} if slow > 0 else {}
+
+
+def board_url(addr: str, port: int, boat_no: int) -> str:
+    return f"http://{addr}:{port}/index.php?mid=bk&b={boat_no}"
+
+
+def schedule_url(addr: str, port: int) -> str:
+    return f"http://{addr}:{port}/ship/schedule_fleet"
+
+
+def main():
+    parser = argparse.ArgumentParser(description='로컬 운영사 사이트 흉내 서버')
+    parser.add_argument('--hosts', type=int, default=10, help='띄울 host 수 (127.0.0.2 부터)')
+    parser.add_argument('--port', type=int, default=8900)
+    parser.add_argument('--latency', type=float, default=100, help='평균 응답 지연(ms)')
+    parser.add_argument('--jitter', type=float, default=50, help='지연 편차(ms, ±)')
+    parser.add_argument('--error-rate', type=float, default=0.0, help='500 응답 비율 (0~1)')
+    parser.add_argument('--forbidden-rate', type=float, default=0.0, help='첫 시도 403 비율 (0~1)')
+    parser.add_argument('--slow-hosts', type=int, default=0, help='마지막 N 개 host 를 느리게')
+    parser.add_argument('--slow-factor', type=float, default=5.0, help='느린 host 의 지연 배수')
+    parser.add_argument('--stall-rate', type=float, default=0.0, help='응답이 멈추는 요청 비율 (0~1)')
+    parser.add_argument('--stall-ms', type=float, default=8000, help='멈추는 시간(ms)')
+    args = parser.parse_args()
+
+    site = MockOperatorSite(args.latency, args.jitter, args.error_rate, args.forbidden_rate,
+                            slow_hosts=slow_host_map(args.hosts, args.slow_hosts, args.slow_factor),
+                            stall_rate=args.stall_rate, stall_ms=args.stall_ms)
+    servers = start_servers(site, args.hosts, args.port)
+    addrs = host_addresses(args.hosts)
+    print(f"{len(servers)}개 host 실행 중: {addrs[0]} ~ {addrs[-1]} :{args.port}")
+    print(f"  게시판 예: {board_url(addrs[0], args.port, 1)}")
+    print(f"  선단 예  : {schedule_url(addrs[0], args.port)}")
+    try:
+        while True:
+            time.sleep(1)
+    except KeyboardInterrupt:
+        stop_servers(servers)
+
+
+if __name__ == '__main__':
+    main()
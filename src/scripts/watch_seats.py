@@ -0,0 +1,55 @@
+"""좌석 감시 모드 실행 스크립트.
+
+등록된 배를 주기적으로 조회하여 마감 → 예약가능(취소석 발생), 잔여석 변경,
+마감 전환만 출력(및 웹훅 전송)합니다.
+
+사용 예:
+    python scripts/watch_seats.py 2025-11-22 --regions 보령 태안 --interval 60
+    python scripts/watch_seats.py 2025-11-22 --webhook http://127.0.0.1:9000/hook
+"""
+import argparse
+import logging
+import os
+import sys
+from types import SimpleNamespace
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app import create_app
+from db import get_boats
+from services.seat_watcher import LogSink, SeatWatcher, WebhookSink
+
+
+def main():
+    parser = argparse.ArgumentParser(description='좌석 변화 감시')
+    parser.add_argument('dates', nargs='+', help='YYYY-MM-DD (여러 개 가능)')
+    parser.add_argument('--regions', nargs='*', default=[], help='감시할 지역 (미지정 시 전체)')
+    parser.add_argument('--interval', type=float, default=60, help='조회 주기(초)')
+    parser.add_argument('--webhook', help='변화 이벤트를 POST 할 URL')
+    parser.add_argument('--initial', action='store_true', help='첫 조회에서 열려 있는 배도 알림')
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s %(message)s')
+    dates = [tuple(int(x) for x in d.split('-')) for d in args.dates]
+
+    sinks = [LogSink()]
+    if args.webhook:
+        sinks.append(WebhookSink(args.webhook))
+    watcher = SeatWatcher(sinks, emit_initial=args.initial)
+
+    app = create_app()
+
+    def load_boats():
+        with app.app_context():
+            boats = get_boats(cities=args.regions)
+            # 세션 종료 후에도 속성을 읽을 수 있도록 필요한 값만 분리
+            return [SimpleNamespace(**b.to_dict()) for b in boats]
+
+    try:
+        watcher.watch(load_boats, dates, interval=args.interval)
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == '__main__':
+    main()
@@ -49,6 +49,9 @@ self.addEventListener('fetch', event => {
 
   const url = new URL(request.url);
 
+  // SSE 스트림(/api/status/stream)은 끝나지 않는 응답이므로 SW 를 거치지 않음
+  if ((request.headers.get('Accept') || '').includes('text/event-stream')) return;
+
   // Same-origin static: Cache-first
   if (url.origin === self.location.origin) {
     event.respondWith(
@@ -71,3 +74,41 @@ self.addEventListener('fetch', event => {
   // Cross-origin (e.g., badatime iframe) – just try network; no cache
   event.respondWith(fetch(request));
 });
+
+// Web Push: 서버가 보낸 좌석 변화 이벤트를 알림으로 표시
+self.addEventListener('push', event => {
+  let data = {};
+  try { data = event.data ? event.data.json() : {}; } catch (e) { data = { ship_name: event.data && event.data.text() }; }
+
+  const labels = { opened: '자리 발생', seats_changed: '남은자리 변경', closed: '예약마감' };
+  const title = `${labels[data.type] || '좌석 변화'} · ${data.ship_name || data.registered_name || ''}`;
+  const body = [data.date, data.port, data.available != null ? `남은자리 ${data.available}명` : '']
+    .filter(Boolean).join(' · ');
+  const [y, m, d] = (data.date || '').split('-');
+  const target = y ? `/status?year=${y}&month=${m}&day=${d}` : '/status';
+
+  event.waitUntil(
+    self.registration.showNotification(title, {
+      body,
+      tag: `seat-${data.boat_id}-${data.ship_name}-${data.date}`,
+      renotify: true,
+      data: { url: target }
+    })
+  );
+});
+
+self.addEventListener('notificationclick', event => {
+  event.notification.close();
+  const target = (event.notification.data && event.notification.data.url) || '/status';
+  event.waitUntil(
+    self.clients.matchAll({ type: 'window', includeUncontrolled: true }).then(list => {
+      for (const client of list) {
+        if (new URL(client.url).pathname === '/status' && 'focus' in client) {
+          client.navigate(target);
+          return client.focus();
+        }
+      }
+      return self.clients.openWindow(target);
+    })
+  );
+});
@@ -0,0 +1,242 @@
+"""바다타임(badatime.com) 페이지 파싱.
+
+주간 예보 페이지(/{port_id}/tide/YYYY-MM-DD)의 week_table 은 여러 날의 시간대 열을 한 표에
+담고 있습니다. parse_week 는 열마다 날짜를 붙여 날짜별 행 목록으로 나눕니다. 열의 날짜는
+표에 날짜 표기(thead 의 날짜 칸, 시간 칸 안의 'N일' / 'M.D' 등)가 있으면 그 값을 쓰고, 없으면
+요청 날짜에서 시작해 시간이 되돌아갈 때(21시 → 00시) 다음 날로 넘깁니다.
+
+수온 지도 페이지(/{port_id}/sea-temp)는 지도 스크립트 안의 관측소 마커만 정규식으로 뽑습니다.
+결과는 port_id 별로 프로세스 메모리에 잠시(SEA_TEMP_CACHE_TTL) 보관합니다.
+"""
+from datetime import date, datetime, timedelta
+from typing import Dict, List, Optional, Tuple
+import re
+import threading
+import time
+
+from bs4 import BeautifulSoup
+
+WEEK_FIELDS = ('time', 'weather_icon_url', 'weather_text', 'temperature', 'wind_dir', 'wind_dir_icon_url',
+               'wind_speed', 'wave_height', 'humidity', 'precipitation')
+# 차트용 숫자 계열로 바꾸는 필드 (문자열의 첫 숫자, 없으면 None)
+NUMERIC_FIELDS = ('temperature', 'wind_speed', 'wave_height', 'humidity', 'precipitation')
+
+_HOUR_RE = re.compile(r'(\d{1,2})\s*시')
+_NUMBER_RE = re.compile(r'-?\d+(?:\.\d+)?')
+_ISO_DATE_RE = re.compile(r'(\d{4})-(\d{1,2})-(\d{1,2})')
+_MONTH_DAY_RE = re.compile(r'(\d{1,2})\s*[./월]\s*(\d{1,2})')
+_DAY_RE = re.compile(r'(\d{1,2})\s*일')
+
+
+class WeekParseError(ValueError):
+    """week_table 구조가 예상과 다름 (메시지는 API 오류로 그대로 반환)"""
+
+
+def _cell_date(text: str, start: date) -> Optional[date]:
+    """칸 안의 날짜 표기를 start 이후(최대 약 한 달)의 날짜로 해석"""
+    m = _ISO_DATE_RE.search(text)
+    if m:
+        return date(int(m.group(1)), int(m.group(2)), int(m.group(3)))
+    m = _MONTH_DAY_RE.search(text)
+    if m:
+        month, day = int(m.group(1)), int(m.group(2))
+        year = start.year + (1 if month < start.month - 6 else 0)
+        try:
+            return date(year, month, day)
+        except ValueError:
+            return None
+    m = _DAY_RE.search(text)
+    if m:
+        day = int(m.group(1))
+        month_start = start.replace(day=1)
+        if day < start.day - 7:  # 다음 달로 넘어감
+            month_start = (month_start + timedelta(days=32)).replace(day=1)
+        try:
+            return month_start.replace(day=day)
+        except ValueError:
+            return None
+    return None
+
+
+def _hour(text: str) -> Optional[int]:
+    m = _HOUR_RE.search(text)
+    return int(m.group(1)) if m else None
+
+
+def _header_dates(table, count: int, start: date) -> List[Optional[date]]:
+    """thead 의 날짜 칸(colspan 으로 여러 시간 열을 묶음)을 열 단위로 펼침"""
+    for tr in table.select('thead tr'):
+        cols: List[Optional[date]] = []
+        for cell in tr.find_all(['th', 'td']):
+            span = int(cell.get('colspan') or 1)
+            cols.extend([_cell_date(cell.get_text(' ', strip=True), start)] * span)
+        cols = cols[-count:] if len(cols) > count else cols
+        if len(cols) == count and any(cols):
+            return cols
+    return [None] * count
+
+
+def column_dates(times: List[str], start: date, header: List[Optional[date]] = None) -> List[date]:
+    """열별 날짜. 표기된 날짜가 있으면 그 날짜, 없으면 시간이 되돌아갈 때마다 하루씩 증가"""
+    header = header or [None] * len(times)
+    dates = []
+    current, last_hour = start, None
+    for text, marked in zip(times, header):
+        marked = marked or _cell_date(text, start)
+        hour = _hour(text)
+        if marked:
+            current = marked
+        elif hour is not None and last_hour is not None and hour < last_hour:
+            current = current + timedelta(days=1)
+        if hour is not None:
+            last_hour = hour
+        dates.append(current)
+    return dates
+
+
+def parse_week(html: str, start: date) -> Dict[str, List[Dict]]:
+    """week_table 을 날짜('YYYY-MM-DD')별 시간대 행 목록으로 나눔"""
+    soup = BeautifulSoup(html, 'html.parser')
+    week_container = soup.select_one('.week_container')
+    if not week_container:
+        raise WeekParseError('week_container(class)를 찾을 수 없습니다.')
+    table = week_container.select_one('table.week_table')
+    if not table:
+        raise WeekParseError('week_table을 찾을 수 없습니다.')
+    rows = table.select('tbody > tr')
+    if not rows or len(rows) < 5:
+        raise WeekParseError('예상보다 적은 행. 구조 변경 가능성.')
+
+    def label(tr):
+        td = tr.find('td')
+        return td.get_text() if td else ''
+
+    def icons(tr):
+        out = []
+        for td in tr.find_all('td')[1:]:
+            img = td.find('img')
+            out.append(img['src'] if img else '')
+        return out
+
+    def texts(tr):
+        return [td.get_text(strip=True) for td in tr.find_all('td')[1:]]
+
+    # 1행: 날짜 + 시간 헤더들
+    times = [c.get_text(strip=True).replace('현재', '').strip() for c in rows[0].find_all('td')[1:]]
+    count = len(times)
+    blank = [''] * count
+    # 행 식별: 2행 아이콘, 3행 날씨텍스트, 4행 기온, 5행 풍향, 6행 풍속, 7행 파고, 8행 습도, 9행 강수량
+    columns = {
+        'time': times,
+        'weather_icon_url': icons(rows[1]),
+        'weather_text': texts(rows[2]),
+        'temperature': texts(rows[3]) if '기온' in label(rows[3]) else blank,
+        'wind_dir': texts(rows[4]),
+        'wind_dir_icon_url': icons(rows[4]),
+        'wind_speed': texts(rows[5]) if len(rows) > 5 and '풍속' in label(rows[5]) else blank,
+        'wave_height': texts(rows[6]) if len(rows) > 6 and '파고' in label(rows[6]) else blank,
+        'humidity': texts(rows[7]) if len(rows) > 7 and '습도' in label(rows[7]) else blank,
+        'precipitation': texts(rows[8]) if len(rows) > 8 and '강수' in label(rows[8]) else blank,
+    }
+
+    dates = column_dates(times, start, _header_dates(table, count, start))
+    by_date: Dict[str, List[Dict]] = {}
+    for i in range(count):
+        row = {f: (columns[f][i] if i < len(columns[f]) else '') for f in WEEK_FIELDS}
+        by_date.setdefault(dates[i].isoformat(), []).append(row)
+    return by_date
+
+
+def to_number(text: str) -> Optional[float]:
+    m = _NUMBER_RE.search(text or '')
+    return float(m.group()) if m else None
+
+
+def numeric_series(rows: List[Dict]) -> Dict[str, List]:
+    """시간대 행 목록 → 차트용 계열 {hour: [...], temperature: [...], ...} (값이 없으면 None)"""
+    series = {'hour': [None if h is None else float(h) for h in (_hour(r.get('time', '')) for r in rows)]}
+    for field in NUMERIC_FIELDS:
+        series[field] = [to_number(r.get(field)) for r in rows]
+    return series
+
+
+# ---- 수온 지도 (/{port_id}/sea-temp) ----
+SEA_TEMP_DEFAULT_CENTER = {'lat': 34.5049, 'lng': 127.1228}
+
+_MAP_CENTER_RE = re.compile(r'center:\s*new\s+daum\.maps\.LatLng\(([^,]+),\s*([^)]+)\)')
+_OVERLAY_RE = re.compile(
+    r"var content = '(.+?)';\s*var position = new daum\.maps\.LatLng\(([^,]+),\s*([^)]+)\);", re.DOTALL)
+_MARKER_NAME_RE = re.compile(r'font-weight:600[^>]*>([^<]+?)\s*<span')
+_MARKER_TEMP_RE = re.compile(r'font-size:15px[^>]*>([^<]+)</span>')
+_MARKER_TIME_RE = re.compile(r'font-size:12px[^>]*>([^<]+)</div>')
+# 관측 시각 표기에 날짜가 들어 있는지 ('11-22 14:00', '11.22', '11월 22일')
+_OBSERVED_DATE_RE = re.compile(r'\d{1,2}\s*[-./월]\s*\d{1,2}')
+
+# 수온 지도 캐시에 보관하는 최대 port_id 수 (요청마다 다른 port_id 가 와도 메모리가 늘지 않게)
+SEA_TEMP_CACHE_MAX_ENTRIES = 256
+
+_sea_temp_lock = threading.Lock()
+# port_id → (저장 시각, 결과). 저장 순서 = 시각 순서
+_sea_temp_cache: Dict[int, Tuple[float, Dict]] = {}
+
+
+def parse_sea_temp(html: str) -> Dict:
+    """지도 스크립트의 중심 좌표와 관측소 마커 {name, temp, temp_c, time, lat, lng}.
+    HTML 을 트리로 만들지 않고 페이지 문자열에 정규식만 적용"""
+    center = dict(SEA_TEMP_DEFAULT_CENTER)
+    m = _MAP_CENTER_RE.search(html)
+    if m:
+        center = {'lat': float(m.group(1)), 'lng': float(m.group(2))}
+    markers = []
+    for m in _OVERLAY_RE.finditer(html):
+        content_html = m.group(1)
+        name = _MARKER_NAME_RE.search(content_html)
+        temp = _MARKER_TEMP_RE.search(content_html)
+        if not (name and temp):
+            continue
+        observed = _MARKER_TIME_RE.search(content_html)
+        markers.append({
+            'name': name.group(1).strip(),
+            'temp': temp.group(1).strip(),
+            'temp_c': to_number(temp.group(1)),
+            'time': observed.group(1).strip() if observed else '',
+            'lat': float(m.group(2)),
+            'lng': float(m.group(3)),
+        })
+    return {'center': center, 'markers': markers}
+
+
+def cached_sea_temp(port_id: int, ttl: float, now: float = None) -> Optional[Dict]:
+    """ttl 초 안에 파싱해 둔 수온 지도 결과 (없으면 None)"""
+    now = time.monotonic() if now is None else now
+    with _sea_temp_lock:
+        hit = _sea_temp_cache.get(port_id)
+    if hit and now - hit[0] < ttl:
+        return hit[1]
+    return None
+
+
+def remember_sea_temp(port_id: int, result: Dict, ttl: float, now: float = None):
+    """결과를 저장하면서 ttl 이 지난 항목을 지우고, 그래도 많으면 오래된 것부터 제거"""
+    now = time.monotonic() if now is None else now
+    with _sea_temp_lock:
+        _sea_temp_cache.pop(port_id, None)
+        _sea_temp_cache[port_id] = (now, result)
+        for key in [k for k, (stored, _) in _sea_temp_cache.items() if now - stored >= ttl]:
+            del _sea_temp_cache[key]
+        while len(_sea_temp_cache) > SEA_TEMP_CACHE_MAX_ENTRIES:
+            del _sea_temp_cache[next(iter(_sea_temp_cache))]
+
+
+def reading_rows(markers: List[Dict], fetched_at: datetime, local_now: datetime = None) -> List[Dict]:
+    """마커 → sea_temp_readings 행. fetched_at 은 저장 기준(UTC) 시각이고, 관측 시각에 날짜가 없으면
+    현지 시각(local_now, 기본 fetched_at)의 날짜를 붙여 날마다 구분"""
+    local_now = local_now or fetched_at
+    rows = []
+    for marker in markers:
+        observed = marker.get('time') or local_now.strftime('%H:%M')
+        if not _OBSERVED_DATE_RE.search(observed):
+            observed = f"{local_now:%Y-%m-%d} {observed}"
+        rows.append({'name': marker['name'], 'observed': observed[:40], 'fetched_at': fetched_at,
+                     'temp_c': marker.get('temp_c'), 'lat': marker.get('lat'), 'lng': marker.get('lng')})
+    return rows
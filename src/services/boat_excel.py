@@ -0,0 +1,143 @@
+"""배 목록/조회 결과 엑셀·CSV 입출력.
+
+가져오기는 openpyxl read_only 모드로 행을 하나씩 읽어 검증하고,
+IMPORT_BATCH_SIZE 단위로 묶어 db.upsert_boats 로 일괄 반영합니다.
+내보내기는 행 iterator 를 받아 CSV 는 행 단위로, XLSX 는 write_only
+워크북을 임시 파일에 쓴 뒤 청크 단위로 바이트를 흘려보냅니다.
+어느 쪽이든 전체 데이터를 메모리에 올리지 않으므로 행 수가 많아도
+메모리 사용량이 일정합니다.
+"""
+from typing import Dict, Iterable, Iterator, List, Tuple
+import csv
+import io
+import tempfile
+
+import openpyxl
+
+# download_excel 과 같은 열 순서: No, 지역, 항구, 등록된 배, URL, 비고
+EXCEL_HEADERS = ["No", "지역", "항구", "등록된 배", "URL", "비고"]
+
+# 조회 결과 내보내기 열: 날짜 × 배 × 선박 × 상태 × 남은자리 × 어종 × 물때
+STATUS_EXPORT_HEADERS = ["날짜", "지역", "항구", "등록된 배", "배 이름", "상태", "남은자리", "어종", "물때", "URL"]
+
+IMPORT_BATCH_SIZE = 1000
+EXPORT_CHUNK_SIZE = 64 * 1024
+# 응답에 담을 행 오류 최대 개수
+MAX_REPORTED_ERRORS = 100
+
+
+def _cell_str(value) -> str:
+    if value is None:
+        return ''
+    return str(value).strip()
+
+
+def validate_boat_row(row) -> Dict:
+    """엑셀 한 행을 배 정보 dict 로 변환. 잘못된 행이면 ValueError"""
+    if row is None or len(row) < 5:
+        raise ValueError('열 개수가 부족합니다.')
+
+    city, port, name, url = (_cell_str(v) for v in row[1:5])
+    note = row[5] if len(row) > 5 else None
+    note = None if note is None else str(note)
+
+    missing = [label for label, v in (('지역', city), ('항구', port), ('등록된 배', name), ('URL', url)) if not v]
+    if missing:
+        raise ValueError(f"필수 값 누락: {', '.join(missing)}")
+    if len(name) > 255:
+        raise ValueError('배 이름이 너무 깁니다.')
+    if not url.lower().startswith(('http://', 'https://')):
+        raise ValueError(f'URL 형식이 올바르지 않습니다: {url}')
+
+    return {'name': name, 'url': url, 'city': city, 'port': port, 'note': note}
+
+
+def iter_boat_rows(file) -> Iterator[Tuple[int, Dict, str]]:
+    """워크시트를 스트리밍으로 읽어 (행 번호, 배 정보 또는 None, 오류 메시지 또는 None) 생성"""
+    workbook = openpyxl.load_workbook(file, read_only=True, data_only=True)
+    try:
+        sheet = workbook.active
+        for row_number, row in enumerate(sheet.iter_rows(min_row=2, values_only=True), start=2):
+            # 완전히 빈 행은 조용히 건너뜀
+            if not row or all(v is None or _cell_str(v) == '' for v in row):
+                continue
+            try:
+                yield row_number, validate_boat_row(row), None
+            except ValueError as e:
+                yield row_number, None, str(e)
+    finally:
+        workbook.close()
+
+
+def import_boats(file, batch_size: int = IMPORT_BATCH_SIZE) -> Dict:
+    """엑셀 파일을 배치 단위로 upsert. 결과 요약과 행별 오류 목록을 반환"""
+    from db import upsert_boats
+
+    created = updated = 0
+    errors: List[Dict] = []
+    error_count = 0
+    batch: List[Dict] = []
+
+    def flush():
+        nonlocal created, updated
+        c, u = upsert_boats(batch)
+        created += c
+        updated += u
+        batch.clear()
+
+    for row_number, boat, error in iter_boat_rows(file):
+        if error:
+            error_count += 1
+            if len(errors) < MAX_REPORTED_ERRORS:
+                errors.append({'row': row_number, 'message': error})
+            continue
+        batch.append(boat)
+        if len(batch) >= batch_size:
+            flush()
+    if batch:
+        flush()
+
+    return {'created': created, 'updated': updated, 'errors': errors, 'error_count': error_count}
+
+
+def boat_export_rows(boats) -> Iterator[list]:
+    for i, boat in enumerate(boats, start=1):
+        yield [i, boat.city, boat.port, boat.name, boat.url, (boat.note or '')]
+
+
+def iter_csv(headers: List[str], rows: Iterable[list]) -> Iterator[bytes]:
+    """CSV 를 행 단위로 인코딩하여 EXPORT_CHUNK_SIZE 정도씩 묶어 생성.
+    엑셀에서 한글이 깨지지 않도록 UTF-8 BOM 을 붙입니다."""
+    buf = io.StringIO()
+    buf.write('\ufeff')
+    writer = csv.writer(buf)
+    writer.writerow(headers)
+    for row in rows:
+        writer.writerow(row)
+        if buf.tell() >= EXPORT_CHUNK_SIZE:
+            yield buf.getvalue().encode('utf-8')
+            buf.seek(0)
+            buf.truncate()
+    yield buf.getvalue().encode('utf-8')
+
+
+def iter_xlsx(headers: List[str], rows: Iterable[list], title: str = "Sheet") -> Iterator[bytes]:
+    """write_only 워크북으로 행을 디스크에 기록한 뒤 완성된 파일을 청크 단위로 생성.
+
+    XLSX 는 zip 컨테이너라 마지막에 한 번 저장해야 하지만, write_only 모드는
+    행을 바로 임시 파일로 내보내므로 행 수와 무관하게 메모리가 일정합니다.
+    """
+    wb = openpyxl.Workbook(write_only=True)
+    ws = wb.create_sheet(title)
+    ws.append(headers)
+    for row in rows:
+        ws.append(row)
+
+    with tempfile.TemporaryFile() as tmp:
+        wb.save(tmp)
+        tmp.seek(0)
+        while True:
+            chunk = tmp.read(EXPORT_CHUNK_SIZE)
+            if not chunk:
+                break
+            yield chunk
@@ -0,0 +1,114 @@
+"""조회 동시 실행 수 자동 조절 (AIMD: 덧셈 증가 / 곱셈 감소).
+
+고정된 스레드 수는 네트워크가 좋을 때는 너무 적고, 운영사가 403 으로 막기 시작하면 너무
+많습니다. AIMDLimiter 는 요청이 끝날 때마다 결과를 받아 한도를 조절합니다.
+
+- 정상 응답: 한도 += 1 / 한도  (한도만큼 성공하면 1 증가)
+- 실패(연결 실패, 5xx, 403): 한도 × 0.5
+- 응답 시간이 기준(지금까지의 가장 낮은 평균)의 LATENCY_TOLERANCE 배를 넘음: 한도 × 0.9
+
+감소는 cooldown 안에 한 번만 적용해 한꺼번에 실패한 요청들로 한도가 바닥까지 떨어지지
+않게 합니다. 스크랩 엔진은 전역 한도 하나와 host 별 한도를 함께 씁니다 (프로세스 공용).
+"""
+from typing import Dict, Optional
+import threading
+import time
+
+from services.scrape_metrics import CONCURRENCY_LIMIT
+
+LATENCY_TOLERANCE = 3.0
+SLOW_DECREASE = 0.9
+FAILURE_DECREASE = 0.5
+EWMA_ALPHA = 0.2
+
+
+class AIMDLimiter:
+    def __init__(self, initial: float, min_limit: float = 1, max_limit: float = 64,
+                 cooldown_seconds: float = 1.0, scope: str = 'global', host: str = ''):
+        self.min_limit = float(min_limit)
+        self.max_limit = float(max(max_limit, min_limit))
+        self.cooldown_seconds = cooldown_seconds
+        self.scope, self.host = scope, host
+        self._limit = min(self.max_limit, max(self.min_limit, float(initial)))
+        self._inflight = 0
+        self._ewma_ms: Optional[float] = None
+        self._baseline_ms: Optional[float] = None
+        self._last_decrease = 0.0
+        self._cond = threading.Condition()
+        self._publish()
+
+    @property
+    def limit(self) -> int:
+        return int(self._limit)
+
+    def acquire(self):
+        with self._cond:
+            while self._inflight >= int(self._limit):
+                self._cond.wait()
+            self._inflight += 1
+
+    def release(self, latency_ms: Optional[float] = None, failed: bool = False, baseline_ms: float = None,
+                now: float = None):
+        """요청 하나가 끝났을 때 호출. latency_ms 가 None 이면 한도는 그대로 (예외 등).
+        baseline_ms 를 주면 자체 기준 대신 그 값과 비교 (host 마다 평소 응답 시간이 다른 전역 한도용)"""
+        now = time.monotonic() if now is None else now
+        with self._cond:
+            self._inflight -= 1
+            if failed:
+                self._decrease(FAILURE_DECREASE, now)
+            elif latency_ms is not None:
+                self._ewma_ms = latency_ms if self._ewma_ms is None else \
+                    EWMA_ALPHA * latency_ms + (1 - EWMA_ALPHA) * self._ewma_ms
+                if self._baseline_ms is None or self._ewma_ms < self._baseline_ms:
+                    self._baseline_ms = self._ewma_ms
+                if latency_ms > LATENCY_TOLERANCE * (baseline_ms or self._baseline_ms):
+                    self._decrease(SLOW_DECREASE, now)
+                else:
+                    self._limit = min(self.max_limit, self._limit + 1.0 / self._limit)
+            self._cond.notify_all()
+        self._publish()
+
+    def _decrease(self, factor: float, now: float):
+        if now - self._last_decrease < self.cooldown_seconds:
+            return
+        self._last_decrease = now
+        self._limit = max(self.min_limit, self._limit * factor)
+
+    def configure(self, initial: float = None, min_limit: float = None, max_limit: float = None):
+        with self._cond:
+            if min_limit is not None:
+                self.min_limit = float(min_limit)
+            if max_limit is not None:
+                self.max_limit = float(max(max_limit, self.min_limit))
+            if initial is not None:
+                self._limit = float(initial)
+            self._limit = min(self.max_limit, max(self.min_limit, self._limit))
+            self._cond.notify_all()
+        self._publish()
+
+    def _publish(self):
+        CONCURRENCY_LIMIT.set(int(self._limit), scope=self.scope, host=self.host)
+
+
+class HostLimiters:
+    """host 별 AIMDLimiter (처음 쓰는 host 는 initial 한도로 생성)"""
+
+    def __init__(self, min_limit: float = 1, max_limit: float = 8):
+        self.min_limit, self.max_limit = min_limit, max_limit
+        self._lock = threading.Lock()
+        self._limiters: Dict[str, AIMDLimiter] = {}
+
+    def get(self, host: str, initial: float) -> AIMDLimiter:
+        """max_limit 이 None 이면 initial 고정 한도"""
+        with self._lock:
+            limiter = self._limiters.get(host)
+            if limiter is None:
+                max_limit = initial if self.max_limit is None else self.max_limit
+                min_limit = initial if self.max_limit is None else self.min_limit
+                limiter = self._limiters[host] = AIMDLimiter(initial, min_limit, max_limit,
+                                                             scope='host', host=host)
+            return limiter
+
+    def limits(self) -> Dict[str, int]:
+        with self._lock:
+            return {h: l.limit for h, l in self._limiters.items()}
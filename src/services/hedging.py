@@ -0,0 +1,95 @@
+"""느린 응답 대비 중복 요청 (hedged request).
+
+일부 운영사 사이트는 가끔 8~10초씩 멈췄다가 다시 요청하면 바로 응답합니다. 첫 요청이
+해당 host 의 최근 p90 응답 시간을 넘기면 같은 요청을 하나 더 보내고 먼저 성공한 응답을
+사용합니다. host 마다 요청 수에 비례해 쌓이는 예산(토큰) 안에서만 중복 요청을 보내므로
+추가 부하는 대략 budget_ratio 비율로 제한됩니다. 기본은 꺼져 있습니다 (SCRAPE_HEDGE_ENABLED).
+"""
+from concurrent.futures import FIRST_COMPLETED, Future, wait
+from typing import Callable, Dict, Optional, Tuple
+import threading
+
+from services.host_stats import HOSTS
+from services.scrape_metrics import HEDGES
+
+# p90 이 이보다 짧아도 최소 이만큼은 기다린 뒤 중복 요청 (ms)
+MIN_HEDGE_DELAY_MS = 100.0
+# host 별로 쌓아 둘 수 있는 최대 토큰 수 / 처음 보는 host 의 토큰
+MAX_TOKENS = 3.0
+INITIAL_TOKENS = 1.0
+
+_settings = {"enabled": False, "budget_ratio": 0.1}
+_lock = threading.Lock()
+_tokens: Dict[str, float] = {}
+
+
+def configure(enabled: bool, budget_ratio: float = None):
+    _settings["enabled"] = bool(enabled)
+    if budget_ratio is not None:
+        _settings["budget_ratio"] = max(0.0, float(budget_ratio))
+
+
+def hedge_delay(host: str) -> Optional[float]:
+    """중복 요청을 보낼 때까지 기다릴 시간(초). 꺼져 있거나 표본이 부족하면 None"""
+    if not _settings["enabled"]:
+        return None
+    p90 = HOSTS.percentile_ms(host, 0.9)
+    if p90 is None:
+        return None
+    return max(p90, MIN_HEDGE_DELAY_MS) / 1000.0
+
+
+def _earn(host: str):
+    with _lock:
+        _tokens[host] = min(MAX_TOKENS, _tokens.get(host, INITIAL_TOKENS) + _settings["budget_ratio"])
+
+
+def _spend(host: str) -> bool:
+    with _lock:
+        tokens = _tokens.get(host, INITIAL_TOKENS)
+        if tokens < 1.0:
+            return False
+        _tokens[host] = tokens - 1.0
+        return True
+
+
+def _start(fn: Callable) -> Future:
+    """fn 을 데몬 스레드에서 실행 (진 요청은 응답을 끝까지 받고 버려짐)"""
+    future = Future()
+
+    def _run():
+        try:
+            future.set_result(fn())
+        except BaseException as e:
+            future.set_exception(e)
+
+    threading.Thread(target=_run, name='hedged-request', daemon=True).start()
+    return future
+
+
+def hedged_call(fn: Callable, host: str) -> Tuple[object, bool]:
+    """fn() 결과와 중복 요청이 이겼는지 여부를 반환. 둘 다 실패하면 첫 요청의 예외를 던짐"""
+    delay = hedge_delay(host)
+    if delay is None:
+        return fn(), False
+    _earn(host)
+
+    primary = _start(fn)
+    done, _ = wait([primary], timeout=delay)
+    if done:
+        return primary.result(), False
+    if not _spend(host):
+        HEDGES.inc(result='no_budget')
+        return primary.result(), False
+
+    hedge = _start(fn)
+    pending = {primary, hedge}
+    while pending:
+        done, pending = wait(pending, return_when=FIRST_COMPLETED)
+        for future in (hedge, primary):
+            if future in done and future.exception() is None:
+                won = future is hedge
+                HEDGES.inc(result='won' if won else 'lost')
+                return future.result(), won
+    HEDGES.inc(result='failed')
+    return primary.result(), False
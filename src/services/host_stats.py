@@ -0,0 +1,112 @@
+"""운영사 host 별 응답 시간/실패 통계.
+
+scrape_boats 가 끝날 때마다 배별 조회 결과(timing, error)를 host 단위로 누적합니다.
+스크랩 엔진은 이 값으로 host 순서를 정합니다 (느린 host 먼저, 연속 실패 중인 host 는
+맨 뒤 또는 생략). 값은 프로세스 메모리에만 있으며 /metrics 의 host 게이지로 확인합니다.
+"""
+from collections import deque
+from typing import Dict, List, Optional
+import threading
+import time
+
+from services.scrape_metrics import HOST_DOWN, HOST_FAILURE_RATIO, HOST_LATENCY_SECONDS
+
+# 지수 이동 평균 가중치 (새 측정값 비중)
+EWMA_ALPHA = 0.3
+# 이 횟수만큼 연속 실패하면 죽은 host 로 봄
+DEAD_AFTER_FAILURES = 3
+# 죽은 host 도 이 시간(초)이 지나면 다시 한 번 시도
+DEAD_RETRY_SECONDS = 300
+# 기록이 없는 host 의 예상 응답 시간 (처음엔 느린 쪽으로 보고 먼저 보냄)
+UNKNOWN_LATENCY_MS = 2000.0
+# 분위수(p90) 계산에 쓰는 최근 첫 시도 응답 시간 개수 / 최소 표본 수
+RECENT_SAMPLES = 50
+MIN_PERCENTILE_SAMPLES = 20
+
+
+def is_host_failure(check: Dict) -> bool:
+    """연결 실패/타임아웃, 5xx, 403 재시도까지 막힌 경우. 파싱 결과가 빈 것은 실패가 아님"""
+    error = check.get('error') or ''
+    if error.startswith('http_error'):
+        return True
+    if error.startswith('http_status:'):
+        code = error.split(':', 1)[1]
+        return not code.isdigit() or code == '403' or code.startswith('5')
+    return False
+
+
+class HostStats:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._hosts: Dict[str, Dict] = {}
+        self._recent: Dict[str, deque] = {}
+
+    def record(self, host: str, fetch_ms: Optional[float], failed: bool, now: float = None,
+               first_attempt_ms: Optional[float] = None):
+        now = time.time() if now is None else now
+        with self._lock:
+            if first_attempt_ms is not None:
+                self._recent.setdefault(host, deque(maxlen=RECENT_SAMPLES)).append(first_attempt_ms)
+            s = self._hosts.setdefault(host, {'ewma_ms': None, 'requests': 0, 'failures': 0,
+                                              'consecutive_failures': 0, 'last_failure': None})
+            s['requests'] += 1
+            if failed:
+                s['failures'] += 1
+                s['consecutive_failures'] += 1
+                s['last_failure'] = now
+            else:
+                s['consecutive_failures'] = 0
+            if fetch_ms is not None:
+                s['ewma_ms'] = fetch_ms if s['ewma_ms'] is None else \
+                    EWMA_ALPHA * fetch_ms + (1 - EWMA_ALPHA) * s['ewma_ms']
+            stat = dict(s)
+        HOST_LATENCY_SECONDS.set((stat['ewma_ms'] or 0) / 1000.0, host=host)
+        HOST_FAILURE_RATIO.set(stat['failures'] / stat['requests'], host=host)
+        HOST_DOWN.set(1 if self.is_dead(host, now) else 0, host=host)
+
+    def record_results(self, results, host_of):
+        """scrape_boats 결과 목록을 host 별로 기록 (합쳐졌거나 생략된 결과는 제외)"""
+        for boat, check in results:
+            if check.get('coalesced') or check.get('skipped'):
+                continue
+            timing = check.get('timing') or {}
+            attempts = timing.get('attempts') or []
+            first_ms = attempts[0].get('ms') if attempts and attempts[0].get('status') == 200 else None
+            self.record(host_of(boat), timing.get('fetch_ms'), is_host_failure(check), first_attempt_ms=first_ms)
+
+    def expected_ms(self, host: str) -> float:
+        with self._lock:
+            s = self._hosts.get(host)
+            return s['ewma_ms'] if s and s['ewma_ms'] is not None else UNKNOWN_LATENCY_MS
+
+    def percentile_ms(self, host: str, q: float = 0.9) -> Optional[float]:
+        """최근 정상 응답(첫 시도) 시간의 분위수. 표본이 부족하면 None"""
+        with self._lock:
+            samples = sorted(self._recent.get(host, ()))
+        if len(samples) < MIN_PERCENTILE_SAMPLES:
+            return None
+        return samples[min(len(samples) - 1, int(q * (len(samples) - 1) + 0.5))]
+
+    def is_dead(self, host: str, now: float = None) -> bool:
+        now = time.time() if now is None else now
+        with self._lock:
+            s = self._hosts.get(host)
+            if not s or s['consecutive_failures'] < DEAD_AFTER_FAILURES:
+                return False
+            return now - (s['last_failure'] or 0) < DEAD_RETRY_SECONDS
+
+    def snapshot(self) -> List[Dict]:
+        """host 별 통계 (예상 응답 시간이 긴 순)"""
+        with self._lock:
+            rows = [{'host': h, **s} for h, s in self._hosts.items()]
+        for row in rows:
+            row['dead'] = self.is_dead(row['host'])
+        return sorted(rows, key=lambda r: -(r['ewma_ms'] or 0))
+
+    def clear(self):
+        with self._lock:
+            self._hosts.clear()
+            self._recent.clear()
+
+
+HOSTS = HostStats()
@@ -0,0 +1,292 @@
+"""열려 있는 /status 페이지로 좌석 변화를 밀어주는 실시간 채널 (SSE / Web Push).
+
+각 브라우저가 새로고침으로 전체 배를 다시 스크랩하는 대신, 서버의 폴링 루프
+하나가 구독 중인 날짜·지역의 배만 주기적으로 조회하고 SeatWatcher 가 찾아낸
+변화분만 구독자에게 전달합니다.
+
+- SSE: subscribe() 로 받은 구독을 stream() 제너레이터로 text/event-stream 전송
+- Web Push: pywebpush 와 VAPID 키가 설정된 경우에만 동작 (선택 의존성)
+
+날짜가 지난 구독과 유지 시간(Web Push 는 push_ttl, SSE 는 sse_ttl)이 지난 구독은 폴링 때마다
+정리합니다. Web Push 구독 수는 max_push_subscriptions 까지만 유지하고 (넘치면 가장 오래된 구독부터
+제거), SSE 는 연결마다 요청 스레드를 차지하므로 max_sse_subscriptions 를 넘으면 새 구독을 거부합니다.
+SSE 스트림은 sse_idle_timeout 동안 보낼 이벤트가 없거나 sse_ttl 이 지나면 끝나며, 브라우저의
+EventSource 가 다시 연결합니다.
+"""
+from datetime import date
+from typing import Dict, Iterable, List, Optional
+import json
+import logging
+import queue
+import threading
+import time
+
+from services.scrape_engine import scrape_boats, boat_ref, learned_parsers
+from services.snapshot_publisher import publish_for_app
+
+try:
+    from pywebpush import webpush, WebPushException
+except ImportError:  # 선택 의존성: 없으면 Web Push 비활성
+    webpush = None
+    WebPushException = Exception
+
+logger = logging.getLogger(__name__)
+
+
+class SubscriptionLimitReached(RuntimeError):
+    """SSE 구독이 max_sse_subscriptions 에 도달함 (라우트에서 503 으로 응답)"""
+
+
+class _Subscription:
+    def __init__(self, date_str: str, regions: Iterable[str] = (), ttl: Optional[float] = None):
+        self.date = date_str
+        # 빈 집합이면 전체 지역
+        self.regions = frozenset(r for r in regions if r and r != '전체')
+        # 유지 시간(초). None 이면 날짜가 지날 때까지
+        self.ttl = ttl
+        self.created = time.time()
+        self.closed = False
+
+    def expired(self, today: str, now: float) -> bool:
+        return self.date < today or (self.ttl is not None and now - self.created > self.ttl)
+
+    def wants(self, event: Dict) -> bool:
+        if event.get('date') != self.date:
+            return False
+        return not self.regions or event.get('city') in self.regions
+
+
+class SseSubscription(_Subscription):
+    def __init__(self, date_str: str, regions: Iterable[str] = (), ttl: Optional[float] = None,
+                 maxsize: int = 500):
+        super().__init__(date_str, regions, ttl)
+        self.queue = queue.Queue(maxsize=maxsize)
+
+    def push(self, event: Dict):
+        try:
+            self.queue.put_nowait(event)
+        except queue.Full:
+            # 느린 클라이언트: 가장 오래된 이벤트를 버리고 최신 이벤트 유지
+            try:
+                self.queue.get_nowait()
+            except queue.Empty:
+                pass
+            self.queue.put_nowait(event)
+
+
+class PushSubscription(_Subscription):
+    def __init__(self, info: Dict, date_str: str, regions: Iterable[str] = (), ttl: Optional[float] = None):
+        super().__init__(date_str, regions, ttl)
+        self.info = info
+
+    @property
+    def endpoint(self):
+        return self.info.get('endpoint')
+
+
+class LiveStatusHub:
+    """구독 관리 + 서버 측 단일 폴링 루프.
+
+    SeatWatcher 의 싱크로 등록되므로 폴링 루프뿐 아니라 /status 조회에서 감지된
+    변화도 같은 구독자에게 전달됩니다.
+    """
+
+    def __init__(self, app, watcher, interval: float = 60, max_workers: Optional[int] = None,
+                 push_ttl: float = 7 * 86400, max_push_subscriptions: int = 1000,
+                 sse_ttl: float = 3600, sse_idle_timeout: float = 900, max_sse_subscriptions: int = 50):
+        self.app = app
+        self.watcher = watcher
+        self.interval = interval
+        self.max_workers = max_workers
+        self.push_ttl = push_ttl
+        self.max_push_subscriptions = max_push_subscriptions
+        self.sse_ttl = sse_ttl
+        self.sse_idle_timeout = sse_idle_timeout
+        self.max_sse_subscriptions = max_sse_subscriptions
+        self._subs: List[_Subscription] = []
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    # ---- 구독 관리 ----
+    def subscribe(self, date_str: str, regions: Iterable[str] = ()) -> SseSubscription:
+        """SSE 구독 추가. 열린 SSE 구독이 max_sse_subscriptions 개면 SubscriptionLimitReached"""
+        sub = SseSubscription(date_str, regions, ttl=self.sse_ttl)
+        with self._lock:
+            if sum(isinstance(s, SseSubscription) for s in self._subs) >= self.max_sse_subscriptions:
+                raise SubscriptionLimitReached(f"SSE 구독 한도({self.max_sse_subscriptions}) 초과")
+            self._subs.append(sub)
+        self._ensure_loop()
+        return sub
+
+    def add_push_subscription(self, info: Dict, date_str: str, regions: Iterable[str] = ()) -> PushSubscription:
+        sub = PushSubscription(info, date_str, regions, ttl=self.push_ttl)
+        with self._lock:
+            # 같은 endpoint 는 최신 구독 조건으로 교체
+            self._subs = [s for s in self._subs
+                          if not (isinstance(s, PushSubscription) and s.endpoint == sub.endpoint)]
+            pushes = [s for s in self._subs if isinstance(s, PushSubscription)]
+            for old in pushes[:max(0, len(pushes) - self.max_push_subscriptions + 1)]:
+                self._subs.remove(old)
+        self._add(sub)
+        return sub
+
+    def remove_push_subscription(self, endpoint: str):
+        with self._lock:
+            self._subs = [s for s in self._subs
+                          if not (isinstance(s, PushSubscription) and s.endpoint == endpoint)]
+
+    def unsubscribe(self, sub: _Subscription):
+        with self._lock:
+            if sub in self._subs:
+                self._subs.remove(sub)
+
+    def _add(self, sub: _Subscription):
+        with self._lock:
+            self._subs.append(sub)
+        self._ensure_loop()
+
+    def prune(self, now: float = None, today: str = None) -> int:
+        """날짜가 지났거나 TTL 이 지난 구독 제거. 제거한 수를 반환"""
+        now = time.time() if now is None else now
+        today = today or date.today().isoformat()
+        with self._lock:
+            expired = [s for s in self._subs if s.expired(today, now)]
+            for sub in expired:
+                sub.closed = True
+                self._subs.remove(sub)
+        return len(expired)
+
+    def subscriber_count(self) -> int:
+        with self._lock:
+            return len(self._subs)
+
+    # ---- SeatWatcher 싱크 인터페이스 ----
+    def emit(self, events: List[Dict]):
+        with self._lock:
+            subs = list(self._subs)
+        for ev in events:
+            for sub in subs:
+                if not sub.wants(ev):
+                    continue
+                if isinstance(sub, SseSubscription):
+                    sub.push(ev)
+                else:
+                    self._send_push(sub, ev)
+
+    def _send_push(self, sub: PushSubscription, event: Dict):
+        private_key = self.app.config.get('VAPID_PRIVATE_KEY')
+        if webpush is None or not private_key:
+            return
+        try:
+            webpush(
+                subscription_info=sub.info,
+                data=json.dumps(event, ensure_ascii=False),
+                vapid_private_key=private_key,
+                vapid_claims={'sub': self.app.config.get('VAPID_CLAIMS_SUB', 'mailto:admin@example.com')},
+                timeout=5,
+            )
+        except WebPushException as e:
+            status = getattr(getattr(e, 'response', None), 'status_code', None)
+            if status in (404, 410):
+                # 만료된 구독은 제거
+                self.unsubscribe(sub)
+            else:
+                logger.warning("web push 전송 실패: %s", e)
+
+    # ---- SSE ----
+    def stream(self, sub: SseSubscription, heartbeat: float = 15):
+        """SSE 응답 본문 제너레이터. 클라이언트 연결이 끊기거나, sse_idle_timeout 동안 이벤트가
+        없거나, 구독 유지 시간이 지나면 끝내고 구독 해제 (요청 스레드 반환)."""
+        try:
+            yield f"event: ready\ndata: {json.dumps({'date': sub.date, 'regions': sorted(sub.regions)}, ensure_ascii=False)}\n\n"
+            last_event = time.time()
+            while not sub.closed:
+                now = time.time()
+                if now - last_event >= self.sse_idle_timeout or sub.expired(date.today().isoformat(), now):
+                    break
+                try:
+                    ev = sub.queue.get(timeout=heartbeat)
+                except queue.Empty:
+                    # 프록시/브라우저 연결 유지를 위한 주석 라인
+                    yield ": ping\n\n"
+                    continue
+                last_event = time.time()
+                yield f"event: seat\ndata: {json.dumps(ev, ensure_ascii=False)}\n\n"
+        finally:
+            self.unsubscribe(sub)
+
+    # ---- 폴링 루프 ----
+    def _targets(self) -> Dict[str, Optional[set]]:
+        """{date: 조회할 지역 집합 (None 이면 전체)}. 만료된 구독은 먼저 정리"""
+        self.prune()
+        targets: Dict[str, Optional[set]] = {}
+        with self._lock:
+            subs = list(self._subs)
+        for sub in subs:
+            if sub.date in targets and targets[sub.date] is None:
+                continue
+            if not sub.regions:
+                targets[sub.date] = None
+            else:
+                targets.setdefault(sub.date, set()).update(sub.regions)
+        return targets
+
+    def _load_boats(self, regions: Optional[set]):
+        from db import get_boats
+        with self.app.app_context():
+            boats = get_boats(cities=regions)
+            return [boat_ref(b) for b in boats]
+
+    def _remember_parsers(self, results):
+        learned = learned_parsers(results)
+        if learned:
+            from db import update_parser_types
+            with self.app.app_context():
+                update_parser_types(learned)
+
+    def poll_once(self):
+        debug_enabled = self.app.config.get('DEBUG_LOGGING_ENABLED', False)
+        for date_str, regions in self._targets().items():
+            try:
+                year, month, day = (int(x) for x in date_str.split('-'))
+                boats = self._load_boats(regions)
+                results = scrape_boats(boats, year, month, day,
+                                       debug_enabled=debug_enabled, max_workers=self.max_workers)
+                self.watcher.observe_many(results, date_str)
+                self._remember_parsers(results)
+                publish_for_app(self.app, results, date_str, regions)
+            except Exception as e:
+                logger.warning("live poll 실패 (%s): %s", date_str, e)
+
+    def _ensure_loop(self):
+        with self._lock:
+            if self._thread and self._thread.is_alive():
+                return
+            self._thread = threading.Thread(target=self._loop, name='live-status-poll', daemon=True)
+            self._thread.start()
+
+    def _loop(self):
+        while True:
+            self.poll_once()
+            self._wakeup.wait(self.interval)
+            self._wakeup.clear()
+            self.prune()
+            with self._lock:
+                if not self._subs:
+                    self._thread = None
+                    return
+
+
+def init_live_updates(app) -> LiveStatusHub:
+    """SeatWatcher 에 실시간 구독 허브를 싱크로 연결하고 app.extensions['live_status'] 에 등록"""
+    watcher = app.extensions['seat_watcher']
+    hub = LiveStatusHub(app, watcher, interval=app.config.get('LIVE_POLL_INTERVAL', 60),
+                        push_ttl=app.config.get('LIVE_PUSH_TTL', 7 * 86400),
+                        max_push_subscriptions=app.config.get('LIVE_MAX_PUSH_SUBSCRIPTIONS', 1000),
+                        sse_ttl=app.config.get('LIVE_SSE_TTL', 3600),
+                        sse_idle_timeout=app.config.get('LIVE_SSE_IDLE_TIMEOUT', 900),
+                        max_sse_subscriptions=app.config.get('LIVE_MAX_SSE_SUBSCRIPTIONS', 50))
+    watcher.add_sink(hub)
+    app.extensions['live_status'] = hub
+    return hub
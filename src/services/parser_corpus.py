@@ -0,0 +1,128 @@
+"""저장해 둔 운영사 페이지(캡처)로 파서를 네트워크 없이 실행하는 코퍼스 도구.
+
+캡처 파일은 scripts/log*.txt 처럼 "요청 URL: ..." 등의 메타데이터 줄 뒤에 응답
+HTML 이 이어지는 형식입니다. 조회 날짜는 URL 의 year/month/day (schedule_fleet 은
+파일 이름의 YYYYMMDD) 에서 얻습니다.
+
+scripts/bench_parsers.py (성능 측정) 와 tests/test_parser_golden.py (회귀 검사) 가
+같은 로더와 결과 요약(summarize)을 사용합니다.
+"""
+from typing import Dict, Iterable, List, Optional
+from urllib.parse import urlparse, parse_qs
+import glob
+import hashlib
+import json
+import os
+import re
+
+from services.parsers import parse_page, PROBE_BYTES
+from services.reservation_checker import choose_encoding, decode_body
+
+SRC_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+REPO_ROOT = os.path.dirname(SRC_ROOT)
+
+DEFAULT_CAPTURE_GLOBS = [
+    os.path.join(SRC_ROOT, 'scripts', 'log*.txt'),
+    os.path.join(REPO_ROOT, 'tests', 'fixtures', 'pages', '*.html'),
+]
+GOLDEN_PATH = os.path.join(REPO_ROOT, 'tests', 'fixtures', 'parser_golden.json')
+
+_BODY_MARKER = '응답 바디'
+_META_RE = re.compile(r'^(요청 URL|최종 URL|상태 코드|실행 시간)\s*:\s*(.*)$')
+
+
+def _capture_date(url: str, path: str):
+    query = parse_qs(urlparse(url).query or "")
+    if all(k in query for k in ('year', 'month', 'day')):
+        return int(query['year'][0]), int(query['month'][0]), int(query['day'][0])
+    m = re.search(r'(\d{4})(\d{2})(\d{2})', os.path.basename(path))
+    if not m:
+        raise ValueError(f"조회 날짜를 알 수 없습니다: {path}")
+    return int(m.group(1)), int(m.group(2)), int(m.group(3))
+
+
+def load_capture(path: str) -> Dict:
+    """캡처 파일을 읽어 {name, url, year, month, day, content(bytes), headers} 로 반환"""
+    with open(path, 'rb') as f:
+        raw = f.read()
+
+    meta, headers = {}, {}
+    offset = 0
+    for line in raw.splitlines(keepends=True):
+        text = line.decode('utf-8', 'replace').strip()
+        if text.startswith('<'):
+            break
+        offset += len(line)
+        if text.startswith(_BODY_MARKER):
+            break
+        m = _META_RE.match(text)
+        if m:
+            meta[m.group(1)] = m.group(2).strip()
+        elif ':' in text and line.startswith((b' ', b'\t')):
+            key, _, value = text.partition(':')
+            headers[key.strip().lower()] = value.strip()
+
+    url = meta.get('최종 URL') or meta.get('요청 URL')
+    if not url:
+        raise ValueError(f"요청 URL 메타데이터가 없습니다: {path}")
+    url = url.split('#', 1)[0]
+    year, month, day = _capture_date(url, path)
+    return {
+        'name': os.path.basename(path),
+        'path': path,
+        'url': url,
+        'year': year, 'month': month, 'day': day,
+        'headers': headers,
+        'content': raw[offset:].lstrip(),
+    }
+
+
+def discover_captures(patterns: Optional[Iterable[str]] = None) -> List[str]:
+    paths = []
+    for pattern in patterns or DEFAULT_CAPTURE_GLOBS:
+        paths.extend(sorted(glob.glob(pattern)))
+    return paths
+
+
+def parse_capture(capture: Dict, parser_type: Optional[str] = None) -> Dict:
+    """캡처 한 건을 check_single_boat 와 같은 경로(parse_page)로 파싱"""
+    content = capture['content']
+    encoding, _ = choose_encoding(capture['url'], capture['headers'].get('content-type', ''), content)
+    return parse_page(decode_body(content, encoding), capture['url'],
+                      capture['year'], capture['month'], capture['day'],
+                      parser_type=parser_type, head_bytes=content[:PROBE_BYTES])
+
+
+def summarize(result: Dict) -> Dict:
+    """골든 비교용 요약. row_html 은 길어서 해시로만 비교"""
+    return {
+        'matched': result.get('matched'),
+        'parser': result.get('parser'),
+        'tide': result.get('tide'),
+        'entries': [
+            {
+                'ship_name': e.get('ship_name'),
+                'status': e.get('status'),
+                'available': e.get('available'),
+                'display_status': e.get('display_status'),
+                'raw_status_text': e.get('raw_status_text'),
+                'fish': e.get('fish'),
+                'row_html_sha1': hashlib.sha1((e.get('row_html') or '').encode('utf-8')).hexdigest()[:12],
+            }
+            for e in result.get('entries', [])
+        ],
+    }
+
+
+def load_golden(path: str = GOLDEN_PATH) -> Dict:
+    if not os.path.exists(path):
+        return {}
+    with open(path, encoding='utf-8') as f:
+        return json.load(f)
+
+
+def write_golden(golden: Dict, path: str = GOLDEN_PATH):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(golden, f, ensure_ascii=False, indent=2, sort_keys=True)
+        f.write('\n')
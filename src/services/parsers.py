@@ -0,0 +1,607 @@
+"""예약 페이지 파서 레지스트리 (사이트 계열별 어댑터).
+
+check_single_boat 는 페이지를 가져오기만 하고, 파싱은 여기 등록된 어댑터가 담당합니다.
+
+- schedule_fleet : sunsang24 선단 스케줄 (/ship/schedule_fleet/YYYYMM)
+- xe_board       : XE 게시판(mid=bk) 의 일반 tr 목록
+- admin_right    : 게시판 행 안의 div#admin-right-* 상태 블록
+
+각 어댑터는 URL 과 응답 앞부분 바이트만 보는 가벼운 matches() 와 실제 파싱을 하는
+parse() 를 가집니다. 성공한 어댑터 이름은 결과의 "parser" 로 돌려주며, 호출 측이
+Boat.parser_type 에 저장해 두면 다음 조회부터는 해당 어댑터만 바로 실행합니다.
+"""
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import Dict, List, Optional
+from urllib.parse import urlparse, parse_qs
+import datetime
+import json
+import re
+import time
+
+from bs4 import BeautifulSoup, Comment
+
+from services.reservation_checker import (
+    FISH_KEYWORDS, PARSER_SCHEDULE_FLEET, _norm, _clean_ship_name, _is_valid_ship_name,
+    is_schedule_fleet_url,
+)
+
+PARSER_XE_BOARD = 'xe_board'
+PARSER_ADMIN_RIGHT = 'admin_right'
+
+# matches() 에 넘기는 응답 앞부분 크기
+PROBE_BYTES = 64 * 1024
+
+FAMILY_SCHEDULE_FLEET = 'schedule_fleet'
+FAMILY_BOARD = 'board'
+
+_FISH_LABEL_RE = re.compile(r'(낚시\s*종류|낚시종류|어종)\s*[:：-]?\s*', re.I)
+
+
+class Page:
+    """파싱 대상 페이지. soup 과 게시판 공통 정보(컨테이너/물때/어종)는 처음 쓸 때 한 번만 계산"""
+
+    def __init__(self, html: str, url: str, year: int, month: int, day: int, debug_enabled: bool = False):
+        self.html = html
+        self.url = url
+        self.year, self.month, self.day = int(year), int(month), int(day)
+        self.debug_enabled = debug_enabled
+        weekday = "월화수목금토일"[datetime.date(self.year, self.month, self.day).weekday()]
+        self.display_date = f"{self.year:04d}-{self.month:02d}-{self.day:02d}({weekday})"
+        self._soup = None
+        self._board = None
+
+    @property
+    def soup(self) -> BeautifulSoup:
+        if self._soup is None:
+            self._soup = BeautifulSoup(self.html, "html.parser")
+        return self._soup
+
+    @property
+    def board(self) -> Dict:
+        """게시판 계열 공통: new-div-YYYYMMDD 컨테이너, 물때, 페이지 단위 어종"""
+        if self._board is None:
+            self._board = _board_context(self.soup, self.year, self.month, self.day)
+        return self._board
+
+    def board_result(self, entries: List[Dict]) -> Dict:
+        # matched True로 반환하되 entries가 비어있을 수 있음
+        return {
+            "matched": True,
+            "entries": entries,
+            "source_url": self.url,
+            "raw_html": self.html[:1000],  # 디버깅용 요약
+            "tide": self.board["tide"],
+        }
+
+
+class SiteParser(ABC):
+    """사이트 어댑터. matches 로 페이지 형식을 알아보고 parse 로 check_single_boat 결과를 만듦"""
+    name = ''
+    family = FAMILY_BOARD
+
+    @abstractmethod
+    def matches(self, url: str, head_bytes: bytes) -> bool:
+        """URL 과 본문 앞부분(head_bytes)으로 이 어댑터가 처리할 페이지인지 판단"""
+
+    @abstractmethod
+    def parse(self, page: Page) -> Dict:
+        """Page → {"matched", "entries", "tide", ...} (선박을 못 찾으면 matched=False)"""
+
+
+PARSERS: "OrderedDict[str, SiteParser]" = OrderedDict()
+
+
+def register(cls):
+    """어댑터 등록 데코레이터. 같은 계열 안에서는 등록 순서대로 시도"""
+    parser = cls()
+    PARSERS[parser.name] = parser
+    return cls
+
+
+def url_family(url: str) -> str:
+    return FAMILY_SCHEDULE_FLEET if is_schedule_fleet_url(url) else FAMILY_BOARD
+
+
+def _fish_keywords_in(td) -> List[str]:
+    """td 안의 모든 텍스트 노드(중첩 태그 포함)에서 어종 키워드 추출"""
+    texts = []
+    for elem in td.descendants:
+        if elem.name is None:
+            t = str(elem).strip()
+            if t:
+                texts.append(t)
+    found = []
+    for t in texts:
+        nt = _norm(t)
+        for w in FISH_KEYWORDS:
+            if _norm(w) in nt and w not in found:
+                found.append(w)
+    return found
+
+
+def _is_notice_cell(td) -> bool:
+    # <img alt="공지"> 또는 <div>공지</div>
+    if td.find('img', alt='공지'):
+        return True
+    div = td.find('div')
+    return bool(div and '공지' in div.get_text(strip=True))
+
+
+def _admin_status(raw_status_text: str):
+    """admin-right 블록 문구에서 (상태, 남은자리) 계산"""
+    if re.search(r'점검일', raw_status_text):
+        return 'maintenance', 0
+    m = re.search(r'남은\s*자리\s*[:：]?\s*(\d+)', raw_status_text) or \
+        re.search(r'남은자리\s*(\d+)', raw_status_text) or \
+        re.search(r'(\d+)\s*명', raw_status_text)
+    if m:
+        try:
+            return 'open', int(m.group(1))
+        except Exception:
+            return 'unknown', None
+    if re.search(r'예약완료|예약 완료', raw_status_text):
+        return 'reserved', 0
+    if re.search(r'매진|마감|예약마감', raw_status_text):
+        return 'full', 0
+    return 'unknown', None
+
+
+def _admin_text(adm) -> str:
+    img = adm.find('img')
+    if img and img.has_attr('alt'):
+        return img['alt'].strip()
+    return adm.get_text(' ', strip=True)
+
+
+def _board_context(soup, year: int, month: int, day: int) -> Dict:
+    date8 = f"{int(year):04d}{int(month):02d}{int(day):02d}"
+
+    # 대표 컨테이너 찾기
+    container = soup.select_one(f"div#new-div-{date8}") or soup.select_one(f"div.new-divs, .new-divs")
+
+    # 물때 정보 추출 (jeil-panel tr의 data-str 속성에서)
+    tide = None
+    if container:
+        jeil_panel_tr = container.select_one('tr.jeil-panel')
+        if jeil_panel_tr and jeil_panel_tr.has_attr('data-str'):
+            m = re.search(r'(\d+)\s*물', jeil_panel_tr['data-str'])
+            if m:
+                tide = f"{m.group(1)}물"
+
+    # 일반 게시판에서도 어종 추출 시도
+    fish = None
+    if container:
+        fish_el = container.select_one('div#fish') or container.select_one('.fish') or soup.select_one('div#fish')
+        if fish_el:
+            fish = fish_el.get_text(" ", strip=True)
+        else:
+            # 텍스트 또는 img alt 속성으로 "낚시종류" 라벨 찾기
+            label_tag = container.find(lambda tag: tag.name == 'div' and tag.string and tag.string.strip() == '낚시종류')
+            if not label_tag:
+                label_tag = container.find('img', alt='낚시종류')
+            if label_tag:
+                # 가장 가까운 'td' 부모를 찾고, 그 다음 'td' 형제를 찾음
+                label_td = label_tag.find_parent('td')
+                if label_td:
+                    fish_td = label_td.find_next_sibling('td')
+                    if fish_td:
+                        fish = fish_td.get_text(" ", strip=True)
+
+    return {"container": container, "tide": tide, "fish": fish}
+
+
+@register
+class ScheduleFleetParser(SiteParser):
+    """sunsang24 선단 스케줄: #dYYYY-MM-DD 날짜 블록 안의 선박 테이블"""
+    name = PARSER_SCHEDULE_FLEET
+    family = FAMILY_SCHEDULE_FLEET
+
+    def matches(self, url: str, head_bytes: bytes) -> bool:
+        return is_schedule_fleet_url(url) or b'shipsinfo_daywarp' in head_bytes
+
+    def _day_block(self, soup, date_id: str):
+        day_block = soup.find(id=date_id) or soup.select_one('.shipsinfo_daywarp.weekday')
+        if day_block:
+            return day_block
+        # try comment-based search (마지막으로 찾은 블록 사용)
+        for comment in soup.find_all(string=lambda t: isinstance(t, Comment)):
+            if "날자별 선단 소속 선박 리스트" in str(comment):
+                nxt = comment
+                for _ in range(8):
+                    nxt = nxt.next_sibling
+                    if not nxt:
+                        break
+                    if getattr(nxt, 'select', None):
+                        found = nxt.select_one(f".shipsinfo_daywarp#{date_id}, .shipsinfo_daywarp.weekday, .shipsinfo_daywarp")
+                        if found:
+                            day_block = found
+                            break
+        return day_block
+
+    def _page_fish(self, soup, day_block):
+        # 어종 추출: div#fish 또는 .fish 우선, 없으면 '낚시종류' 라벨 주변에서 시도
+        fish_el = day_block.select_one('div#fish') or day_block.select_one('.fish') or soup.select_one('div#fish')
+        if fish_el:
+            return fish_el.get_text(" ", strip=True)
+        label_text = day_block.find(string=re.compile(r'낚시종류'))
+        if label_text:
+            parent = label_text.parent
+            if parent and parent.name == 'td':
+                sib = parent.find_next_sibling('td')
+                if sib:
+                    return sib.get_text(" ", strip=True)
+            else:
+                nxt = label_text.find_next()
+                if nxt and getattr(nxt, 'get_text', None):
+                    return nxt.get_text(" ", strip=True)
+        return None
+
+    def _ship_fish(self, t) -> Optional[str]:
+        # 1) 선박 테이블 내부에서 어종 셀렉터 우선 탐색
+        ship_fish_el = (
+            t.select_one('.ship_info .fish') or
+            t.select_one('.ship_info2 .fish') or
+            t.select_one('.fish') or
+            t.select_one('div.fish') or
+            t.select_one('span.fish') or
+            t.select_one('.ship_kinds') or
+            t.select_one('.ship_kind') or
+            t.select_one('.tags') or
+            t.select_one('.tag_area')
+        )
+        if ship_fish_el:
+            # 라벨 제거 (낚시종류:, 어종: 등)
+            ship_fish = _FISH_LABEL_RE.sub('', ship_fish_el.get_text(" ", strip=True)).strip()
+            if ship_fish:
+                return ship_fish
+
+        # 2) 라벨 기반 탐색 (테이블 내 "낚시종류" 또는 "어종" 라벨)
+        lbl = t.find(string=re.compile(r'(낚시\s*종류|어종)', re.I))
+        if lbl:
+            p = getattr(lbl, 'parent', None)
+            if p and getattr(p, 'name', None) == 'td':
+                sib = p.find_next_sibling('td')
+                if sib:
+                    ship_fish = _FISH_LABEL_RE.sub('', sib.get_text(" ", strip=True)).strip()
+                    if ship_fish:
+                        return ship_fish
+            nxt = lbl.find_next()
+            if nxt and getattr(nxt, 'get_text', None):
+                return _FISH_LABEL_RE.sub('', nxt.get_text(" ", strip=True)).strip()
+        return None
+
+    def parse(self, page: Page) -> Dict:
+        soup = page.soup
+        date_id = f"d{page.year:04d}-{page.month:02d}-{page.day:02d}"
+        day_block = self._day_block(soup, date_id)
+        if not day_block:
+            return {"matched": False, "date_id": date_id, "source_url": page.url, "entries": [], "tide": None}
+
+        # extract tide info from .date_info2
+        tide = None
+        date_info2_el = day_block.select_one('.date_info2')
+        if date_info2_el:
+            tide = date_info2_el.get_text(separator=' ', strip=True)
+
+        fish = self._page_fish(soup, day_block)
+        # debug: schedule_fleet 패턴에서 추출된 어종 확인
+        if page.debug_enabled:
+            try:
+                print(json.dumps({"DEBUG_FISH_SCHEDULE": fish, "date": page.display_date, "url": page.url}, ensure_ascii=False))
+            except Exception:
+                print("DEBUG_FISH_SCHEDULE:", fish, page.display_date, page.url)
+
+        entries = []
+        ship_tables = day_block.select('table.ship_unit, table[class*="ship_unit_"], table.ship_unit_ship_no_918, .ships_warp table')
+        if not ship_tables:
+            ship_tables = [t for t in day_block.find_all('table') if t.select_one('.title') or t.select_one('.ship_info')]
+
+        for t in ship_tables:
+            title_el = t.select_one('.ship_info .title') or t.select_one('.title')
+            ship_name = title_el.get_text(strip=True) if title_el else None
+
+            # ship_info2 status
+            status_el = t.select_one('.ship_info2 .shipping_status') or t.select_one('.ship_info2') or None
+            status_text = status_el.get_text(separator=' ', strip=True) if status_el else ""
+            status_code = status_el.get('data-status_code') if status_el and status_el.has_attr('data-status_code') else None
+
+            # remaining seats
+            avail = None
+            num_el = t.select_one('span.number.blink_me.n_blue.f_20') or t.select_one('.ship_info2 .number') or t.select_one('.number')
+            if num_el:
+                mnum = re.search(r'(\d+)', num_el.get_text())
+                if mnum:
+                    avail = int(mnum.group(1))
+
+            if re.search(r'점검일', status_text):
+                status = 'maintenance'
+                avail = 0
+                display_status = "점검일"
+            elif status_code == 'END' or re.search(r'(예약마감|매진|마감)', status_text):
+                status = 'full'
+                if avail is None:
+                    avail = 0
+                display_status = "예약마감"
+            elif re.search(r'예약\s*완료', status_text):
+                status = 'reserved'
+                avail = 0
+                display_status = "예약완료"
+            elif avail is not None and avail > 0:
+                status = 'open'
+                display_status = f"남은자리 {avail}명"
+            else:
+                status = 'unknown'
+                display_status = status_text or "알 수 없음"
+
+            # 배별 어종, 없으면 페이지(day_block) 어종을 최종 폴백
+            ship_fish = self._ship_fish(t) or fish
+
+            if page.debug_enabled:
+                try:
+                    print(json.dumps({
+                        "DEBUG_SCHEDULE_ENTRY": {
+                            "ship_name": ship_name,
+                            "status": status,
+                            "available": avail,
+                            "display_status": display_status,
+                            "raw_status_text": status_text,
+                            "fish": ship_fish,
+                            "query_date": page.display_date,
+                            "row_html_len": len(str(t))
+                        }
+                    }, ensure_ascii=False))
+                except Exception:
+                    print("DEBUG_SCHEDULE_ENTRY:", ship_name, status, avail, display_status, ship_fish)
+
+            # 유효한 배 이름인지 검증
+            if not _is_valid_ship_name(ship_name):
+                continue
+
+            entries.append({
+                "ship_name": _clean_ship_name(ship_name),
+                "status": status,
+                "available": avail,
+                "raw_status_text": status_text,
+                "display_status": display_status,
+                "row_html": str(t),
+                "query_date": page.display_date,
+                "fish": ship_fish  # 배별 어종
+            })
+
+        return {"matched": True, "entries": entries, "date_id": date_id, "source_url": page.url, "tide": tide}
+
+
+@register
+class XeBoardParser(SiteParser):
+    """XE 게시판(mid=bk): 날짜 컨테이너에 행이 없을 때 문서 전체 tr 을 선박 행으로 해석"""
+    name = PARSER_XE_BOARD
+
+    EXCLUDE_KEYWORDS = {"공지사항", "입금대기", "선박명", "공지", "오늘:"}
+
+    def matches(self, url: str, head_bytes: bytes) -> bool:
+        query = parse_qs(urlparse(url).query or "")
+        return query.get('mid', [''])[0] == 'bk' or b'new-div-' in head_bytes
+
+    def _notice_fish(self, td) -> Optional[str]:
+        # 1) td 내 모든 텍스트 노드에서 어종 키워드 추출
+        found = _fish_keywords_in(td)
+        if found:
+            return ', '.join(found)
+        # 2) 전체 텍스트에서 키워드 추출 (백업, 안내문 스타일은 무시)
+        notice_fish = ' '.join(td.get_text(" ", strip=True).replace('\n', ' ').replace('\r', ' ').split())
+        n_nf = _norm(notice_fish)
+        found = [w for w in FISH_KEYWORDS if _norm(w) in n_nf]
+        if found:
+            return ', '.join(found)
+        if notice_fish and len(notice_fish) <= 20 and not re.match(r'^[0-9a-zA-Z\(\)\[\]#]', notice_fish) \
+                and notice_fish.count('.') < 2:
+            return notice_fish
+        return None
+
+    def parse(self, page: Page) -> Dict:
+        soup = page.soup
+        board = page.board
+        entries = []
+
+        # 컨테이너 내 tr 이 있으면 이 어댑터의 대상이 아님 (admin_right 가 처리)
+        if board["container"] and board["container"].select("tr"):
+            return page.board_result(entries)
+
+        current_fish = board["fish"]  # 페이지 레벨 어종으로 시작
+        for tr in soup.select("tr"):
+            tds = tr.find_all("td")
+            if not tds:
+                continue
+
+            # --- 공지 행에서 어종 추출 ---
+            if _is_notice_cell(tds[0]) and len(tds) >= 2:
+                current_fish = self._notice_fish(tds[1]) or current_fish
+                continue
+
+            # 어종 정보 행인지 확인 (td가 2개이고 첫번째에 '낚시종류' 포함)
+            if '낚시종류' in tds[0].get_text(" ", strip=True) and len(tds) >= 2:
+                current_fish = tds[1].get_text(" ", strip=True).strip()
+                continue
+
+            # 보트 행이 아니면 건너뜀 (td 갯수 등)
+            if len(tds) < 3:
+                continue
+
+            # 1번째 td에서 선박명 추출, 불필요한 행(헤더/공지 등) 제거
+            ship_name = tds[0].get_text(" ", strip=True)
+            if not ship_name:
+                continue
+            lowered = ship_name.replace(" ", "")
+            if any(kw in ship_name or kw in lowered for kw in self.EXCLUDE_KEYWORDS):
+                continue
+
+            # 3번째 td (또는 admin-right div)가 실제 상태/잔여 정보를 가지고 있는 경우 추출
+            admin_div = tds[2].select_one('div[id^="admin-right-"]') or tr.select_one('div[id^="admin-right-"]')
+            if admin_div:
+                raw_status_text = _admin_text(admin_div)
+                status_type, available = _admin_status(raw_status_text)
+            else:
+                raw_status_text = tds[1].get_text(" ", strip=True)
+                available = None
+                if re.search(r'입금대기', raw_status_text):
+                    status_type = "pending"
+                elif re.search(r'예약\s*완료', raw_status_text):
+                    status_type = "reserved"
+                    available = 0
+                else:
+                    status_type = "unknown"
+
+            if status_type == "maintenance":
+                display_status = "점검일"
+            elif status_type in ("reserved", "full"):
+                display_status = "예약마감"
+            elif status_type == "open" and available is not None:
+                display_status = f"남은자리 {available}명"
+            elif status_type == "pending":
+                display_status = "입금대기"
+            else:
+                display_status = raw_status_text or "알 수 없음"
+
+            if page.debug_enabled:
+                try:
+                    print(json.dumps({
+                        "DEBUG_BOARD_ENTRY": {
+                            "ship_name": ship_name,
+                            "status": status_type,
+                            "available": available,
+                            "display_status": display_status,
+                            "raw_status_text": raw_status_text,
+                            "fish": current_fish,
+                            "row_html_len": len(str(tr))
+                        }
+                    }, ensure_ascii=False))
+                except Exception:
+                    print("DEBUG_BOARD_ENTRY:", ship_name, status_type, available, display_status, current_fish)
+
+            if not _is_valid_ship_name(ship_name):
+                continue
+
+            entries.append({
+                "ship_name": _clean_ship_name(ship_name),
+                "status": status_type,
+                "available": available,
+                "raw_status_text": raw_status_text,
+                "display_status": display_status,
+                "row_html": str(tr),
+                "fish": current_fish
+            })
+
+        return page.board_result(entries)
+
+
+@register
+class AdminRightParser(SiteParser):
+    """게시판 행 안의 div#admin-right-* 블록을 직접 스캔"""
+    name = PARSER_ADMIN_RIGHT
+
+    def matches(self, url: str, head_bytes: bytes) -> bool:
+        return b'admin-right-' in head_bytes
+
+    def parse(self, page: Page) -> Dict:
+        soup = page.soup
+        all_trs = soup.find_all('tr')
+        tr_index = {id(tr): i for i, tr in enumerate(all_trs)}
+
+        # 공지 tr 이후의 모든 tr에 해당 공지의 어종 적용 (뒤의 공지가 덮어씀)
+        notice_fish_map = {}
+        for idx, tr_item in enumerate(all_trs):
+            tds = tr_item.find_all('td')
+            if len(tds) >= 2 and _is_notice_cell(tds[0]):
+                found = _fish_keywords_in(tds[1])
+                if found:
+                    fish_val = ', '.join(found)
+                    for j in range(idx + 1, len(all_trs)):
+                        notice_fish_map[id(all_trs[j])] = fish_val
+
+        entries = []
+        for adm in soup.select('div[id^="admin-right-"]'):
+            tr = adm.find_parent('tr')
+            if not tr:
+                continue
+            tds = tr.find_all('td')
+            ship_name = tds[0].get_text(' ', strip=True) if tds else ''
+            local_fish = None
+
+            # 현재 tr 이후의 tr들에서 공지 행 탐색 (테이블 경계 무시)
+            for following in all_trs[tr_index.get(id(tr), -1) + 1:]:
+                f_tds = following.find_all('td')
+                if len(f_tds) < 2:
+                    continue
+                if _is_notice_cell(f_tds[0]):
+                    found = _fish_keywords_in(f_tds[1])
+                    if found:
+                        local_fish = ', '.join(found)
+                        break
+                # 선박명이 없으면 이후 tr에서 선박명도 추출
+                if not ship_name and f_tds[0]:
+                    ship_name = f_tds[0].get_text(' ', strip=True)
+
+            if not ship_name:
+                continue
+
+            raw_status_text = _admin_text(adm)
+            status_type, available = _admin_status(raw_status_text)
+
+            if not _is_valid_ship_name(ship_name):
+                continue
+
+            entries.append({
+                'ship_name': _clean_ship_name(ship_name),
+                'status': status_type,
+                'available': available,
+                'raw_status_text': raw_status_text,
+                'display_status': '-',
+                'row_html': str(tr),
+                'fish': local_fish or notice_fish_map.get(id(tr)) or page.board["fish"] or None
+            })
+
+        return page.board_result(entries)
+
+
+def parse_page(html: str, url: str, year: int, month: int, day: int,
+               debug_enabled: bool = False, parser_type: Optional[str] = None,
+               head_bytes: Optional[bytes] = None) -> Dict:
+    """가져온 HTML 을 어댑터로 파싱.
+
+    parser_type 으로 기억된 어댑터가 있으면 그것부터 실행하고, 결과가 비면 같은 계열
+    어댑터를 matches() 가 참인 것 → 나머지 순서로 시도합니다. 결과의 "parser" 는
+    선박을 찾아낸 어댑터 이름(없으면 None)입니다.
+    """
+    page = Page(html, url, year, month, day, debug_enabled=debug_enabled)
+    if head_bytes is None:
+        head_bytes = html[:PROBE_BYTES].encode('utf-8', 'ignore')
+
+    family = url_family(url)
+    candidates = [p for p in PARSERS.values() if p.family == family]
+    remembered = PARSERS.get(parser_type or '')
+    if remembered in candidates:
+        # 기억된 어댑터 우선
+        candidates.remove(remembered)
+        ordered = [remembered]
+    else:
+        ordered = []
+    ordered += [p for p in candidates if p.matches(url, head_bytes)]
+    ordered += [p for p in candidates if p not in ordered]
+
+    started = time.perf_counter()
+    tried = []
+    first = None
+    for parser in ordered:
+        tried.append(parser.name)
+        result = parser.parse(page)
+        if result.get("entries"):
+            result["parser"] = parser.name
+            break
+        if first is None:
+            first = result
+    else:
+        result = first
+        result["parser"] = None
+    result["timing"] = {"parse_ms": (time.perf_counter() - started) * 1000, "parsers_tried": tried}
+    return result
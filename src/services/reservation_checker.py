@@ -1,10 +1,12 @@
-from bs4 import BeautifulSoup, Comment
-from typing import Dict, List
+from typing import Dict
+import codecs
 from urllib.parse import urlparse, parse_qs, urlencode, urlunparse
 import requests
 import re
 import datetime
-import json
+import time
+
+from services.hedging import hedged_call
 
 # 어종 키워드 (필요시 확장)
 FISH_KEYWORDS = [
@@ -59,7 +61,7 @@ def build_query_url(base_url: str, year: int, month: int, day: int) -> str:
     query = parse_qs(parsed.query or "")
 
     # sunsang24 도메인 또는 기존 schedule_fleet 경로는 schedule_fleet 처리
-    if 'sunsang24.com' in netloc or 'schedule_fleet' in path:
+    if is_schedule_fleet_url(base_url):
         scheme = parsed.scheme or "https"
         new_path = f"/ship/schedule_fleet/{year:04d}{month:02d}"
         return urlunparse((scheme, parsed.netloc, new_path, "", "", ""))
@@ -78,6 +80,42 @@ def build_query_url(base_url: str, year: int, month: int, day: int) -> str:
     scheme = parsed.scheme or "https"
     return urlunparse((scheme, parsed.netloc, parsed.path, "", query_string, ""))
 
+PARSER_SCHEDULE_FLEET = 'schedule_fleet'
+# 어댑터가 아직 정해지지 않은 게시판. 조회 후 services/parsers.py 의 어댑터 이름으로 갱신됨
+PARSER_BOARD = 'board'
+
+# build_query_url 이 날짜마다 덮어쓰는 게시판 쿼리 파라미터 (canonical URL 에서는 제외)
+_DATE_QUERY_KEYS = {'year', 'month', 'day', 'mode', 'won', 'PA_N_UID', 'sel'}
+
+def is_schedule_fleet_url(url: str) -> bool:
+    parsed = urlparse(url)
+    return 'sunsang24.com' in (parsed.netloc or "").lower() or 'schedule_fleet' in (parsed.path or "")
+
+def site_info(url: str) -> Dict:
+    """예약 페이지 URL 에서 host / canonical base_url / parser_type 을 계산.
+
+    같은 host 를 공유하는 배들을 묶어 조회(배치, 호스트별 동시성 제한)할 수 있도록
+    배 등록/수정 시 한 번 계산해 DB 에 저장합니다.
+    """
+    parsed = urlparse((url or "").strip())
+    scheme = (parsed.scheme or "https").lower()
+    host = (parsed.netloc or "").lower()
+
+    if is_schedule_fleet_url(url or ""):
+        return {
+            "host": host,
+            "base_url": urlunparse((scheme, host, "/ship/schedule_fleet", "", "", "")),
+            "parser_type": PARSER_SCHEDULE_FLEET,
+        }
+
+    query = parse_qs(parsed.query or "")
+    kept = sorted((k, v[0]) for k, v in query.items() if k not in _DATE_QUERY_KEYS)
+    return {
+        "host": host,
+        "base_url": urlunparse((scheme, host, parsed.path or "/", "", urlencode(kept), "")),
+        "parser_type": PARSER_BOARD,
+    }
+
 def _headers_for(url: str, alt: bool = False) -> dict:
     p = urlparse(url)
     scheme = p.scheme or "https"
@@ -103,592 +141,247 @@ def _parse_tide_from_text(text: str) -> str | None:
     m = re.search(r'(\d+)\s*물', text)
     return f"{m.group(1)}물" if m else None
 
-def check_single_boat(boat_url: str, year: int, month: int, day: int, debug_enabled: bool = False) -> Dict:
+# 응답 인코딩: Content-Type 헤더 → 앞부분 <meta charset> → host 별 기억값 → 본문 전체 추정 순
+ENCODING_SNIFF_BYTES = 4096
+_CHARSET_RE = re.compile(rb'<meta[^>]+charset\s*=\s*["\']?\s*([A-Za-z0-9._:-]+)', re.I)
+# EUC-KR 로 선언하고 확장 완성형(CP949) 글자를 쓰는 국내 사이트가 많아 상위 집합으로 디코딩
+_ENCODING_ALIASES = {'euc-kr': 'cp949', 'euc_kr': 'cp949', 'ks_c_5601-1987': 'cp949', 'ksc5601': 'cp949'}
+_host_encodings: Dict[str, str] = {}
+
+def _normalize_encoding(name):
+    if not name:
+        return None
+    name = name.strip().strip('"\'').lower()
+    name = _ENCODING_ALIASES.get(name, name)
+    try:
+        return codecs.lookup(name).name
+    except LookupError:
+        return None
+
+def _header_charset(content_type: str):
+    m = re.search(r'charset\s*=\s*["\']?([^"\';\s]+)', content_type or '', re.I)
+    return _normalize_encoding(m.group(1)) if m else None
+
+def sniff_encoding(head: bytes):
+    """본문 앞부분에서 BOM 또는 <meta charset> / <meta http-equiv content="...charset=..."> 를 찾음"""
+    if head.startswith(codecs.BOM_UTF8):
+        return 'utf-8-sig'
+    m = _CHARSET_RE.search(head[:ENCODING_SNIFF_BYTES])
+    return _normalize_encoding(m.group(1).decode('ascii', 'ignore')) if m else None
+
+def _remember_host_encoding(host: str, encoding: str):
+    # ascii 는 한글 페이지를 깨뜨리므로 기억하지 않음 (오류 페이지·빈 달력 등 영문만 있는 응답)
+    if encoding != 'ascii':
+        _host_encodings[host] = encoding
+
+def choose_encoding(url: str, content_type: str, content: bytes, apparent=None):
+    """(encoding, 출처) 반환. apparent 는 본문 전체 추정 함수 (마지막 수단).
+    헤더/meta 선언은 host 별로 기억하고, 추정값은 본문에 비ASCII 바이트가 있을 때만 기억"""
+    host = (urlparse(url).netloc or '').lower()
+    for source, encoding in (('header', _header_charset(content_type)), ('meta', sniff_encoding(content))):
+        if encoding:
+            _remember_host_encoding(host, encoding)
+            return encoding, source
+    if host in _host_encodings:
+        return _host_encodings[host], 'host_cache'
+    encoding = _normalize_encoding(apparent() if apparent else None) or 'utf-8'
+    if not content.isascii():
+        _remember_host_encoding(host, encoding)
+    return encoding, 'detected'
+
+def decode_body(content: bytes, encoding: str) -> str:
+    return content.decode(encoding or 'utf-8', errors='replace')
+
+# 스트리밍 수신: 대상 날짜 블록이 닫히면 나머지 본문은 받지 않음 (한 달치 선단 페이지 등)
+STREAM_CHUNK_BYTES = 16 * 1024
+# 응답 본문 상한. 넘으면 too_large 오류로 처리
+MAX_RESPONSE_BYTES = 4 * 1024 * 1024
+_DIV_TAG_RE = re.compile(rb'<(/?)div\b', re.I)
+
+class DayBlockWatcher:
+    """받은 바이트를 이어 붙이며 대상 날짜 블록(div) 의 끝을 찾음.
+
+    선단 스케줄은 div#dYYYY-MM-DD, 게시판은 div#new-div-YYYYMMDD 가 대상입니다. 블록 시작
+    이후 div 여닫음 깊이가 0 이 되면 닫힌 것으로 봅니다. 게시판은 행 스캔(xe_board)이 문서
+    전체 tr 을 보므로, 블록 안에 admin-right 상태 블록이 있을 때만 끊습니다.
+    """
+
+    def __init__(self, url: str, year: int, month: int, day: int):
+        self.schedule = is_schedule_fleet_url(url)
+        marker = f"d{year:04d}-{month:02d}-{day:02d}" if self.schedule else f"new-div-{year:04d}{month:02d}{day:02d}"
+        self._start_re = re.compile(rb'<div\b[^>]*?\bid\s*=\s*["\']?' + re.escape(marker.encode()) + rb'(?![\w-])', re.I)
+        self.buf = bytearray()
+        self._start = None
+        self._scan = 0
+        self._depth = 0
+        self.active = True
+        self.closed = False
+
+    def feed(self, chunk: bytes) -> bool:
+        """chunk 를 추가하고 블록이 닫혔으면 True"""
+        self.buf += chunk
+        if self.closed or not self.active:
+            return self.closed
+        if self._start is None:
+            # 태그가 chunk 경계에 걸칠 수 있으므로 앞 부분을 조금 겹쳐 검색
+            m = self._start_re.search(self.buf, max(0, self._scan - 512))
+            if not m:
+                self._scan = len(self.buf)
+                return False
+            self._start = self._scan = m.start()
+        # 마지막 몇 바이트는 '<di' 처럼 잘린 태그일 수 있어 다음 chunk 에서 다시 봄
+        limit = len(self.buf) - 5
+        for m in _DIV_TAG_RE.finditer(self.buf, self._scan, limit):
+            self._scan = m.end()
+            self._depth += -1 if m.group(1) else 1
+            if self._depth == 0:
+                self.closed = self.schedule or b'admin-right-' in self.buf[self._start:m.end()]
+                # 끊을 수 없는 게시판 형식이면 이후로는 검사하지 않고 끝까지 받음
+                self.active = self.closed
+                return self.closed
+        return False
+
+class ResponseTooLarge(requests.RequestException):
+    pass
+
+def read_body(resp, watcher: "DayBlockWatcher" = None, max_bytes: int = None):
+    """stream=True 응답 본문을 읽음. (bytes, 조기 종료 여부) 반환, 상한을 넘으면 ResponseTooLarge"""
+    max_bytes = max_bytes or MAX_RESPONSE_BYTES
+    buf = watcher.buf if watcher is not None else bytearray()
+    stopped = False
+    try:
+        for chunk in resp.iter_content(STREAM_CHUNK_BYTES):
+            if watcher is not None:
+                stopped = watcher.feed(chunk)
+            else:
+                buf += chunk
+            if len(buf) > max_bytes:
+                raise ResponseTooLarge(f"response_too_large (상한 {max_bytes} bytes)")
+            if stopped:
+                break
+    finally:
+        resp.close()
+    return bytes(buf), stopped
+
+def fetch_page(boat_url: str, year: int, month: int, day: int) -> Dict:
+    """날짜 쿼리를 붙인 예약 페이지를 가져옴.
+
+    성공 시 {"used_url", "display_date", "content", "encoding", "timing"} 를, 실패 시 error 가
+    담긴 check_single_boat 형식의 빈 결과를 반환합니다. timing 에는 시도(1차 / 403 재시도 /
+    http 폴백)별 상태·소요 시간·응답 헤더까지 시간(ttfb)·바이트 수가 기록됩니다. 본문은
+    스트리밍으로 받으며 대상 날짜 블록이 닫히면 나머지는 읽지 않습니다 (DayBlockWatcher).
+    """
     final_url = build_query_url(boat_url, year, month, day)
 
     # 요일/표시 날짜(물때는 응답 후 보강)
     weekday = _weekday_kor(year, month, day)
     display_date = f"{year:04d}-{month:02d}-{day:02d}({weekday})"
 
+    started = time.perf_counter()
+    timing = {"attempts": [], "bytes": 0}
+
+    def _request(url: str, alt: bool):
+        r = requests.get(url, headers=_headers_for(url, alt=alt), timeout=10, stream=True)
+        if r.status_code == 200:
+            r.body, r.stopped_early = read_body(r, DayBlockWatcher(url, year, month, day))
+        else:
+            # 200 이 아니면 본문은 필요 없음. 스트리밍 응답이므로 닫아서 연결을 풀에 돌려줌
+            r.body, r.stopped_early = b"", False
+            r.close()
+        return r
+
+    def _get(url: str, alt: bool, kind: str):
+        attempt = {"kind": kind}
+        timing["attempts"].append(attempt)
+        t0 = time.perf_counter()
+        try:
+            if kind == "first":
+                # 첫 시도가 host 의 p90 을 넘기면 같은 요청을 하나 더 보냄 (services/hedging.py)
+                r, hedged = hedged_call(lambda: _request(url, alt), urlparse(url).netloc.lower())
+                if hedged:
+                    attempt["hedged"] = True
+            else:
+                r = _request(url, alt)
+        except requests.RequestException as e:
+            attempt.update(ms=(time.perf_counter() - t0) * 1000, error=type(e).__name__)
+            raise
+        attempt.update(ms=(time.perf_counter() - t0) * 1000, status=r.status_code,
+                       ttfb_ms=r.elapsed.total_seconds() * 1000, bytes=len(r.body))
+        if r.stopped_early:
+            attempt["stopped_early"] = True
+        return r
+
+    def _done(result: Dict) -> Dict:
+        timing["fetch_ms"] = (time.perf_counter() - started) * 1000
+        result["timing"] = timing
+        return result
+
+    def _too_large(e: ResponseTooLarge) -> Dict:
+        # 연결 실패가 아니라 페이지가 큰 것이므로 http_error 와 구분 (동시 실행 한도를 줄이지 않음)
+        return _done({"used_url": final_url, "display_date": display_date, "entries": [], "error": f"too_large:{e}"})
+
     # 1차 시도: 정상 헤더 (타임아웃 10초)
     try:
-        resp = requests.get(final_url, headers=_headers_for(final_url), timeout=10)
+        resp = _get(final_url, False, "first")
+    except ResponseTooLarge as e:
+        return _too_large(e)
     except requests.RequestException as e:
-        return {"used_url": final_url, "display_date": display_date, "entries": [], "error": f"http_error:{e}"}
+        return _done({"used_url": final_url, "display_date": display_date, "entries": [], "error": f"http_error:{e}"})
 
     # 403이면 UA/Referer 바꿔 재시도 + http 스킴 폴백
     if resp.status_code == 403:
         try:
-            resp = requests.get(final_url, headers=_headers_for(final_url, alt=True), timeout=10)
+            resp = _get(final_url, True, "alt_ua")
+        except ResponseTooLarge as e:
+            return _too_large(e)
         except requests.RequestException:
             resp = None
 
         if (resp is None) or (resp.status_code == 403 and final_url.startswith("https://")):
             try:
                 http_url = "http://" + final_url[len("https://"):]
-                resp = requests.get(http_url, headers=_headers_for(http_url, alt=True), timeout=10)
+                resp = _get(http_url, True, "http_fallback")
                 final_url = http_url  # 실제 사용 URL 갱신
+            except ResponseTooLarge as e:
+                return _too_large(e)
             except requests.RequestException:
                 pass
 
     # 여전히 200이 아니면 예외를 던지지 않고 빈 결과 반환 (500 방지)
     if resp is None or resp.status_code != 200:
-        return {
+        return _done({
             "used_url": final_url,
             "display_date": display_date,
             "entries": [],
             "error": f"http_status:{getattr(resp, 'status_code', 'unknown')}"
-        }
-
-    soup = BeautifulSoup(resp.text, "html.parser")
-
-    # 판단 기준: target의 호스트가 sunsang24.com 이거나 path에 schedule_fleet가 있으면 기존 패턴 사용
-    parsed_target = urlparse(final_url)
-    target_netloc = (parsed_target.netloc or "").lower()
-    use_schedule_pattern = ('sunsang24.com' in target_netloc) or ('schedule_fleet' in parsed_target.path)
-
-    if use_schedule_pattern:
-        date_id = f"d{year:04d}-{month:02d}-{day:02d}"
-        day_block = soup.find(id=date_id) or soup.select_one('.shipsinfo_daywarp.weekday')
-
-        if not day_block:
-            # try comment-based search
-            for comment in soup.find_all(string=lambda t: isinstance(t, Comment)):
-                if "날자별 선단 소속 선박 리스트" in str(comment):
-                    nxt = comment
-                    for _ in range(8):
-                        nxt = nxt.next_sibling
-                        if not nxt:
-                            break
-                        if getattr(nxt, 'select', None):
-                            found = nxt.select_one(f".shipsinfo_daywarp#{date_id}, .shipsinfo_daywarp.weekday, .shipsinfo_daywarp")
-                            if found:
-                                day_block = found
-                                break
-
-        if not day_block:
-            return {"matched": False, "date_id": date_id, "source_url": final_url, "entries": [], "tide": None}
-
-        # extract tide info from .date_info2
-        tide = None
-        date_info2_el = day_block.select_one('.date_info2')
-        if date_info2_el:
-            tide = date_info2_el.get_text(separator=' ', strip=True)
-
-        # 어종 추출: div#fish 또는 .fish 우선, 없으면 '낚시종류' 라벨 주변에서 시도
-        fish = None
-        fish_el = day_block.select_one('div#fish') or day_block.select_one('.fish') or soup.select_one('div#fish')
-        if fish_el:
-            fish = fish_el.get_text(" ", strip=True)
-        else:
-            label_text = day_block.find(string=re.compile(r'낚시종류'))
-            if label_text:
-                parent = label_text.parent
-                if parent and parent.name == 'td':
-                    sib = parent.find_next_sibling('td')
-                    if sib:
-                        fish = sib.get_text(" ", strip=True)
-                else:
-                    nxt = label_text.find_next()
-                    if nxt and getattr(nxt, 'get_text', None):
-                        fish = nxt.get_text(" ", strip=True)
-
-        # debug: schedule_fleet 패턴에서 추출된 어종 확인
-        if debug_enabled:
-            try:
-                print(json.dumps({"DEBUG_FISH_SCHEDULE": fish, "date": display_date, "url": final_url}, ensure_ascii=False))
-            except Exception:
-                print("DEBUG_FISH_SCHEDULE:", fish, display_date, final_url)
-
-        entries = []
-        ship_tables = day_block.select('table.ship_unit, table[class*="ship_unit_"], table.ship_unit_ship_no_918, .ships_warp table')
-        if not ship_tables:
-            ship_tables = [t for t in day_block.find_all('table') if t.select_one('.title') or t.select_one('.ship_info')]
-
-        for t in ship_tables:
-            # find title
-            title_el = t.select_one('.ship_info .title') or t.select_one('.title')
-            ship_name = title_el.get_text(strip=True) if title_el else None
-
-            # ship_info2 status
-            status_el = t.select_one('.ship_info2 .shipping_status') or t.select_one('.ship_info2') or None
-            status_text = status_el.get_text(separator=' ', strip=True) if status_el else ""
-            status_code = status_el.get('data-status_code') if status_el and status_el.has_attr('data-status_code') else None
-
-            # remaining seats
-            avail = None
-            num_el = t.select_one('span.number.blink_me.n_blue.f_20') or t.select_one('.ship_info2 .number') or t.select_one('.number')
-            if num_el:
-                mnum = re.search(r'(\d+)', num_el.get_text())
-                if mnum:
-                    avail = int(mnum.group(1))
-
-            if re.search(r'점검일', status_text):
-                status = 'maintenance'
-                avail = 0
-                display_status = "점검일"
-            elif status_code == 'END' or re.search(r'(예약마감|매진|마감)', status_text):
-                status = 'full'
-                if avail is None:
-                    avail = 0
-                display_status = "예약마감"
-            elif re.search(r'예약\s*완료', status_text):
-                status = 'reserved'
-                avail = 0
-                display_status = "예약완료"
-            elif avail is not None and avail > 0:
-                status = 'open'
-                display_status = f"남은자리 {avail}명"
-            else:
-                status = 'unknown'
-                display_status = status_text or "알 수 없음"
-
-            # --- changed: 배별 어종(fish) 추출 ---
-            ship_fish = None
-            # 1) 선박 테이블 내부에서 어종 셀렉터 우선 탐색
-            ship_fish_el = (
-                t.select_one('.ship_info .fish') or
-                t.select_one('.ship_info2 .fish') or
-                t.select_one('.fish') or
-                t.select_one('div.fish') or
-                t.select_one('span.fish') or
-                t.select_one('.ship_kinds') or
-                t.select_one('.ship_kind') or
-                t.select_one('.tags') or
-                t.select_one('.tag_area')
-            )
-            if ship_fish_el:
-                ship_fish_text = ship_fish_el.get_text(" ", strip=True)
-                # 라벨 제거 (낚시종류:, 어종: 등)
-                ship_fish = re.sub(r'(낚시\s*종류|낚시종류|어종)\s*[:：-]?\s*', '', ship_fish_text, flags=re.I).strip()
-            
-            # 2) 라벨 기반 탐색 (테이블 내 "낚시종류" 또는 "어종" 라벨)
-            if not ship_fish:
-                lbl = t.find(string=re.compile(r'(낚시\s*종류|어종)', re.I))
-                if lbl:
-                    p = getattr(lbl, 'parent', None)
-                    if p and getattr(p, 'name', None) == 'td':
-                        sib = p.find_next_sibling('td')
-                        if sib:
-                            txt = sib.get_text(" ", strip=True)
-                            ship_fish = re.sub(r'(낚시\s*종류|낚시종류|어종)\s*[:：-]?\s*', '', txt, flags=re.I).strip()
-                    if not ship_fish:
-                        nxt = lbl.find_next()
-                        if nxt and getattr(nxt, 'get_text', None):
-                            txt = nxt.get_text(" ", strip=True)
-                            ship_fish = re.sub(r'(낚시\s*종류|낚시종류|어종)\s*[:：-]?\s*', '', txt, flags=re.I).strip()
-            
-            # 3) 페이지 전체(day_block) 어종을 최종 폴백
-            if not ship_fish:
-                ship_fish = fish
-            # ---------------------------------------
-            
-            # debug: 파싱된 항목 콘솔 출력
-            if debug_enabled:
-                try:
-                    print(json.dumps({
-                        "DEBUG_SCHEDULE_ENTRY": {
-                            "ship_name": ship_name,
-                            "status": status,
-                            "available": avail,
-                            "display_status": display_status,
-                            "raw_status_text": status_text,
-                            "fish": ship_fish,  # 배별 어종
-                            "query_date": display_date,
-                            "row_html_len": len(str(t))
-                        }
-                    }, ensure_ascii=False))
-                except Exception:
-                    print("DEBUG_SCHEDULE_ENTRY:", ship_name, status, avail, display_status, ship_fish)
-            
-            # 유효한 배 이름인지 검증
-            if not _is_valid_ship_name(ship_name):
-                continue
-            
-            # 배 이름 정리 (예약하기 등 제거)
-            ship_name = _clean_ship_name(ship_name)
-            
-            entries.append({
-                "ship_name": ship_name,
-                "status": status,
-                "available": avail,
-                "raw_status_text": status_text,
-                "display_status": display_status,
-                "row_html": str(t),
-                "query_date": display_date,
-                "fish": ship_fish  # 배별 어종
-            })
-
-        return {"matched": True, "entries": entries, "date_id": date_id, "source_url": final_url, "tide": tide}
-
-        # 일반 게시판 패턴
-    else:
-        tide = None
-        # new-div-YYYYMMDD 컨테이너에서 선박별 행을 추출
-        entries = []
-        date8 = f"{int(year):04d}{int(month):02d}{int(day):02d}"
-
-        # 대표 컨테이너 찾기
-        container = soup.select_one(f"div#new-div-{date8}") or soup.select_one(f"div.new-divs, .new-divs")
-
-        # 물때 정보 추출 (jeil-panel tr의 data-str 속성에서)
-        if container:
-            jeil_panel_tr = container.select_one('tr.jeil-panel')
-            if jeil_panel_tr and jeil_panel_tr.has_attr('data-str'):
-                data_str = jeil_panel_tr['data-str']
-                m = re.search(r'(\d+)\s*물', data_str)
-                if m:
-                    tide = f"{m.group(1)}물"
-
-        # 일반 게시판에서도 어종 추출 시도
-        fish = None
-        if container:
-            fish_el = container.select_one('div#fish') or container.select_one('.fish') or soup.select_one('div#fish')
-            if fish_el:
-                fish = fish_el.get_text(" ", strip=True)
-            else:
-                # 텍스트 또는 img alt 속성으로 "낚시종류" 라벨 찾기
-                label_tag = container.find(lambda tag: tag.name == 'div' and tag.string and tag.string.strip() == '낚시종류')
-                if not label_tag:
-                    label_tag = container.find('img', alt='낚시종류')
-                if label_tag:
-                    # 가장 가까운 'td' 부모를 찾고, 그 다음 'td' 형제를 찾음
-                    label_td = label_tag.find_parent('td')
-                    if label_td:
-                        fish_td = label_td.find_next_sibling('td')
-                        if fish_td:
-                            fish = fish_td.get_text(" ", strip=True)
-
-        # 컨테이너 내 tr을 우선 사용, 없으면 문서 전체 tr로 폴백
-        rows = []
-        if container:
-            rows = container.select("tr") or []
-        if not rows:
-            rows = soup.select("tr")
-            exclude_keywords = {"공지사항", "입금대기", "선박명", "공지", "오늘:"}
-            current_fish = fish  # 페이지 레벨 어종으로 시작
-
-            for tr in rows:
-                tds = tr.find_all("td")
-                if not tds:
-                    continue
-
-                # --- 공지 행에서 어종 추출 ---
-                is_notice = False
-                # <img alt="공지">
-                img = tds[0].find('img', alt='공지')
-                if img:
-                    is_notice = True
-                # <div>공지</div>
-                div = tds[0].find('div')
-                if div and '공지' in div.get_text(strip=True):
-                    is_notice = True
-                if is_notice and len(tds) >= 2:
-                    # 공지 행의 어종 정보 추출 (단, 안내문 스타일은 무시)
-                    # 1) td 내 모든 텍스트 노드에서 어종 키워드 추출
-                    all_texts = []
-                    # 모든 텍스트 노드 수집 (중첩 태그 포함)
-                    for elem in tds[1].descendants:
-                        if elem.name is None:
-                            txt = str(elem).strip()
-                            if txt:
-                                all_texts.append(txt)
-                    found_fish = []
-                    for txt in all_texts:
-                        n_txt = _norm(txt)
-                        for w in FISH_KEYWORDS:
-                            if _norm(w) in n_txt and w not in found_fish:
-                                found_fish.append(w)
-                    if found_fish:
-                        current_fish = ', '.join(found_fish)
-                        continue
-                    # 2) 전체 텍스트에서 키워드 추출 (백업)
-                    notice_fish = tds[1].get_text(" ", strip=True)
-                    notice_fish = notice_fish.replace('\n', ' ').replace('\r', ' ')
-                    notice_fish = ' '.join(notice_fish.split())
-                    n_nf = _norm(notice_fish)
-                    found_fish = [w for w in FISH_KEYWORDS if _norm(w) in n_nf]
-                    if found_fish:
-                        current_fish = ', '.join(found_fish)
-                    elif notice_fish and len(notice_fish) <= 20 and not re.match(r'^[0-9a-zA-Z\(\)\[\]#]', notice_fish) and notice_fish.count('.') < 2:
-                        current_fish = notice_fish
-                    continue
-
-                # 어종 정보 행인지 확인 (td가 2개이고 첫번째에 '낚시종류' 포함)
-                first_td_text = tds[0].get_text(" ", strip=True)
-                if '낚시종류' in first_td_text and len(tds) >= 2:
-                    current_fish = tds[1].get_text(" ", strip=True).strip()
-                    # 어종 정보 행은 보트가 아니므로 건너뜀
-                    continue
-
-                # 보트 행이 아니면 건너뜀 (td 갯수 등)
-                if len(tds) < 3:
-                    continue
-
-                # 1번째 td에서 선박명 추출
-                ship_name = tds[0].get_text(" ", strip=True)
-
-                # 불필요한 행(헤더/공지 등) 제거
-                if not ship_name:
-                    continue
-                lowered = ship_name.replace(" ", "")
-                skip = False
-                for kw in exclude_keywords:
-                    if kw in ship_name or kw in lowered:
-                        skip = True
-                        break
-                if skip:
-                    continue
-
-                # 3번째 td (또는 admin-right div)가 실제 상태/잔여 정보를 가지고 있는 경우 추출
-                admin_div = None
-                if len(tds) >= 3:
-                    admin_div = tds[2].select_one('div[id^="admin-right-"]')
-                if not admin_div:
-                    admin_div = tr.select_one('div[id^="admin-right-"]')
-
-                raw_status_text = ""
-                available = None
-                status_type = "unknown"
-
-                if admin_div:
-                    img = admin_div.find("img")
-                    if img and img.has_attr("alt"):
-                        raw_status_text = img["alt"].strip()
-                    else:
-                        raw_status_text = admin_div.get_text(" ", strip=True)
-
-                    if re.search(r'점검일', raw_status_text):
-                        status_type = "maintenance"
-                        available = 0
-                    else:
-                        m = re.search(r'남은\s*자리\s*[:：]?\s*(\d+)', raw_status_text) or                             re.search(r'남은자리\s*(\d+)', raw_status_text) or                             re.search(r'(\d+)\s*명', raw_status_text)
-
-                        if m:
-                            try:
-                                available = int(m.group(1))
-                                status_type = "open"
-                            except Exception:
-                                available = None
-                                status_type = "unknown"
-                        elif re.search(r'예약완료|예약 완료', raw_status_text):
-                            status_type = "reserved"
-                            available = 0
-                        elif re.search(r'매진|마감|예약마감', raw_status_text):
-                            status_type = "full"
-                            available = 0
-                        else:
-                            status_type = "unknown"
-                else:
-                    second_text = tds[1].get_text(" ", strip=True)
-                    raw_status_text = second_text
-                    if re.search(r'입금대기', second_text):
-                        status_type = "pending"
-                    elif re.search(r'예약\s*완료', raw_status_text):
-                        status_type = "reserved"
-                        available = 0
-                    else:
-                        status_type = "unknown"
-
-                display_status = "-"
-                if status_type == "maintenance":
-                    display_status = "점검일"
-                elif status_type == "reserved":
-                    display_status = "예약마감"
-                elif status_type == "open" and available is not None:
-                    display_status = f"남은자리 {available}명"
-                elif status_type == "full":
-                    display_status = "예약마감"
-                elif status_type == "pending":
-                    display_status = "입금대기"
-                else:
-                    display_status = raw_status_text or "알 수 없음"
-
-                # debug: 출력하여 파싱 결과 확인
-                if debug_enabled:
-                    try:
-                        print(json.dumps({
-                            "DEBUG_BOARD_ENTRY": {
-                                "ship_name": ship_name,
-                                "status": status_type,
-                                "available": available,
-                                "display_status": display_status,
-                                "raw_status_text": raw_status_text,
-                                "fish": current_fish,
-                                "row_html_len": len(str(tr))
-                            }
-                        }, ensure_ascii=False))
-                    except Exception:
-                        print("DEBUG_BOARD_ENTRY:", ship_name, status_type, available, display_status, current_fish)
-
-                # 유효한 배 이름인지 검증
-                if not _is_valid_ship_name(ship_name):
-                    continue
-
-                # 배 이름 정리 (예약하기 등 제거)
-                ship_name = _clean_ship_name(ship_name)
-
-                entries.append({
-                    "ship_name": ship_name,
-                    "status": status_type,
-                    "available": available,
-                    "raw_status_text": raw_status_text,
-                    "display_status": display_status,
-                    "row_html": str(tr),
-                    "fish": current_fish
-                })
-
-        # 폴백 2: 위 방식으로 entries가 비면 admin-right 블록을 직접 스캔
-        if not entries:
-            # 모든 공지 tr을 수집하여 어종 매핑 구축
-            notice_fish_map = {}
-            all_trs = soup.select('tr')
-            for idx, tr_item in enumerate(all_trs):
-                tds2 = tr_item.find_all('td')
-                if len(tds2) < 2:
-                    continue
-                left = tds2[0]
-                is_notice2 = False
-                if left.find('img', alt='공지'):
-                    is_notice2 = True
-                dv = left.find('div')
-                if dv and '공지' in dv.get_text(strip=True):
-                    is_notice2 = True
-                if is_notice2:
-                    # 오른쪽 td 전체 텍스트에서 키워드
-                    texts = []
-                    for elem in tds2[1].descendants:
-                        if elem.name is None:
-                            t = str(elem).strip()
-                            if t:
-                                texts.append(t)
-                    found = []
-                    for t in texts:
-                        nt = _norm(t)
-                        for w in FISH_KEYWORDS:
-                            if _norm(w) in nt and w not in found:
-                                found.append(w)
-                    if found:
-                        # 이 공지 tr 이후의 모든 tr에 어종 적용 (다음 공지가 나오기 전까지)
-                        fish_val = ', '.join(found)
-                        for j in range(idx+1, len(all_trs)):
-                            notice_fish_map[id(all_trs[j])] = fish_val
-            
-            def _fish_from_notice_before(node):
-                return notice_fish_map.get(id(node), None)
-
-            for adm in soup.select('div[id^="admin-right-"]'):
-                tr = adm.find_parent('tr')
-                if not tr:
-                    continue
-                tds3 = tr.find_all('td')
-                ship_name = ''
-                local_fish = None
-                
-                # 1) 현재 tr의 첫 td에서 선박명 추출
-                if tds3:
-                    ship_name = tds3[0].get_text(' ', strip=True)
-                # 문서 전체 tr 스캔 (테이블 경계 무시)
-                all_trs_to_scan = soup.find_all('tr')
-                idx_current = -1
-                for i, t_item in enumerate(all_trs_to_scan):
-                    if t_item is tr:
-                        idx_current = i
-                        break
-                
-                if not local_fish:
-                    # 현재 tr 이후의 tr들에서 공지 행 탐색
-                    for j in range(idx_current + 1, len(all_trs_to_scan)):
-                        prev_tr = all_trs_to_scan[j]
-                        prev_tds = prev_tr.find_all('td')
-                        if len(prev_tds) >= 2:
-                            left = prev_tds[0]
-                            is_n = False
-                            if left.find('img', alt='공지'):
-                                is_n = True
-                            dv = left.find('div')
-                            if dv and '공지' in dv.get_text(strip=True):
-                                is_n = True
-                            if is_n:
-                                texts = []
-                                for elem in prev_tds[1].descendants:
-                                    if elem.name is None:
-                                        t = str(elem).strip()
-                                        if t:
-                                            texts.append(t)
-                                found = []
-                                for t in texts:
-                                    nt = _norm(t)
-                                    for w in FISH_KEYWORDS:
-                                        if _norm(w) in nt and w not in found:
-                                            found.append(w)
-                                if found:
-                                    local_fish = ', '.join(found)
-                                    break
-                            # 선박명이 없으면 이전 tr에서 선박명도 추출
-                            if not ship_name and prev_tds[0]:
-                                ship_name = prev_tds[0].get_text(' ', strip=True)
-
-                if not ship_name:
-                    continue
-
-                # 상태/잔여 계산
-                raw_status_text = ''
-                img = adm.find('img')
-                if img and img.has_attr('alt'):
-                    raw_status_text = img['alt'].strip()
-                else:
-                    raw_status_text = adm.get_text(' ', strip=True)
-
-                available = None
-                status_type = 'unknown'
-                if re.search(r'점검일', raw_status_text):
-                    status_type = 'maintenance'
-                    available = 0
-                else:
-                    m = re.search(r'남은\s*자리\s*[:：]?\s*(\d+)', raw_status_text) or \
-                        re.search(r'남은자리\s*(\d+)', raw_status_text) or \
-                        re.search(r'(\d+)\s*명', raw_status_text)
-                    if m:
-                        try:
-                            available = int(m.group(1))
-                            status_type = 'open'
-                        except Exception:
-                            available = None
-                            status_type = 'unknown'
-                    elif re.search(r'예약완료|예약 완료', raw_status_text):
-                        status_type = 'reserved'
-                        available = 0
-                    elif re.search(r'매진|마감|예약마감', raw_status_text):
-                        status_type = 'full'
-                        available = 0
-
-                # 유효한 배 이름인지 검증
-                if not _is_valid_ship_name(ship_name):
-                    continue
-
-                # 배 이름 정리 (예약하기 등 제거)
-                ship_name = _clean_ship_name(ship_name)
-
-                fish_local = local_fish or _fish_from_notice_before(tr) or fish or None
-                entries.append({
-                    'ship_name': ship_name,
-                    'status': status_type,
-                    'available': available,
-                    'raw_status_text': raw_status_text,
-                    'display_status': '-',
-                    'row_html': str(tr),
-                    'fish': fish_local
-                })
-
-        # matched True로 반환하되 entries가 비어있을 수 있음
-        return {
-            "matched": True,
-            "entries": entries,
-            "source_url": final_url,
-            "raw_html": resp.text[:1000],  # 디버깅용 요약
-            "tide": tide
-        }
+        })
+
+    # 디코딩은 파싱 단계에서 한 번만 (본문 바이트와 인코딩만 넘김)
+    content = resp.body
+    timing["bytes"] = len(content)
+    timing["stopped_early"] = resp.stopped_early
+    encoding, timing["encoding_source"] = choose_encoding(
+        final_url, resp.headers.get('Content-Type', ''), content,
+        apparent=lambda: requests.compat.chardet.detect(content)["encoding"])
+    return _done({"used_url": final_url, "display_date": display_date, "content": content, "encoding": encoding})
+
+def check_single_boat(boat_url: str, year: int, month: int, day: int, debug_enabled: bool = False,
+                      parser_type: str = None) -> Dict:
+    """예약 페이지를 가져와 사이트 어댑터(services/parsers.py)로 파싱.
+    parser_type 은 이전 조회에서 선박을 찾아낸 어댑터 이름 (Boat.parser_type)."""
+    from services.parsers import parse_page, PROBE_BYTES
+
+    fetched = fetch_page(boat_url, year, month, day)
+    if "error" in fetched:
+        return fetched
+    t0 = time.perf_counter()
+    html = decode_body(fetched["content"], fetched["encoding"])
+    decode_ms = (time.perf_counter() - t0) * 1000
+    result = parse_page(html, fetched["used_url"], year, month, day,
+                        debug_enabled=debug_enabled, parser_type=parser_type,
+                        head_bytes=fetched["content"][:PROBE_BYTES])
+    result["timing"] = {**fetched["timing"], **result.get("timing", {}), "decode_ms": decode_ms}
+    return result
 
 # 예시: 조회 함수에서 지역 필터링 적용
 def filter_entries_by_region(entries, selected_regions):
@@ -0,0 +1,164 @@
+"""웹 서버와 별개로 실행하는 조회 워커 / CLI.
+
+DB 에서 배 목록을 읽어 스크랩 엔진(services/scrape_engine.py)으로 날짜 범위를 조회하고,
+결과를 스냅샷 테이블(status_snapshots) 또는 JSON Lines 로 기록하고, SNAPSHOT_PUBLISH_DIR
+(또는 --publish-dir)이 있으면 날짜/지역별 정적 JSON 으로도 게시합니다. 무거운 조회를
+웹 프로세스가 아닌 별도 프로세스/서버에서 주기적으로 돌릴 때 사용합니다.
+
+사용 예 (src 디렉터리에서):
+    python -m services.scrape 2025-11-22
+    python -m services.scrape 2025-11-22 2025-11-24 --regions 보령 태안 --fetch-workers 20
+    python -m services.scrape 2025-11-22 --output jsonl --jsonl results.jsonl
+    python -m services.scrape 2025-11-22 --output both --interval 300   # 5분마다 반복
+    python -m services.scrape 2025-11-22 --publish-dir published --interval 300
+"""
+from datetime import date, datetime, timedelta
+from typing import Dict, Iterable, List
+import argparse
+import json
+import sys
+import time
+
+from services.scrape_engine import scrape_boats, boat_ref, learned_parsers, DEFAULT_PER_HOST_LIMIT
+from services.snapshot_publisher import publish_for_app
+from db import utc_now
+
+# 스냅샷/JSONL 에 남기는 entry 필드 (row_html 은 --with-html 일 때만)
+ENTRY_FIELDS = ('ship_name', 'status', 'available', 'display_status', 'raw_status_text', 'fish')
+
+
+def date_range(start: date, end: date) -> List[date]:
+    days = (end - start).days
+    if days < 0:
+        raise ValueError("종료일이 시작일보다 빠릅니다.")
+    return [start + timedelta(days=i) for i in range(days + 1)]
+
+
+def result_record(boat, check: Dict, query_date: str, scraped_at: datetime, with_html: bool = False) -> Dict:
+    fields = ENTRY_FIELDS + (('row_html',) if with_html else ())
+    return {
+        'date': query_date,
+        'boat_id': boat.id,
+        'registered_name': boat.name,
+        'city': boat.city,
+        'port': boat.port,
+        'url': boat.url,
+        'scraped_at': scraped_at.isoformat(timespec='seconds'),
+        'tide': check.get('tide'),
+        'parser': check.get('parser'),
+        'error': check.get('error'),
+        'entries': [{k: e.get(k) for k in fields} for e in check.get('entries', [])],
+    }
+
+
+def snapshot_row(record: Dict) -> Dict:
+    return {
+        'boat_id': record['boat_id'],
+        'query_date': record['date'],
+        'scraped_at': datetime.fromisoformat(record['scraped_at']),
+        'tide': (record['tide'] or None) and str(record['tide'])[:100],
+        'parser': record['parser'],
+        'error': (record['error'] or None) and str(record['error'])[:500],
+        'entries_json': json.dumps(record['entries'], ensure_ascii=False),
+    }
+
+
+def run_once(app, dates: Iterable[date], regions=None, fetch_workers=None, parse_workers=None,
+             per_host_limit: int = DEFAULT_PER_HOST_LIMIT, output: str = 'db', jsonl=None,
+             with_html: bool = False, log=print) -> int:
+    """날짜별로 조회하여 기록하고 기록한 (배 × 날짜) 수를 반환"""
+    from db import get_boats, save_status_snapshots, update_parser_types
+
+    with app.app_context():
+        boats = [boat_ref(b) for b in get_boats(cities=regions)]
+    debug_enabled = app.config.get('DEBUG_LOGGING_ENABLED', False)
+
+    written = 0
+    for d in dates:
+        t0 = time.perf_counter()
+        results = scrape_boats(boats, d.year, d.month, d.day, debug_enabled=debug_enabled,
+                               max_workers=fetch_workers, parse_workers=parse_workers,
+                               per_host_limit=per_host_limit)
+        scraped_at = utc_now().replace(microsecond=0)
+        records = [result_record(boat, check, d.isoformat(), scraped_at, with_html) for boat, check in results]
+
+        if jsonl is not None:
+            for record in records:
+                jsonl.write(json.dumps(record, ensure_ascii=False) + '\n')
+            jsonl.flush()
+        with app.app_context():
+            if output in ('db', 'both'):
+                save_status_snapshots(snapshot_row(r) for r in records)
+            update_parser_types(learned_parsers(results))
+            # 다음 반복에서는 기억된 어댑터를 바로 사용
+            for boat, check in results:
+                if check.get('parser'):
+                    boat.parser_type = check['parser']
+        publish_for_app(app, results, d.isoformat(), regions, log=log)
+
+        errors = sum(1 for r in records if r['error'])
+        ships = sum(len(r['entries']) for r in records)
+        if log:
+            log(f"{d.isoformat()}: 배 {len(records)}척, 선박 {ships}건, 오류 {errors}건 "
+                f"({time.perf_counter() - t0:.1f}s)")
+        written += len(records)
+    return written
+
+
+def _parse_date(value: str) -> date:
+    try:
+        return datetime.strptime(value, '%Y-%m-%d').date()
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"날짜는 YYYY-MM-DD 형식이어야 합니다: {value}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m services.scrape', description='조회 워커 (웹 서버와 별도 실행)')
+    parser.add_argument('start', type=_parse_date, help='시작일 YYYY-MM-DD')
+    parser.add_argument('end', type=_parse_date, nargs='?', help='종료일 YYYY-MM-DD (기본: 시작일)')
+    parser.add_argument('--regions', nargs='*', default=None, help='조회할 지역 (기본: 전체)')
+    parser.add_argument('--fetch-workers', type=int, default=None, help='페이지 받아오기 스레드 수 (기본: SCRAPE_FETCH_WORKERS)')
+    parser.add_argument('--parse-workers', type=int, default=None,
+                        help='파싱 프로세스 수 (기본: SCRAPE_WORKER_PARSE_WORKERS = CPU 수, 0=스레드에서 파싱)')
+    parser.add_argument('--per-host-limit', type=int, default=DEFAULT_PER_HOST_LIMIT, help='host 별 동시 요청 수')
+    parser.add_argument('--output', choices=('db', 'jsonl', 'both'), default='db', help='결과 기록 위치')
+    parser.add_argument('--jsonl', default='-', help="JSON Lines 파일 경로 ('-' 는 표준출력)")
+    parser.add_argument('--with-html', action='store_true', help='entry 에 row_html 포함')
+    parser.add_argument('--publish-dir', default=None, help='정적 JSON 게시 디렉터리 (기본: SNAPSHOT_PUBLISH_DIR)')
+    parser.add_argument('--interval', type=float, default=0, help='초 단위 반복 주기 (0 이면 한 번만 실행)')
+    args = parser.parse_args(argv)
+
+    dates = date_range(args.start, args.end or args.start)
+    regions = [r for r in (args.regions or []) if r and r != '전체'] or None
+
+    from app import create_app
+    app = create_app()
+    if args.publish_dir:
+        app.config['SNAPSHOT_PUBLISH_DIR'] = args.publish_dir
+    # 워커는 파싱을 프로세스 풀로 넘김 (웹 프로세스 기본값 SCRAPE_PARSE_WORKERS=0 과 별개)
+    parse_workers = args.parse_workers if args.parse_workers is not None else app.config['SCRAPE_WORKER_PARSE_WORKERS']
+
+    jsonl = None
+    if args.output in ('jsonl', 'both'):
+        jsonl = sys.stdout if args.jsonl == '-' else open(args.jsonl, 'a', encoding='utf-8')
+    # JSONL 을 표준출력으로 쓸 때는 진행 로그를 표준에러로
+    log = (lambda msg: print(msg, file=sys.stderr)) if jsonl is sys.stdout else print
+
+    try:
+        while True:
+            run_once(app, dates, regions=regions, fetch_workers=args.fetch_workers,
+                     parse_workers=parse_workers, per_host_limit=args.per_host_limit,
+                     output=args.output, jsonl=jsonl, with_html=args.with_html, log=log)
+            if not args.interval:
+                break
+            time.sleep(args.interval)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        if jsonl is not None and jsonl is not sys.stdout:
+            jsonl.close()
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
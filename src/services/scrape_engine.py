@@ -0,0 +1,374 @@
+"""등록된 배 목록을 병렬로 조회하는 공용 스크랩 엔진.
+
+/status 라우트와 좌석 감시(watcher) 모드가 같은 팬아웃 코드를 사용하도록
+ThreadPoolExecutor 기반 조회와 결과 행 변환을 한 곳에 모아 둡니다.
+
+같은 운영사 사이트(host)를 공유하는 배들은 묶어서 라운드로빈으로 제출합니다. 동시 요청
+수는 전역 한도와 host 별 한도(처음엔 per_host_limit)로 제한하며, 두 한도는 응답 시간과
+실패에 따라 자동으로 늘고 줄어듭니다 (services/concurrency.py).
+
+parse_workers 가 1 이상이면 두 단계로 나뉩니다. 스레드 풀(SCRAPE_FETCH_WORKERS)이 페이지
+본문을 받아 오고, 받은 본문은 바로 프로세스 풀의 파서 워커로 넘겨 파싱합니다. BeautifulSoup
+파싱은 CPU 작업이라 스레드끼리는 GIL 때문에 직렬화되기 때문입니다. 워커와는 본문 바이트와
+entry dict 만 주고받습니다. 조회 워커 CLI(services/scrape.py)는 기본으로 CPU 수만큼
+(SCRAPE_WORKER_PARSE_WORKERS) 파서 프로세스를 쓰고, 웹 프로세스는 기본 0 으로 조회 스레드
+안에서 바로 파싱합니다 (SCRAPE_PARSE_WORKERS 로 켤 수 있음).
+
+여러 요청이 같은 날짜의 같은 배를 동시에 조회하면, 먼저 시작한 조회 하나만 실제로
+실행하고 나머지는 그 결과를 함께 받습니다 (services/singleflight.py).
+"""
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor, as_completed
+from concurrent.futures.process import BrokenProcessPool
+from itertools import zip_longest
+from types import SimpleNamespace
+from typing import Dict, List, Optional, Tuple
+import atexit
+import multiprocessing
+import threading
+import time
+import traceback
+
+from services.reservation_checker import check_single_boat, decode_body, fetch_page, site_info
+from services import hedging
+from services.concurrency import AIMDLimiter, HostLimiters
+from services.host_stats import HOSTS, HostStats, is_host_failure
+from services.scrape_metrics import observe_results
+from services.singleflight import SingleFlight
+
+# 동시에 조회할 배 수 초기값 (전역 한도는 이후 AIMD 로 조절)
+DEFAULT_MAX_WORKERS = 10
+# 한 host 에 동시에 보낼 요청 수 초기값
+DEFAULT_PER_HOST_LIMIT = 2
+# 자동 조절 범위 (전역 / host 별)
+DEFAULT_CONCURRENCY_MIN = 2
+DEFAULT_CONCURRENCY_MAX = 64
+DEFAULT_PER_HOST_MAX = 6
+# 파서 프로세스 수 기본값 (0 = 조회 스레드에서 파싱, 웹 프로세스에서 프로세스 풀을 띄우지 않음)
+DEFAULT_PARSE_WORKERS = 0
+
+# 다른 요청이 먼저 시작한 같은 조회를 기다리는 최대 시간 (초)
+COALESCE_WAIT_SECONDS = 120
+
+_settings = {"fetch_workers": DEFAULT_MAX_WORKERS, "parse_workers": DEFAULT_PARSE_WORKERS, "skip_dead_hosts": False}
+# 요청/스레드 사이에서 공유하는 진행 중 조회 목록과 동시 요청 한도
+FLIGHTS = SingleFlight()
+GLOBAL_LIMIT = AIMDLimiter(DEFAULT_MAX_WORKERS, DEFAULT_CONCURRENCY_MIN, DEFAULT_CONCURRENCY_MAX)
+HOST_LIMITS = HostLimiters(1, DEFAULT_PER_HOST_MAX)
+_parse_pool: Optional[ProcessPoolExecutor] = None
+_parse_pool_size = 0
+_pool_lock = threading.Lock()
+
+
+def init_scrape_engine(app):
+    """app.config 의 SCRAPE_* 설정(스레드/프로세스 수, 죽은 host 생략, 중복 요청)을 기본값으로 사용"""
+    _settings["fetch_workers"] = max(1, int(app.config.get('SCRAPE_FETCH_WORKERS', DEFAULT_MAX_WORKERS)))
+    if app.config.get('SCRAPE_ADAPTIVE_CONCURRENCY', True):
+        GLOBAL_LIMIT.configure(_settings["fetch_workers"],
+                               app.config.get('SCRAPE_CONCURRENCY_MIN', DEFAULT_CONCURRENCY_MIN),
+                               app.config.get('SCRAPE_CONCURRENCY_MAX', DEFAULT_CONCURRENCY_MAX))
+        HOST_LIMITS.max_limit = app.config.get('SCRAPE_PER_HOST_MAX', DEFAULT_PER_HOST_MAX)
+    else:
+        # 고정 한도: 예전처럼 SCRAPE_FETCH_WORKERS / per_host_limit 그대로
+        GLOBAL_LIMIT.configure(_settings["fetch_workers"], _settings["fetch_workers"], _settings["fetch_workers"])
+        HOST_LIMITS.max_limit = None
+    _settings["parse_workers"] = max(0, int(app.config.get('SCRAPE_PARSE_WORKERS', DEFAULT_PARSE_WORKERS)))
+    _settings["skip_dead_hosts"] = bool(app.config.get('SCRAPE_SKIP_DEAD_HOSTS', False))
+    hedging.configure(app.config.get('SCRAPE_HEDGE_ENABLED', False), app.config.get('SCRAPE_HEDGE_BUDGET'))
+
+
+def _get_parse_pool(workers: int) -> ProcessPoolExecutor:
+    """파서 프로세스 풀 (프로세스당 하나, 처음 쓸 때 생성). 스레드가 도는 앱에서 fork 하지 않도록 spawn 사용"""
+    global _parse_pool, _parse_pool_size
+    with _pool_lock:
+        if _parse_pool is None or _parse_pool_size != workers:
+            if _parse_pool is not None:
+                _parse_pool.shutdown(wait=False, cancel_futures=True)
+            _parse_pool = ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context('spawn'))
+            _parse_pool_size = workers
+        return _parse_pool
+
+
+def _reset_parse_pool(broken: ProcessPoolExecutor):
+    global _parse_pool
+    with _pool_lock:
+        if _parse_pool is broken:
+            _parse_pool = None
+
+
+@atexit.register
+def shutdown_parse_pool():
+    global _parse_pool
+    with _pool_lock:
+        if _parse_pool is not None:
+            _parse_pool.shutdown(wait=False, cancel_futures=True)
+            _parse_pool = None
+
+
+def parse_fetched(fetched: Dict, year: int, month: int, day: int,
+                  debug_enabled: bool = False, parser_type: Optional[str] = None) -> Dict:
+    """fetch_page 결과를 파싱 (파서 워커 프로세스에서 실행)"""
+    from services.parsers import parse_page, PROBE_BYTES
+    t0 = time.perf_counter()
+    html = decode_body(fetched["content"], fetched["encoding"])
+    decode_ms = (time.perf_counter() - t0) * 1000
+    result = parse_page(html, fetched["used_url"], year, month, day,
+                        debug_enabled=debug_enabled, parser_type=parser_type,
+                        head_bytes=fetched["content"][:PROBE_BYTES])
+    result["timing"] = {**fetched.get("timing", {}), **result.get("timing", {}), "decode_ms": decode_ms}
+    return result
+
+
+def boat_label(boat) -> str:
+    return getattr(boat, "name", None) or getattr(boat, "registered_name", "unknown")
+
+
+def boat_ref(boat):
+    """DB 세션 밖(백그라운드 스레드)에서 쓸 배 정보 사본"""
+    return SimpleNamespace(id=boat.id, name=boat.name, url=boat.url, city=boat.city, port=boat.port,
+                           host=getattr(boat, "host", None), parser_type=getattr(boat, "parser_type", None))
+
+
+def boat_host(boat) -> str:
+    # 마이그레이션 전 행 등 host 가 비어 있으면 url 에서 계산
+    return getattr(boat, "host", None) or site_info(getattr(boat, "url", "") or "")["host"]
+
+
+def group_by_host(boats) -> "OrderedDict[str, list]":
+    groups: "OrderedDict[str, list]" = OrderedDict()
+    for boat in boats:
+        groups.setdefault(boat_host(boat), []).append(boat)
+    return groups
+
+
+def interleave_by_host(boats, stats: Optional[HostStats] = None) -> list:
+    """host 별로 묶은 뒤 라운드로빈으로 섞어 한 host 의 배가 연달아 제출되지 않도록 함.
+
+    stats 가 있으면 host 순서를 지난 조회 기록으로 정함: 살아 있는 host 중 (예상 응답
+    시간 × 배 수) 가 큰 host 부터, 연속 실패 중인 host 는 맨 뒤.
+    """
+    groups = group_by_host(boats)
+    hosts = list(groups)
+    if stats is not None:
+        now = time.time()
+        hosts.sort(key=lambda h: (stats.is_dead(h, now), -stats.expected_ms(h) * len(groups[h])))
+    return [b for batch in zip_longest(*(groups[h] for h in hosts)) for b in batch if b is not None]
+
+
+def learned_parsers(results) -> Dict[int, str]:
+    """scrape_boats 결과 중 기억된 값과 다른 어댑터로 파싱된 배 {boat_id: parser} (DB 반영용)"""
+    learned = {}
+    for boat, check in results:
+        parser = check.get("parser")
+        boat_id = getattr(boat, "id", None)
+        if parser and boat_id is not None and parser != getattr(boat, "parser_type", None):
+            learned[boat_id] = parser
+    return learned
+
+
+def build_status_rows(boat, check: Dict) -> List[Dict]:
+    """check_single_boat 결과를 /status 화면에서 쓰는 행(dict) 목록으로 변환"""
+    boat_name = boat_label(boat)
+    boat_url = getattr(boat, "url", "")
+    check_source = check.get("source_url") or boat_url or ""
+
+    rows = []
+    for e in check.get("entries", []):
+        full_url = (e.get("used_url") or e.get("source_url") or e.get("url") or check_source or boat_url) or ""
+        url_path = e.get("used_url_path") or e.get("url_path") or full_url
+        rows.append({
+            "registered_name": boat_name,
+            "city": getattr(boat, "city", ""),
+            "port": getattr(boat, "port", ""),
+            "ship_name": e.get("ship_name"),
+            "status": e.get("status"),
+            "available": e.get("available"),
+            "display_status": e.get("display_status"),
+            "raw_status_text": e.get("raw_status_text"),
+            "url": full_url,
+            "url_path": url_path,
+            "fish": e.get("fish"),
+            "row_html": e.get("row_html"),
+            "tide": check.get("tide"),
+        })
+    return rows
+
+
+def _exception_result(boat, e, debug_enabled: bool) -> Dict:
+    if debug_enabled:
+        print(f"Error processing boat {boat_label(boat)}: {e}")
+        print(traceback.format_exc())
+    return {"entries": [], "error": f"exception:{e}"}
+
+
+def scrape_boats(boats, year: int, month: int, day: int,
+                 debug_enabled: bool = False,
+                 max_workers: Optional[int] = None,
+                 per_host_limit: int = DEFAULT_PER_HOST_LIMIT,
+                 parse_workers: Optional[int] = None) -> List[Tuple[object, Dict]]:
+    """배 목록을 병렬 조회하여 (boat, check 결과) 목록을 완료 순서대로 반환.
+
+    max_workers 는 fetch 스레드 수 상한, parse_workers 는 파서 프로세스 수 (None 이면
+    init_scrape_engine 설정값). per_host_limit 는 처음 보는 host 의 동시 요청 한도이며 이후엔
+    자동 조절됩니다. 개별 배에서 예외가 나도 전체 조회는 계속되며,
+    해당 배는 entries가 빈 결과와 error 필드로 채워집니다. 단계별 소요 시간은
+    각 결과의 "timing" 에 남고 services/scrape_metrics 에 누적됩니다.
+    """
+    started = time.perf_counter()
+    results = _scrape(boats, year, month, day, debug_enabled, max_workers, per_host_limit, parse_workers)
+    if results:
+        HOSTS.record_results(results, boat_host)
+        observe_results(results, time.perf_counter() - started)
+    return results
+
+
+def flight_key(boat, year: int, month: int, day: int) -> tuple:
+    return (getattr(boat, "url", "") or "", int(year), int(month), int(day))
+
+
+def check_boat(boat, year: int, month: int, day: int, debug_enabled: bool = False) -> Dict:
+    """배 한 척 조회 (진행 중인 같은 조회가 있으면 새로 받지 않고 그 결과를 함께 받음).
+    scrape_boats 와 같은 host/전역 동시 요청 한도를 거침"""
+    def _call():
+        return _limited(boat, DEFAULT_PER_HOST_LIMIT, lambda: check_single_boat(
+            getattr(boat, "url", ""), year, month, day, debug_enabled=debug_enabled,
+            parser_type=getattr(boat, "parser_type", None)))
+
+    result, shared = FLIGHTS.do(flight_key(boat, year, month, day), _call)
+    return {**result, "coalesced": True} if shared else result
+
+
+def _joined_result(boat, flight, debug_enabled: bool) -> Dict:
+    """다른 요청이 먼저 시작한 같은 (url, 날짜) 조회의 결과를 받아 옴"""
+    try:
+        result = flight.result(timeout=COALESCE_WAIT_SECONDS)
+    except Exception as e:
+        return _exception_result(boat, e, debug_enabled)
+    # 결과 dict 는 요청마다 따로 (timing 은 앞선 조회 것이므로 집계에서 제외되도록 표시)
+    return {**result, "coalesced": True}
+
+
+def _scrape(boats, year: int, month: int, day: int, debug_enabled: bool, max_workers: Optional[int],
+            per_host_limit: int, parse_workers: Optional[int]) -> List[Tuple[object, Dict]]:
+    boats = interleave_by_host(boats, HOSTS)
+    if not boats:
+        return []
+    # 스레드 수는 상한일 뿐이고 실제 동시 요청 수는 GLOBAL_LIMIT / HOST_LIMITS 가 정함
+    fetch_workers = max_workers or int(GLOBAL_LIMIT.max_limit)
+    parse_workers = _settings["parse_workers"] if parse_workers is None else parse_workers
+
+    results = []
+    if _settings["skip_dead_hosts"]:
+        # 연속 실패 중인 host 는 DEAD_RETRY_SECONDS 가 지날 때까지 요청하지 않음
+        down = {h for h in {boat_host(b) for b in boats} if HOSTS.is_dead(h)}
+        results = [(b, {"entries": [], "error": f"host_down:{boat_host(b)}", "skipped": True})
+                   for b in boats if boat_host(b) in down]
+        boats = [b for b in boats if boat_host(b) not in down]
+
+    # 진행 중인 같은 (url, 날짜) 조회가 있으면 새로 받지 않고 그 결과를 기다림
+    leading, joined = [], []
+    for boat in boats:
+        key = flight_key(boat, year, month, day)
+        flight, leader = FLIGHTS.join(key)
+        (leading if leader else joined).append((boat, key, flight))
+    flights = {id(boat): (key, flight) for boat, key, flight in leading}
+
+    def _done(boat, result):
+        results.append((boat, result))
+        FLIGHTS.resolve(*flights[id(boat)], result=result)
+
+    try:
+        if leading:
+            _run(leading, year, month, day, debug_enabled, fetch_workers, per_host_limit, parse_workers, _done)
+    finally:
+        # 예외로 빠져나와도 기다리는 다른 요청이 멈추지 않도록 정리
+        for boat, key, flight in leading:
+            FLIGHTS.resolve(key, flight, exception=RuntimeError("scrape aborted"))
+
+    for boat, _, flight in joined:
+        results.append((boat, _joined_result(boat, flight, debug_enabled)))
+    return results
+
+
+def _limited(boat, per_host_limit: int, call):
+    """host 한도 → 전역 한도 순으로 자리를 잡고 call() 을 실행한 뒤, 결과로 두 한도를 조절.
+
+    host 한도는 그 host 의 실패(403/5xx/연결 실패)와 응답 지연에 반응하고, 전역 한도는 연결
+    실패/타임아웃과 host 평소 응답 시간 대비 지연에만 반응합니다 (한 host 의 403 이나 본문 상한을
+    넘은 too_large 로 전체를 줄이지 않음).
+    """
+    host = boat_host(boat)
+    host_limit = HOST_LIMITS.get(host, max(1, per_host_limit))
+    host_limit.acquire()
+    GLOBAL_LIMIT.acquire()
+    latency_ms, host_failed, net_failed = None, False, False
+    try:
+        result = call()
+        latency_ms = (result.get("timing") or {}).get("fetch_ms")
+        host_failed = is_host_failure(result)
+        net_failed = (result.get("error") or "").startswith("http_error")
+        return result
+    finally:
+        GLOBAL_LIMIT.release(latency_ms, net_failed, baseline_ms=HOSTS.expected_ms(host))
+        host_limit.release(latency_ms, host_failed)
+
+
+def _run(leading, year: int, month: int, day: int, debug_enabled: bool, fetch_workers: int,
+         per_host_limit: int, parse_workers: int, done):
+    boats = [boat for boat, _, _ in leading]
+    workers = max(1, min(fetch_workers, len(boats)))
+
+    if parse_workers <= 0:
+        # 단일 단계: 조회 스레드에서 바로 파싱
+        def _check(boat):
+            try:
+                return _limited(boat, per_host_limit, lambda: check_single_boat(
+                    getattr(boat, "url", ""), year, month, day, debug_enabled=debug_enabled,
+                    parser_type=getattr(boat, "parser_type", None)))
+            except Exception as e:
+                return _exception_result(boat, e, debug_enabled)
+
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            future_to_boat = {executor.submit(_check, boat): boat for boat in boats}
+            for future in as_completed(future_to_boat):
+                done(future_to_boat[future], future.result())
+        return
+
+    def _fetch(boat):
+        return _limited(boat, per_host_limit, lambda: fetch_page(getattr(boat, "url", ""), year, month, day))
+
+    pool = _get_parse_pool(parse_workers)
+    parse_futures = {}
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        fetch_futures = {executor.submit(_fetch, boat): boat for boat in boats}
+        # 본문이 도착하는 대로 파서 워커에 넘겨 조회와 파싱을 겹쳐 실행
+        for future in as_completed(fetch_futures):
+            boat = fetch_futures[future]
+            try:
+                fetched = future.result()
+            except Exception as e:
+                done(boat, _exception_result(boat, e, debug_enabled))
+                continue
+            if "error" in fetched:
+                done(boat, fetched)
+                continue
+            parser_type = getattr(boat, "parser_type", None)
+            try:
+                parse_futures[pool.submit(parse_fetched, fetched, year, month, day, debug_enabled, parser_type)] = \
+                    (boat, fetched, parser_type)
+            except (BrokenProcessPool, RuntimeError):
+                # 풀을 쓸 수 없으면 이 스레드에서 파싱
+                done(boat, parse_fetched(fetched, year, month, day, debug_enabled, parser_type))
+
+    for future in as_completed(parse_futures):
+        boat, fetched, parser_type = parse_futures[future]
+        try:
+            done(boat, future.result())
+        except BrokenProcessPool:
+            _reset_parse_pool(pool)
+            try:
+                done(boat, parse_fetched(fetched, year, month, day, debug_enabled, parser_type))
+            except Exception as e:
+                done(boat, _exception_result(boat, e, debug_enabled))
+        except Exception as e:
+            done(boat, _exception_result(boat, e, debug_enabled))
@@ -0,0 +1,246 @@
+"""조회 단계별 시간 측정 집계와 Prometheus 텍스트 출력.
+
+fetch_page 는 결과의 "timing" 에 시도별(1차, 403 재시도, http 폴백) 소요 시간·상태·
+바이트 수를, parse_page 는 파싱 시간과 시도한 어댑터를 기록합니다. scrape_boats 가
+끝날 때 observe_results() 로 여기 카운터/히스토그램에 누적하고, /metrics 라우트가
+render() 결과를 그대로 내보냅니다. 외부 의존성(prometheus_client) 없이 동작합니다.
+"""
+from typing import Dict, Iterable, List, Tuple
+import threading
+
+# 초 단위 히스토그램 버킷
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30)
+SIZE_BUCKETS = (1024, 8 * 1024, 32 * 1024, 64 * 1024, 128 * 1024, 256 * 1024, 512 * 1024, 1024 * 1024)
+
+
+def _label_str(labelnames, values) -> str:
+    if not labelnames:
+        return ''
+    pairs = []
+    for k, v in zip(labelnames, values):
+        v = str(v).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+        pairs.append(f'{k}="{v}"')
+    return '{' + ','.join(pairs) + '}'
+
+
+def _fmt(value) -> str:
+    if value == float('inf'):
+        return '+Inf'
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class _Metric:
+    kind = ''
+
+    def __init__(self, name: str, help_text: str, labelnames: Tuple[str, ...] = ()):
+        self.name = name
+        self.help = help_text
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+
+    def _key(self, labels: Dict) -> tuple:
+        return tuple(str(labels.get(k, '')) for k in self.labelnames)
+
+    def header(self) -> List[str]:
+        return [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.kind}"]
+
+
+class Counter(_Metric):
+    kind = 'counter'
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._values: Dict[tuple, float] = {}
+
+    def inc(self, amount: float = 1, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def value(self, **labels) -> float:
+        with self._lock:
+            return self._values.get(self._key(labels), 0)
+
+    def render(self) -> List[str]:
+        with self._lock:
+            items = sorted(self._values.items())
+        return self.header() + [f"{self.name}{_label_str(self.labelnames, k)} {_fmt(v)}" for k, v in items]
+
+
+class Gauge(Counter):
+    kind = 'gauge'
+
+    def set(self, value: float, **labels):
+        with self._lock:
+            self._values[self._key(labels)] = value
+
+
+class Histogram(_Metric):
+    kind = 'histogram'
+
+    def __init__(self, name: str, help_text: str, labelnames: Tuple[str, ...] = (), buckets=LATENCY_BUCKETS):
+        super().__init__(name, help_text, labelnames)
+        self.buckets = tuple(buckets)
+        self._series: Dict[tuple, list] = {}  # key -> [bucket counts..., sum, count]
+
+    def observe(self, value: float, **labels):
+        key = self._key(labels)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = [0] * len(self.buckets) + [0.0, 0]
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    series[i] += 1
+            series[-2] += value
+            series[-1] += 1
+
+    def render(self) -> List[str]:
+        with self._lock:
+            items = sorted((k, list(v)) for k, v in self._series.items())
+        lines = self.header()
+        for key, series in items:
+            for bound, count in zip(self.buckets + (float('inf'),), series[:len(self.buckets)] + [series[-1]]):
+                labels = _label_str(self.labelnames + ('le',), key + (_fmt(float(bound)),))
+                lines.append(f"{self.name}_bucket{labels} {count}")
+            base = _label_str(self.labelnames, key)
+            lines.append(f"{self.name}_sum{base} {_fmt(series[-2])}")
+            lines.append(f"{self.name}_count{base} {series[-1]}")
+        return lines
+
+
+class MetricsRegistry:
+    def __init__(self):
+        self._metrics: List[_Metric] = []
+
+    def register(self, metric):
+        self._metrics.append(metric)
+        return metric
+
+    def render(self) -> str:
+        lines = []
+        for metric in self._metrics:
+            lines.extend(metric.render())
+        return '\n'.join(lines) + '\n'
+
+
+REGISTRY = MetricsRegistry()
+
+FETCH_SECONDS = REGISTRY.register(Histogram(
+    'boat_scrape_fetch_seconds', '배 한 척 페이지 받아오기 전체 시간 (재시도 포함)', ('outcome',)))
+FETCH_ATTEMPTS = REGISTRY.register(Counter(
+    'boat_scrape_fetch_attempts_total', 'HTTP 요청 시도 수 (first / alt_ua / http_fallback)', ('kind', 'status')))
+FETCH_TTFB_SECONDS = REGISTRY.register(Histogram(
+    'boat_scrape_fetch_ttfb_seconds', '요청 전송부터 응답 헤더 수신까지 (DNS/연결/TLS/서버 처리 포함)'))
+FETCH_BYTES = REGISTRY.register(Histogram(
+    'boat_scrape_fetch_bytes', '받아온 응답 본문 크기', buckets=SIZE_BUCKETS))
+FETCH_STOPPED_EARLY = REGISTRY.register(Counter(
+    'boat_scrape_fetch_stopped_early_total', '대상 날짜 블록이 닫혀 본문 나머지를 받지 않은 응답 수'))
+ENCODINGS = REGISTRY.register(Counter(
+    'boat_scrape_encoding_total', '응답 인코딩 결정 출처 (header / meta / host_cache / detected)', ('source',)))
+PARSE_SECONDS = REGISTRY.register(Histogram(
+    'boat_scrape_parse_seconds', '페이지 파싱 시간', ('parser',)))
+PARSERS_TRIED = REGISTRY.register(Counter(
+    'boat_scrape_parsers_tried_total', '파싱에 시도한 어댑터 수 (폴백 스캔 포함)', ('parser',)))
+ENTRIES = REGISTRY.register(Counter(
+    'boat_scrape_entries_total', '추출한 선박 entry 수', ('parser',)))
+BOATS = REGISTRY.register(Counter(
+    'boat_scrape_boats_total', '조회한 배 수', ('outcome',)))
+COALESCED = REGISTRY.register(Counter(
+    'boat_scrape_coalesced_total', '진행 중인 같은 조회 결과를 함께 받아 요청을 생략한 배 수'))
+HEDGES = REGISTRY.register(Counter(
+    'boat_scrape_hedges_total', '느린 첫 요청에 보낸 중복 요청 (won / lost / failed / no_budget)', ('result',)))
+CONCURRENCY_LIMIT = REGISTRY.register(Gauge(
+    'boat_scrape_concurrency_limit', '현재 동시 요청 한도 (AIMD 자동 조절, scope=global|host)', ('scope', 'host')))
+HOST_LATENCY_SECONDS = REGISTRY.register(Gauge(
+    'boat_scrape_host_latency_seconds', 'host 별 페이지 받아오기 시간 지수 이동 평균', ('host',)))
+HOST_FAILURE_RATIO = REGISTRY.register(Gauge(
+    'boat_scrape_host_failure_ratio', 'host 별 누적 실패 비율 (연결 실패, 5xx, 403)', ('host',)))
+HOST_DOWN = REGISTRY.register(Gauge(
+    'boat_scrape_host_down', '연속 실패로 맨 뒤로 미루거나 생략 중인 host (1)', ('host',)))
+SCRAPE_SECONDS = REGISTRY.register(Histogram(
+    'boat_scrape_batch_seconds', 'scrape_boats 한 번(배 목록 전체) 소요 시간'))
+
+
+def outcome_of(check: Dict) -> str:
+    error = check.get('error') or ''
+    if not error:
+        return 'ok'
+    return error.split(':', 1)[0] or 'error'
+
+
+def observe_check(check: Dict):
+    """배 한 척의 조회 결과(timing 포함)를 누적"""
+    timing = check.get('timing') or {}
+    outcome = outcome_of(check)
+    BOATS.inc(outcome=outcome)
+    if check.get('coalesced'):
+        # timing 은 먼저 시작한 조회에서 이미 집계됨
+        COALESCED.inc()
+        return
+    if 'fetch_ms' in timing:
+        FETCH_SECONDS.observe(timing['fetch_ms'] / 1000.0, outcome=outcome)
+    for attempt in timing.get('attempts', []):
+        FETCH_ATTEMPTS.inc(kind=attempt.get('kind'), status=attempt.get('status') or attempt.get('error') or 'error')
+        if attempt.get('ttfb_ms') is not None:
+            FETCH_TTFB_SECONDS.observe(attempt['ttfb_ms'] / 1000.0)
+    if timing.get('bytes'):
+        FETCH_BYTES.observe(timing['bytes'])
+    if timing.get('stopped_early'):
+        FETCH_STOPPED_EARLY.inc()
+    if timing.get('encoding_source'):
+        ENCODINGS.inc(source=timing['encoding_source'])
+    if 'parse_ms' in timing:
+        parser = check.get('parser') or 'none'
+        PARSE_SECONDS.observe(timing['parse_ms'] / 1000.0, parser=parser)
+        for name in timing.get('parsers_tried', []):
+            PARSERS_TRIED.inc(parser=name)
+        ENTRIES.inc(len(check.get('entries', [])), parser=parser)
+
+
+def observe_results(results: Iterable, elapsed_seconds: float = None):
+    for _, check in results:
+        observe_check(check)
+    if elapsed_seconds is not None:
+        SCRAPE_SECONDS.observe(elapsed_seconds)
+
+
+def summarize_results(results) -> Dict:
+    """요청 하나에서 조회한 결과의 단계별 합계/최댓값"""
+    summary = {'boats': 0, 'errors': 0, 'coalesced': 0, 'attempts': 0, 'bytes': 0,
+               'fetch_ms_sum': 0.0, 'fetch_ms_max': 0.0, 'parse_ms_sum': 0.0, 'parse_ms_max': 0.0,
+               'entries': 0, 'parsers': {}}
+    for _, check in results:
+        timing = check.get('timing') or {}
+        summary['boats'] += 1
+        summary['errors'] += 1 if check.get('error') else 0
+        summary['entries'] += len(check.get('entries', []))
+        if check.get('coalesced'):
+            summary['coalesced'] += 1
+            continue
+        summary['attempts'] += len(timing.get('attempts', []))
+        summary['bytes'] += timing.get('bytes') or 0
+        fetch_ms = timing.get('fetch_ms') or 0.0
+        parse_ms = timing.get('parse_ms') or 0.0
+        summary['fetch_ms_sum'] += fetch_ms
+        summary['fetch_ms_max'] = max(summary['fetch_ms_max'], fetch_ms)
+        summary['parse_ms_sum'] += parse_ms
+        summary['parse_ms_max'] = max(summary['parse_ms_max'], parse_ms)
+        parser = check.get('parser')
+        if parser:
+            summary['parsers'][parser] = summary['parsers'].get(parser, 0) + 1
+    return summary
+
+
+def server_timing_header(summary: Dict, total_ms: float = None) -> str:
+    """Server-Timing 헤더 값. 브라우저 개발자 도구 Timing 탭에서 확인 가능"""
+    parts = [
+        f'fetch;dur={summary["fetch_ms_max"]:.1f};desc="slowest fetch (sum {summary["fetch_ms_sum"]:.0f}ms, '
+        f'{summary["attempts"]} attempts, {summary["bytes"]} bytes)"',
+        f'parse;dur={summary["parse_ms_max"]:.1f};desc="slowest parse (sum {summary["parse_ms_sum"]:.0f}ms)"',
+        f'boats;desc="{summary["boats"]} boats, {summary["errors"]} errors, {summary["coalesced"]} coalesced, '
+        f'{summary["entries"]} entries"',
+    ]
+    if total_ms is not None:
+        parts.append(f'total;dur={total_ms:.1f}')
+    return ', '.join(parts)
@@ -0,0 +1,239 @@
+"""좌석 변화 감지(watcher) 모듈.
+
+배/날짜별로 마지막으로 본 (ship_name, status, available)을 기억해 두고,
+새 check_single_boat 결과와 비교하여 변화분(열림/잔여석 변경/마감)만
+싱크(sink)로 내보냅니다. 싱크는 emit(events)만 구현하면 되므로
+로그, 웹훅, 앱 내부 큐 등을 자유롭게 조합할 수 있습니다.
+"""
+from collections import deque
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional, Tuple
+import logging
+import threading
+
+import requests
+
+from services.scrape_engine import scrape_boats
+
+logger = logging.getLogger(__name__)
+
+EVENT_OPENED = 'opened'
+EVENT_SEATS_CHANGED = 'seats_changed'
+EVENT_CLOSED = 'closed'
+
+
+def _is_open(status, available) -> bool:
+    return status == 'open' and (available or 0) > 0
+
+
+def _boat_key(boat):
+    # DB id가 있으면 id, 없으면 URL로 배를 구분
+    return getattr(boat, 'id', None) or getattr(boat, 'url', None)
+
+
+def _snapshot(check: Dict) -> Dict[str, tuple]:
+    """check 결과를 {ship_name: (status, available)} 형태로 축약"""
+    ships = {}
+    for e in check.get('entries', []):
+        name = e.get('ship_name')
+        if name:
+            ships[name] = (e.get('status'), e.get('available'))
+    return ships
+
+
+class LogSink:
+    """변화 이벤트를 logging 으로 출력"""
+
+    def __init__(self, log: Optional[logging.Logger] = None):
+        self.log = log or logger
+
+    def emit(self, events: List[Dict]):
+        for ev in events:
+            self.log.info("seat %s: %s %s %s (%s -> %s)", ev['type'], ev['date'], ev['registered_name'],
+                          ev['ship_name'], ev['prev_available'], ev['available'])
+
+
+class WebhookSink:
+    """변화 이벤트를 JSON 으로 외부 URL 에 POST (요청 스레드를 막지 않도록 별도 스레드에서 전송)"""
+
+    def __init__(self, url: str, timeout: float = 5):
+        self.url = url
+        self.timeout = timeout
+
+    def _post(self, events: List[Dict]):
+        try:
+            requests.post(self.url, json={'events': events}, timeout=self.timeout)
+        except requests.RequestException as e:
+            logger.warning("seat webhook 전송 실패: %s", e)
+
+    def emit(self, events: List[Dict]):
+        threading.Thread(target=self._post, args=(list(events),), daemon=True).start()
+
+
+class QueueSink:
+    """앱 내부 이벤트 버퍼. 최근 maxlen 개의 이벤트를 일련번호와 함께 유지합니다.
+
+    여러 클라이언트가 각자 커서로 읽을 수 있도록 since() 는 이벤트를 지우지 않습니다
+    (오래된 이벤트는 maxlen 을 넘으면 밀려남). drain() 은 단일 소비자용으로 꺼내 갑니다.
+    """
+
+    def __init__(self, maxlen: int = 1000):
+        self._queue = deque(maxlen=maxlen)
+        self._seq = 0
+        self._lock = threading.Lock()
+
+    def emit(self, events: List[Dict]):
+        with self._lock:
+            for event in events:
+                self._seq += 1
+                self._queue.append((self._seq, event))
+
+    def since(self, cursor: int = 0, limit: Optional[int] = None) -> Tuple[List[Dict], int]:
+        """일련번호가 cursor 보다 큰 이벤트와 다음 요청에 쓸 커서를 반환"""
+        with self._lock:
+            items = [(seq, event) for seq, event in self._queue if seq > cursor]
+            last = self._seq
+        if limit is not None:
+            items = items[:limit]
+        # 새 이벤트가 없으면 현재 마지막 번호 (서버 재시작으로 커서가 앞서 있어도 맞춰짐)
+        next_cursor = items[-1][0] if items else last
+        return [dict(event, seq=seq) for seq, event in items], next_cursor
+
+    def drain(self, limit: Optional[int] = None) -> List[Dict]:
+        out = []
+        with self._lock:
+            while self._queue and (limit is None or len(out) < limit):
+                out.append(self._queue.popleft()[1])
+        return out
+
+
+class SeatWatcher:
+    """배/날짜별 마지막 상태를 기억하고 변화분만 싱크로 내보내는 감시기.
+
+    처음 보는 (배, 날짜)는 기준 상태로만 기록하고 이벤트를 만들지 않습니다
+    (emit_initial=True 이면 처음부터 열려 있는 배도 opened 로 알림).
+    조회 오류가 난 결과는 무시하여 일시적인 실패가 '마감'으로 보이지 않게 합니다.
+    """
+
+    def __init__(self, sinks: Optional[Iterable] = None, emit_initial: bool = False):
+        self.sinks = list(sinks or [])
+        self.emit_initial = emit_initial
+        # init_seat_watcher 가 연결하는 앱 내부 큐 (없으면 None)
+        self.queue: Optional[QueueSink] = None
+        self._state: Dict[tuple, Dict[str, tuple]] = {}
+        self._lock = threading.Lock()
+
+    def add_sink(self, sink):
+        self.sinks.append(sink)
+
+    def remove_sink(self, sink):
+        if sink in self.sinks:
+            self.sinks.remove(sink)
+
+    def diff(self, boat, date_str: str, check: Dict) -> List[Dict]:
+        """상태를 갱신하고 이전 상태 대비 변화 이벤트 목록을 반환"""
+        if check.get('error'):
+            return []
+
+        key = (_boat_key(boat), date_str)
+        current = _snapshot(check)
+        with self._lock:
+            previous = self._state.get(key)
+            self._state[key] = current
+
+        if previous is None:
+            if not self.emit_initial:
+                return []
+            previous = {}
+        if previous == current:
+            return []
+
+        events = []
+        for ship_name in current.keys() | previous.keys():
+            prev_status, prev_avail = previous.get(ship_name, (None, None))
+            status, avail = current.get(ship_name, (None, None))
+            was_open = _is_open(prev_status, prev_avail)
+            now_open = _is_open(status, avail)
+
+            if now_open and not was_open:
+                kind = EVENT_OPENED
+            elif was_open and not now_open:
+                kind = EVENT_CLOSED
+            elif now_open and prev_avail != avail:
+                kind = EVENT_SEATS_CHANGED
+            else:
+                continue
+
+            events.append({
+                'type': kind,
+                'date': date_str,
+                'boat_id': getattr(boat, 'id', None),
+                'registered_name': getattr(boat, 'name', None),
+                'city': getattr(boat, 'city', None),
+                'port': getattr(boat, 'port', None),
+                'url': check.get('source_url') or getattr(boat, 'url', None),
+                'ship_name': ship_name,
+                'status': status,
+                'available': avail,
+                'prev_status': prev_status,
+                'prev_available': prev_avail,
+                'detected_at': datetime.now().isoformat(timespec='seconds'),
+            })
+        return events
+
+    def emit(self, events: List[Dict]):
+        if not events:
+            return
+        for sink in list(self.sinks):
+            try:
+                sink.emit(events)
+            except Exception as e:
+                logger.warning("seat sink %r 실패: %s", sink, e)
+
+    def observe(self, boat, date_str: str, check: Dict) -> List[Dict]:
+        events = self.diff(boat, date_str, check)
+        self.emit(events)
+        return events
+
+    def observe_many(self, results, date_str: str) -> List[Dict]:
+        """scrape_boats 결과 [(boat, check), ...]를 한 번에 반영하고 이벤트를 모아서 내보냄"""
+        events = []
+        for boat, check in results:
+            events.extend(self.diff(boat, date_str, check))
+        self.emit(events)
+        return events
+
+    def poll(self, boats, year: int, month: int, day: int,
+             debug_enabled: bool = False, max_workers: Optional[int] = None) -> List[Dict]:
+        """배 목록을 한 번 조회하고 변화 이벤트를 반환"""
+        date_str = f"{year:04d}-{month:02d}-{day:02d}"
+        results = scrape_boats(boats, year, month, day, debug_enabled=debug_enabled, max_workers=max_workers)
+        return self.observe_many(results, date_str)
+
+    def watch(self, load_boats, dates, interval: float = 60,
+              stop_event: Optional[threading.Event] = None, **poll_kwargs):
+        """stop_event 가 설정될 때까지 interval 초마다 dates 를 반복 조회.
+
+        load_boats: 매 주기마다 조회 대상 배 목록을 돌려주는 callable
+        dates: (year, month, day) 튜플 목록
+        """
+        stop_event = stop_event or threading.Event()
+        while not stop_event.is_set():
+            boats = list(load_boats())
+            for (year, month, day) in dates:
+                self.poll(boats, year, month, day, **poll_kwargs)
+            stop_event.wait(interval)
+
+
+def init_seat_watcher(app) -> SeatWatcher:
+    """앱 설정에 따라 SeatWatcher 를 만들고 app.extensions['seat_watcher'] 에 등록"""
+    queue_sink = QueueSink(maxlen=app.config.get('SEAT_WATCH_QUEUE_SIZE', 1000))
+    sinks = [LogSink(app.logger), queue_sink]
+    webhook_url = app.config.get('SEAT_WATCH_WEBHOOK_URL')
+    if webhook_url:
+        sinks.append(WebhookSink(webhook_url))
+
+    watcher = SeatWatcher(sinks)
+    watcher.queue = queue_sink
+    app.extensions['seat_watcher'] = watcher
+    return watcher
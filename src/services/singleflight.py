@@ -0,0 +1,54 @@
+"""진행 중인 같은 작업 합치기 (single-flight).
+
+같은 날짜/지역의 /status 를 여러 사용자가 거의 동시에 열면, 배마다 같은 페이지를
+여러 번 받아 오게 됩니다. SingleFlight 는 key 별로 진행 중인 작업을 Future 로 기록해
+두고, 같은 key 로 들어온 호출은 새로 실행하지 않고 그 Future 의 결과를 함께 받게 합니다.
+작업이 끝나면 key 는 바로 지워지므로 결과를 캐시하지는 않습니다.
+"""
+from concurrent.futures import Future
+from typing import Callable, Dict, Hashable, Tuple
+import threading
+
+
+class SingleFlight:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._flights: Dict[Hashable, Future] = {}
+
+    def join(self, key: Hashable) -> Tuple[Future, bool]:
+        """(Future, leader 여부). leader 면 작업을 실행하고 resolve() 를 반드시 호출해야 함"""
+        with self._lock:
+            flight = self._flights.get(key)
+            if flight is not None:
+                return flight, False
+            flight = self._flights[key] = Future()
+            return flight, True
+
+    def resolve(self, key: Hashable, flight: Future, result=None, exception: BaseException = None):
+        """leader 의 결과를 기다리던 호출들에 전달하고 key 를 지움 (이미 끝났으면 무시)"""
+        with self._lock:
+            if self._flights.get(key) is flight:
+                del self._flights[key]
+        if flight.done():
+            return
+        if exception is not None:
+            flight.set_exception(exception)
+        else:
+            flight.set_result(result)
+
+    def do(self, key: Hashable, fn: Callable, *args, **kwargs):
+        """fn 을 실행하거나 진행 중인 같은 key 의 결과를 기다림. (결과, 합쳐졌는지) 반환"""
+        flight, leader = self.join(key)
+        if not leader:
+            return flight.result(), True
+        try:
+            result = fn(*args, **kwargs)
+        except BaseException as e:
+            self.resolve(key, flight, exception=e)
+            raise
+        self.resolve(key, flight, result)
+        return result, False
+
+    def in_flight(self) -> int:
+        with self._lock:
+            return len(self._flights)
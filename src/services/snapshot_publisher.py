@@ -0,0 +1,139 @@
+"""조회 결과를 정적 JSON 파일로 게시.
+
+대부분의 읽기 요청은 "D 날짜, R 지역의 예약 현황" 입니다. 백그라운드 조회(services/scrape.py
+워커, 실시간 폴링)가 끝날 때마다 결과를 날짜/지역별 JSON 파일로 미리 만들어 두면 리버스
+프록시(nginx 등)나 /snapshots 라우트가 파일을 그대로 내보내고, status.html 은 조회를 실행하지
+않고 이 파일을 읽습니다.
+
+    {SNAPSHOT_PUBLISH_DIR}/2025-11-22/전체.json      (전체 배를 조회했을 때만)
+    {SNAPSHOT_PUBLISH_DIR}/2025-11-22/보령.json
+    {SNAPSHOT_PUBLISH_DIR}/2025-11-22/보령.json.gz   (SNAPSHOT_FORMATS 에 gzip)
+    {SNAPSHOT_PUBLISH_DIR}/2025-11-22/보령.json.br   (br, brotli 패키지가 있을 때)
+
+파일은 같은 디렉터리의 임시 파일에 쓴 뒤 os.replace 로 바꿔 넣으므로 읽는 쪽은 항상 완성된
+파일만 봅니다. nginx 예: location /snapshots/ { alias .../published/; gzip_static on; }
+"""
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional, Tuple
+import gzip
+import json
+import os
+import tempfile
+
+from db import utc_now
+from services.scrape_engine import build_status_rows
+
+try:
+    import brotli
+except ImportError:  # 선택 의존성: 없으면 .br 파일은 만들지 않음
+    brotli = None
+
+ALL_REGIONS = '전체'
+# 압축 형식 → 파일 확장자
+FORMAT_SUFFIXES = {'gzip': '.gz', 'br': '.br'}
+
+
+def is_safe_region(region: str) -> bool:
+    """파일 이름으로 쓸 수 있는 지역 이름 (경로 구분자, '.' 으로 시작하는 이름 거부)"""
+    return bool(region) and '/' not in region and '\\' not in region and not region.startswith('.')
+
+
+def snapshot_path(out_dir: str, date_str: str, region: str, fmt: Optional[str] = None) -> str:
+    if not is_safe_region(region) or not is_safe_region(date_str):
+        raise ValueError(f"스냅샷 경로로 쓸 수 없는 이름: {date_str}/{region}")
+    return os.path.join(out_dir, date_str, f"{region}.json{FORMAT_SUFFIXES.get(fmt, '')}")
+
+
+def _compress(data: bytes, fmt: str) -> Optional[bytes]:
+    if fmt == 'gzip':
+        return gzip.compress(data, compresslevel=9, mtime=0)
+    if fmt == 'br' and brotli is not None:
+        return brotli.compress(data)
+    return None
+
+
+def write_atomic(path: str, data: bytes):
+    """같은 디렉터리의 임시 파일에 쓰고 rename (도중에 읽어도 이전 파일 또는 새 파일 전체)"""
+    directory = os.path.dirname(path)
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=directory, prefix='.tmp-', suffix='.json')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data)
+        os.replace(tmp, path)
+    except BaseException:
+        if os.path.exists(tmp):
+            os.unlink(tmp)
+        raise
+
+
+def snapshot_rows(results: Iterable[Tuple[object, Dict]]) -> Dict[str, List[Dict]]:
+    """(boat, check) 목록 → 지역별 /status 행 목록 (예약가능 먼저, row_html 제외)"""
+    by_region: Dict[str, List[Dict]] = {}
+    for boat, check in results:
+        by_region.setdefault(getattr(boat, 'city', '') or '', [])
+        for row in build_status_rows(boat, check):
+            row.pop('row_html', None)
+            by_region.setdefault(row['city'] or '', []).append(row)
+    for rows in by_region.values():
+        rows.sort(key=lambda r: r.get('status') != 'open')
+    return by_region
+
+
+def publish(results: Iterable[Tuple[object, Dict]], date_str: str, out_dir: str,
+            formats: Iterable[str] = ('gzip',), regions: Optional[Iterable[str]] = None,
+            generated_at: datetime = None, known_regions: Optional[Iterable[str]] = None) -> List[str]:
+    """지역별(과 전체) 파일을 쓰고 쓴 파일 경로 목록을 반환.
+
+    regions 는 이번에 조회한 지역 (None 이면 전체 조회). 조회했지만 결과 행이 없는 지역(배가 없거나
+    모두 비어 있음)도 빈 파일을 써서 이전 결과가 남지 않게 하고, 일부 지역만 조회했으면 전체 파일은
+    건드리지 않습니다. known_regions(등록된 배의 지역)를 주면 결과 행이 없는 요청 지역 중 그 안에
+    있는 것만 파일로 씁니다. 경로로 쓸 수 없는 이름은 항상 건너뜀.
+    """
+    generated_at = generated_at or utc_now().replace(microsecond=0)
+    by_region = snapshot_rows(results)
+    requested = set(regions or ())
+    if known_regions is not None:
+        requested &= set(known_regions)
+    targets = {r: by_region.get(r, []) for r in requested}
+    targets.update(by_region)
+    if regions is None:
+        targets[ALL_REGIONS] = sorted((row for rows in by_region.values() for row in rows),
+                                      key=lambda r: r.get('status') != 'open')
+
+    written = []
+    for region, rows in targets.items():
+        if not is_safe_region(region):
+            continue
+        body = json.dumps({
+            'date': date_str,
+            'region': region,
+            'generated_at': generated_at.isoformat() + 'Z',
+            'count': len(rows),
+            'rows': rows,
+        }, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+        path = snapshot_path(out_dir, date_str, region)
+        write_atomic(path, body)
+        written.append(path)
+        for fmt in formats:
+            compressed = _compress(body, fmt)
+            if compressed is not None:
+                write_atomic(path + FORMAT_SUFFIXES[fmt], compressed)
+                written.append(path + FORMAT_SUFFIXES[fmt])
+    return written
+
+
+def publish_for_app(app, results, date_str: str, regions=None, log=None) -> List[str]:
+    """SNAPSHOT_PUBLISH_DIR 이 설정돼 있으면 게시 (실패는 로그만 남기고 조회 흐름은 계속)"""
+    out_dir = app.config.get('SNAPSHOT_PUBLISH_DIR')
+    if not out_dir:
+        return []
+    try:
+        from db import count_boats_by_city
+        with app.app_context():
+            known_regions = list(count_boats_by_city())
+        return publish(results, date_str, out_dir, formats=app.config.get('SNAPSHOT_FORMATS', ('gzip',)),
+                       regions=None if regions is None else list(regions), known_regions=known_regions)
+    except (OSError, ValueError) as e:
+        (log or app.logger.warning)(f"스냅샷 게시 실패 ({date_str}): {e}")
+        return []
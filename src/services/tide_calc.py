@@ -0,0 +1,189 @@
+"""물때와 일출/일몰을 네트워크 없이 계산.
+
+물때는 음력 날짜로 정해지고, 음력 날짜는 삭(새달) 시각으로 정해집니다. 삭 시각은 Meeus
+"Astronomical Algorithms" 49장의 식으로 계산하고(오차 수 분), 한국 표준시(KST) 기준으로
+삭이 든 날을 음력 1일로 봅니다. 물때 표기는 서해안 7물때식, 남해안 8물때식을 따릅니다.
+
+- 7물때식: 음력 1·16일 = 7물, 8·23일 = 조금, 9·24일 = 무시, 10·25일 = 1물
+- 8물때식: 음력 1·16일 = 8물, 8·23일 = 조금, 9·24일 = 1물
+
+일출/일몰은 NOAA 태양 위치 계산식(대기 굴절 포함 천정각 90.833°)으로 구하며 분 단위로
+맞습니다. 삭 날짜 표는 TABLE_YEARS 범위를 처음 쓸 때 한 번 계산해 둡니다.
+"""
+from bisect import bisect_right
+from datetime import date, datetime, timedelta
+from functools import lru_cache
+from typing import Dict, List, Optional, Tuple
+import math
+
+KST = timedelta(hours=9)
+# 역학시(TT) - 세계시(UT). 2020년대 약 69초
+DELTA_T_SECONDS = 69.0
+# 미리 계산해 두는 삭 날짜 범위
+TABLE_YEARS = (2000, 2050)
+
+SCHEME_WEST = 7    # 서해안 7물때식
+SCHEME_SOUTH = 8   # 남해안 8물때식
+# 이 위도보다 남쪽 항구는 남해안(8물때식)으로 봄 (여수·고흥 등)
+SOUTH_COAST_MAX_LAT = 35.0
+
+_LABELS = {
+    SCHEME_WEST: [f"{n}물" for n in range(1, 14)] + ["조금", "무시"],
+    SCHEME_SOUTH: [f"{n}물" for n in range(1, 15)] + ["조금"],
+}
+# 각 물때식에서 '1물' 이 되는 음력 날짜
+_FIRST_MUL_DAY = {SCHEME_WEST: 10, SCHEME_SOUTH: 9}
+
+# Meeus 49장 삭 보정항: (계수, E 차수, M' 배수, M 배수, F 배수, Ω 배수)
+_NEW_MOON_TERMS = (
+    (-0.40720, 0, 1, 0, 0, 0), (0.17241, 1, 0, 1, 0, 0), (0.01608, 0, 2, 0, 0, 0),
+    (0.01039, 0, 0, 0, 2, 0), (0.00739, 1, 1, -1, 0, 0), (-0.00514, 1, 1, 1, 0, 0),
+    (0.00208, 2, 0, 2, 0, 0), (-0.00111, 0, 1, 0, -2, 0), (-0.00057, 0, 1, 0, 2, 0),
+    (0.00056, 1, 2, 1, 0, 0), (-0.00042, 0, 3, 0, 0, 0), (0.00042, 1, 0, 1, 2, 0),
+    (0.00038, 1, 0, 1, -2, 0), (-0.00024, 1, 2, -1, 0, 0), (-0.00017, 0, 0, 0, 0, 1),
+    (-0.00007, 0, 1, 2, 0, 0), (0.00004, 0, 2, 0, -2, 0), (0.00004, 0, 0, 3, 0, 0),
+    (0.00003, 0, 1, 1, -2, 0), (0.00003, 0, 2, 0, 2, 0), (-0.00003, 0, 1, 1, 2, 0),
+    (0.00003, 0, 1, -1, 2, 0), (-0.00002, 0, 1, -1, -2, 0), (-0.00002, 0, 3, 1, 0, 0),
+    (0.00002, 0, 4, 0, 0, 0),
+)
+# 행성 섭동항: (계수, 상수, k 계수)
+_PLANETARY_TERMS = (
+    (0.000325, 299.77, 0.107408), (0.000165, 251.88, 0.016321), (0.000164, 251.83, 26.651886),
+    (0.000126, 349.42, 36.412478), (0.000110, 84.66, 18.206239), (0.000062, 141.74, 53.303771),
+    (0.000060, 207.14, 2.453732), (0.000056, 154.84, 7.306860), (0.000047, 34.52, 27.261239),
+    (0.000042, 207.19, 0.121824), (0.000040, 291.34, 1.844379), (0.000037, 161.72, 24.198154),
+    (0.000035, 239.56, 25.513099), (0.000023, 331.55, 3.592518),
+)
+
+
+def _sin_deg(x: float) -> float:
+    return math.sin(math.radians(x))
+
+
+def new_moon_jde(k: int) -> float:
+    """k 번째 삭(2000년 1월 6일 삭이 k=0)의 역학시 율리우스일"""
+    t = k / 1236.85
+    jde = (2451550.09766 + 29.530588861 * k + 0.00015437 * t ** 2
+           - 0.000000150 * t ** 3 + 0.00000000073 * t ** 4)
+    e = 1 - 0.002516 * t - 0.0000074 * t ** 2
+    m = 2.5534 + 29.10535670 * k - 0.0000014 * t ** 2 - 0.00000011 * t ** 3
+    mp = 201.5643 + 385.81693528 * k + 0.0107582 * t ** 2 + 0.00001238 * t ** 3 - 0.000000058 * t ** 4
+    f = 160.7108 + 390.67050284 * k - 0.0016118 * t ** 2 - 0.00000227 * t ** 3 + 0.000000011 * t ** 4
+    omega = 124.7746 - 1.56375588 * k + 0.0020672 * t ** 2 + 0.00000215 * t ** 3
+
+    for coef, e_pow, a_mp, a_m, a_f, a_om in _NEW_MOON_TERMS:
+        jde += coef * e ** e_pow * _sin_deg(a_mp * mp + a_m * m + a_f * f + a_om * omega)
+    for coef, base, per_k in _PLANETARY_TERMS:
+        angle = base + per_k * k
+        if base == 299.77:
+            angle -= 0.009173 * t ** 2
+        jde += coef * _sin_deg(angle)
+    return jde
+
+
+def jd_to_datetime(jd: float) -> datetime:
+    """율리우스일 → UTC datetime (naive)"""
+    return datetime(2000, 1, 1, 12) + timedelta(days=jd - 2451545.0)
+
+
+def new_moon_utc(k: int) -> datetime:
+    return jd_to_datetime(new_moon_jde(k)) - timedelta(seconds=DELTA_T_SECONDS)
+
+
+@lru_cache(maxsize=None)
+def _new_moon_table(first_year: int, last_year: int) -> Tuple[date, ...]:
+    """first_year-1 년 12월부터 last_year 년 말까지 삭이 든 KST 날짜 (오름차순)"""
+    k = math.floor((first_year - 1 - 2000) * 12.3685)
+    days = []
+    while True:
+        d = (new_moon_utc(k) + KST).date()
+        if d.year > last_year:
+            return tuple(days)
+        if d.year >= first_year - 1:
+            days.append(d)
+        k += 1
+
+
+def new_moon_dates(year: int) -> List[date]:
+    """해당 연도의 삭 날짜 (KST)"""
+    return [d for d in _table_for(year) if d.year == year]
+
+
+def _table_for(year: int) -> Tuple[date, ...]:
+    if TABLE_YEARS[0] <= year <= TABLE_YEARS[1]:
+        return _new_moon_table(*TABLE_YEARS)
+    return _new_moon_table(year, year + 1)
+
+
+def lunar_day(d: date) -> int:
+    """음력 날짜(1~30). 삭이 든 날이 1일"""
+    table = _table_for(d.year)
+    i = bisect_right(table, d) - 1
+    return (d - table[i]).days + 1
+
+
+def scheme_for(lat: Optional[float]) -> int:
+    """항구 위도로 물때식 결정 (남해안 8물때식, 그 외 서해안 7물때식)"""
+    return SCHEME_SOUTH if lat is not None and lat < SOUTH_COAST_MAX_LAT else SCHEME_WEST
+
+
+def tide_phase(d: date, scheme: int = SCHEME_WEST) -> str:
+    """물때 이름 ('9물', '조금', '무시' 등)"""
+    labels = _LABELS[scheme]
+    return labels[(lunar_day(d) - _FIRST_MUL_DAY[scheme]) % len(labels)]
+
+
+def _sun_event_minutes(d: date, lat: float, lon: float) -> Tuple[Optional[float], Optional[float]]:
+    """NOAA 식으로 일출/일몰 시각 (UTC 0시 기준 분). 극야/백야면 None"""
+    jd = date(d.year, d.month, d.day).toordinal() + 1721424.5 + 0.5 - lon / 360.0
+    t = (jd - 2451545.0) / 36525.0
+    l0 = (280.46646 + t * (36000.76983 + 0.0003032 * t)) % 360
+    m = 357.52911 + t * (35999.05029 - 0.0001537 * t)
+    ecc = 0.016708634 - t * (0.000042037 + 0.0000001267 * t)
+    c = (_sin_deg(m) * (1.914602 - t * (0.004817 + 0.000014 * t))
+         + _sin_deg(2 * m) * (0.019993 - 0.000101 * t) + _sin_deg(3 * m) * 0.000289)
+    omega = 125.04 - 1934.136 * t
+    app_long = l0 + c - 0.00569 - 0.00478 * _sin_deg(omega)
+    obliq = (23 + (26 + (21.448 - t * (46.815 + t * (0.00059 - t * 0.001813))) / 60) / 60
+             + 0.00256 * math.cos(math.radians(omega)))
+    decl = math.degrees(math.asin(_sin_deg(obliq) * _sin_deg(app_long)))
+    y = math.tan(math.radians(obliq / 2)) ** 2
+    eq_time = 4 * math.degrees(
+        y * _sin_deg(2 * l0) - 2 * ecc * _sin_deg(m) + 4 * ecc * y * _sin_deg(m) * math.cos(math.radians(2 * l0))
+        - 0.5 * y * y * _sin_deg(4 * l0) - 1.25 * ecc * ecc * _sin_deg(2 * m))
+    cos_ha = (math.cos(math.radians(90.833)) / (math.cos(math.radians(lat)) * math.cos(math.radians(decl)))
+              - math.tan(math.radians(lat)) * math.tan(math.radians(decl)))
+    if not -1 <= cos_ha <= 1:
+        return None, None
+    ha = math.degrees(math.acos(cos_ha))
+    noon = 720 - 4 * lon - eq_time
+    return noon - 4 * ha, noon + 4 * ha
+
+
+def _hhmm(minutes_utc: Optional[float]) -> Optional[str]:
+    if minutes_utc is None:
+        return None
+    total = int(round(minutes_utc + KST.total_seconds() / 60)) % (24 * 60)
+    return f"{total // 60:02d}:{total % 60:02d}"
+
+
+def sun_times(d: date, lat: float, lon: float) -> Dict[str, Optional[str]]:
+    """KST 일출/일몰 ('HH:MM')"""
+    rise, set_ = _sun_event_minutes(d, lat, lon)
+    return {"sunrise": _hhmm(rise), "sunset": _hhmm(set_)}
+
+
+def day_info(d: date, lat: Optional[float] = None, lon: Optional[float] = None) -> Dict:
+    """날짜·항구 좌표의 음력일, 물때, 일출/일몰"""
+    scheme = scheme_for(lat)
+    info = {
+        "date": d.isoformat(),
+        "lunar_day": lunar_day(d),
+        "tide": tide_phase(d, scheme),
+        "scheme": f"{scheme}물때식",
+        "sunrise": None,
+        "sunset": None,
+    }
+    if lat is not None and lon is not None:
+        info.update(sun_times(d, lat, lon))
+    return info
@@ -0,0 +1,7 @@
+import os
+import sys
+
+# src/ 의 모듈(db, models, services ...)을 테스트에서 바로 import 할 수 있도록 경로 추가
+SRC_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src'))
+if SRC_ROOT not in sys.path:
+    sys.path.insert(0, SRC_ROOT)
@@ -0,0 +1,64 @@
+from datetime import date
+
+from services.badatime import numeric_series, parse_sea_temp, parse_week
+
+HOURS = [0, 6, 12, 18]
+
+
+def _week_html(days):
+    n = days * len(HOURS)
+
+    def row(label, cells):
+        return '<tr><td>%s</td>%s</tr>' % (label, ''.join('<td>%s</td>' % c for c in cells))
+
+    body = ''.join([
+        row('날짜', ['%02d시' % h for h in HOURS] * days),
+        row('', [''] * n),
+        row('날씨', ['맑음'] * n),
+        row('기온', ['%d℃' % i for i in range(n)]),
+        row('풍향', ['북서'] * n),
+        row('풍속', ['2.5m/s'] * n),
+        row('파고', ['0.5m'] * n),
+        row('습도', ['60%'] * n),
+        row('강수', ['-'] * n),
+    ])
+    return '<div class="week_container"><table class="week_table"><tbody>%s</tbody></table></div>' % body
+
+
+def test_week_is_split_by_date_when_hours_wrap():
+    by_date = parse_week(_week_html(3), date(2025, 11, 30))
+    assert list(by_date) == ['2025-11-30', '2025-12-01', '2025-12-02']
+    assert [r['time'] for r in by_date['2025-12-01']] == ['00시', '06시', '12시', '18시']
+
+
+def test_numeric_series():
+    series = numeric_series(parse_week(_week_html(1), date(2025, 11, 22))['2025-11-22'])
+    assert series['hour'] == [0.0, 6.0, 12.0, 18.0]
+    assert series['temperature'] == [0.0, 1.0, 2.0, 3.0]
+    assert series['wind_speed'][0] == 2.5
+    assert series['precipitation'] == [None] * 4
+
+
+def test_sea_temp_markers_from_map_script():
+    overlay = ("var content = '<div style=\"font-weight:600;\">여수 <span style=\"font-size:15px\">15.2℃</span>"
+               "<div style=\"font-size:12px\">11-22 14:00</div></div>';\n"
+               "  var position = new daum.maps.LatLng(34.74, 127.76);")
+    page = '<script>var mapOption = { center: new daum.maps.LatLng(34.7, 127.7) };\n%s</script>' % overlay
+    info = parse_sea_temp(page)
+    assert info['center'] == {'lat': 34.7, 'lng': 127.7}
+    assert info['markers'] == [{'name': '여수', 'temp': '15.2℃', 'temp_c': 15.2, 'time': '11-22 14:00',
+                                'lat': 34.74, 'lng': 127.76}]
+
+
+def test_sea_temp_cache_evicts_expired_and_caps_size(monkeypatch):
+    from services import badatime
+
+    monkeypatch.setattr(badatime, '_sea_temp_cache', {})
+    monkeypatch.setattr(badatime, 'SEA_TEMP_CACHE_MAX_ENTRIES', 2)
+    badatime.remember_sea_temp(1, {'markers': []}, ttl=10, now=0)
+    badatime.remember_sea_temp(2, {'markers': []}, ttl=10, now=20)
+    assert list(badatime._sea_temp_cache) == [2]
+    badatime.remember_sea_temp(3, {'markers': []}, ttl=10, now=21)
+    badatime.remember_sea_temp(4, {'markers': []}, ttl=10, now=22)
+    assert list(badatime._sea_temp_cache) == [3, 4]
+    assert badatime.cached_sea_temp(4, ttl=10, now=25) == {'markers': []}
@@ -0,0 +1,117 @@
+import pytest
+
+from db import db as _db
+
+
+@pytest.fixture
+def app(monkeypatch):
+    monkeypatch.setenv('DATABASE_URL', 'sqlite://')
+    monkeypatch.setenv('AUTO_MIGRATE', '0')
+    from app import create_app
+    app = create_app()
+    with app.app_context():
+        yield app
+        _db.session.remove()
+
+
+def test_note_only_reimport_keeps_learned_parser(app):
+    from db import update_parser_types, upsert_boats
+    from models import Boat
+
+    assert upsert_boats([{'name': '금강호', 'city': '보령', 'port': '오천항', 'url': 'http://a.test/?b=1', 'note': None}]) == (1, 0)
+    boat = Boat.query.filter_by(name='금강호').one()
+    update_parser_types({boat.id: 'sunsang24'})
+
+    assert upsert_boats([{'name': '금강호', 'city': None, 'port': None, 'url': None, 'note': '메모'}]) == (0, 1)
+    _db.session.expire_all()
+    boat = Boat.query.filter_by(name='금강호').one()
+    assert (boat.note, boat.parser_type) == ('메모', 'sunsang24')
+
+    # URL 이 바뀌면 파생 컬럼을 다시 계산
+    upsert_boats([{'name': '금강호', 'url': 'http://b.test/?b=1', 'note': None}])
+    _db.session.expire_all()
+    boat = Boat.query.filter_by(name='금강호').one()
+    assert boat.host == 'b.test'
+    assert boat.parser_type != 'sunsang24'
+
+
+def _add_boats(rows):
+    from db import upsert_boats
+    upsert_boats([{'name': n, 'city': c, 'port': '항', 'url': f'http://a.test/?b={i}', 'note': None}
+                  for i, (n, c) in enumerate(rows)])
+
+
+def test_get_boats_filters_regions_in_query(app):
+    from db import count_boats_by_city, get_boats
+
+    _add_boats([('금강호', '보령'), ('바다호', '태안'), ('은성호', '보령'), ('무명호', '')])
+    assert [b.name for b in get_boats(['보령'])] == ['금강호', '은성호']
+    assert len(get_boats()) == 4
+    assert count_boats_by_city() == {'보령': 2, '태안': 1}
+
+
+def test_bulk_delete_reports_missing_ids(app):
+    from db import bulk_delete_boats, get_boats
+
+    _add_boats([('금강호', '보령'), ('바다호', '태안')])
+    ids = [b.id for b in get_boats()]
+    assert bulk_delete_boats([ids[0], 999, ids[0]]) == ([ids[0]], [999])
+    assert [b.id for b in get_boats()] == [ids[1]]
+
+
+def test_csv_export_streams_boats_in_chunks(app, monkeypatch):
+    import csv
+    import io
+
+    from services import boat_excel
+
+    monkeypatch.setattr(boat_excel, 'EXPORT_CHUNK_SIZE', 64)
+    _add_boats([(f'배{i}', '보령') for i in range(20)])
+    resp = app.test_client().get('/download_csv', buffered=False)
+    assert resp.is_streamed
+    chunks = list(resp.response)
+    assert len(chunks) > 1
+
+    rows = list(csv.reader(io.StringIO(b''.join(chunks).decode('utf-8-sig'))))
+    assert rows[0] == boat_excel.EXCEL_HEADERS
+    assert [r[3] for r in rows[1:]] == [f'배{i}' for i in range(20)]
+
+
+@pytest.mark.parametrize('upsert', [True, False])
+def test_sea_temp_readings_count_only_inserted_rows(app, monkeypatch, upsert):
+    import db
+    from db import get_sea_temp_history, save_sea_temp_readings, utc_now
+
+    if not upsert:
+        # ON CONFLICT 를 지원하지 않는 DB 의 경로
+        monkeypatch.setattr(db, '_upsert_insert', lambda table: None)
+
+    now = utc_now()
+    row = {'name': '여수', 'observed': '2025-11-22 14:00', 'fetched_at': now, 'temp_c': 15.2, 'lat': 34.7, 'lng': 127.7}
+    assert save_sea_temp_readings([row, dict(row, temp_c=15.3), dict(row, name='통영')]) == 2
+    assert save_sea_temp_readings([row, dict(row, observed='2025-11-22 15:00')]) == 1
+    assert len(get_sea_temp_history(now)) == 3
+
+
+def test_tide_cache_needs_the_whole_week(app, monkeypatch):
+    from types import SimpleNamespace
+
+    import requests
+    from db import save_tide_forecasts, utc_now
+
+    fetched = []
+    monkeypatch.setattr(requests, 'get', lambda url, **kw: fetched.append(url) or SimpleNamespace(status_code=503))
+    days = [f'2025-11-{d}' for d in range(22, 29)]
+    save_tide_forecasts({'port_id': 7, 'forecast_date': d, 'fetched_at': utc_now(), 'source_url': f'http://tide.test/{d}',
+                         'rows_json': '[{"time": "06시"}]'} for d in days)
+    client = app.test_client()
+
+    # 11-23 ~ 11-29 중 11-29 가 없으므로 저장본을 쓰지 않고 다시 받아옴
+    assert client.get('/api/tide?port_id=7&date=2025-11-23').status_code == 502
+    assert fetched == ['https://www.badatime.com/7/tide/2025-11-23']
+
+    fetched.clear()
+    body = client.get('/api/tide?port_id=7&date=2025-11-22').get_json()
+    assert fetched == []
+    assert body['cached'] and body['source_url'] == 'http://tide.test/2025-11-22'
+    assert [w['date'] for w in body['week']] == days
@@ -0,0 +1,122 @@
+from types import SimpleNamespace
+
+from services.host_stats import DEAD_AFTER_FAILURES, HostStats
+from services.scrape_engine import interleave_by_host
+
+
+def _boat(i, host):
+    return SimpleNamespace(id=i, url=f'http://{host}/?mid=bk&b={i}', host=host)
+
+
+def test_slow_hosts_first_dead_hosts_last():
+    stats = HostStats()
+    stats.record('fast.test', 100, False)
+    stats.record('slow.test', 3000, False)
+    for _ in range(DEAD_AFTER_FAILURES):
+        stats.record('dead.test', 10000, True)
+
+    boats = [_boat(1, 'dead.test'), _boat(2, 'fast.test'), _boat(3, 'slow.test'), _boat(4, 'fast.test')]
+    assert [b.host for b in interleave_by_host(boats, stats)] == ['slow.test', 'fast.test', 'dead.test', 'fast.test']
+    assert stats.is_dead('dead.test')
+
+    # 한 번이라도 성공하면 다시 정상 host
+    stats.record('dead.test', 500, False)
+    assert not stats.is_dead('dead.test')
+
+
+def test_hedged_call_uses_duplicate_when_first_stalls(monkeypatch):
+    import itertools
+    import time
+
+    from services import hedging
+
+    monkeypatch.setattr(hedging.HOSTS, 'percentile_ms', lambda host, q=0.9: 50.0)
+    monkeypatch.setitem(hedging._settings, 'enabled', True)
+    calls = itertools.count()
+
+    def stalls_once():
+        if next(calls) == 0:
+            time.sleep(1.0)
+            return 'slow'
+        return 'fast'
+
+    started = time.perf_counter()
+    assert hedging.hedged_call(stalls_once, 'stall.test') == ('fast', True)
+    assert time.perf_counter() - started < 0.5
+
+
+def test_aimd_limiter_grows_on_success_and_halves_on_failure():
+    from services.concurrency import AIMDLimiter
+
+    limiter = AIMDLimiter(4, min_limit=1, max_limit=16, cooldown_seconds=1.0, scope='test')
+    for _ in range(8):
+        limiter.acquire()
+        limiter.release(latency_ms=100, now=0)
+    assert limiter.limit == 5
+
+    limiter.acquire()
+    limiter.release(failed=True, now=10)
+    assert limiter.limit == 2
+    # cooldown 안의 연속 실패는 한 번만 반영
+    limiter.acquire()
+    limiter.release(failed=True, now=10.5)
+    assert limiter.limit == 2
+
+    # 평소보다 훨씬 느린 응답도 감소 신호
+    limiter.acquire()
+    limiter.release(latency_ms=1000, now=20)
+    assert limiter.limit == 2 and limiter._limit < 2.6
+
+
+def test_oversized_page_is_too_large_not_network_failure(monkeypatch):
+    import datetime
+
+    from services import reservation_checker
+    from services.host_stats import is_host_failure
+
+    class HugeResponse:
+        status_code = 200
+        headers = {'Content-Type': 'text/html'}
+        elapsed = datetime.timedelta(milliseconds=5)
+
+        def iter_content(self, size):
+            while True:
+                yield b'<p>' * size
+
+        def close(self):
+            pass
+
+    monkeypatch.setattr(reservation_checker, 'MAX_RESPONSE_BYTES', 64 * 1024)
+    monkeypatch.setattr(reservation_checker.requests, 'get', lambda *a, **kw: HugeResponse())
+    result = reservation_checker.fetch_page('http://huge.test/?mid=bk', 2025, 11, 22)
+
+    assert result['error'].startswith('too_large:')
+    assert not is_host_failure(result)
+
+
+def test_forbidden_then_retry_closes_both_responses(monkeypatch):
+    import datetime
+
+    from services import reservation_checker
+
+    class FakeResponse:
+        headers = {'Content-Type': 'text/html; charset=utf-8'}
+        elapsed = datetime.timedelta(milliseconds=5)
+
+        def __init__(self, status_code):
+            self.status_code = status_code
+            self.closed = False
+
+        def iter_content(self, size):
+            yield b'<html><body></body></html>'
+
+        def close(self):
+            self.closed = True
+
+    responses = [FakeResponse(403), FakeResponse(200)]
+    sent = iter(responses)
+    monkeypatch.setattr(reservation_checker.requests, 'get', lambda *a, **kw: next(sent))
+    result = reservation_checker.fetch_page('https://forbidden.test/?mid=bk', 2025, 11, 22)
+
+    assert 'error' not in result
+    assert [r.closed for r in responses] == [True, True]
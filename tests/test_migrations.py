@@ -0,0 +1,48 @@
+import sqlite3
+
+from sqlalchemy import create_engine, inspect
+
+from migrations import MIGRATIONS, upgrade
+
+
+def _legacy_db(path):
+    # note 컬럼/인덱스가 없던 초기 boats 스키마
+    conn = sqlite3.connect(path)
+    conn.execute("CREATE TABLE boats (id INTEGER PRIMARY KEY, name VARCHAR(255) NOT NULL UNIQUE, "
+                 "url VARCHAR(2083) NOT NULL, city VARCHAR(100) NOT NULL, port VARCHAR(100) NOT NULL, "
+                 "created_at DATETIME)")
+    conn.execute("INSERT INTO boats (name, url, city, port) VALUES ('금강호', 'http://A.test/?mid=bk&year=2025', '보령', '오천항')")
+    conn.commit()
+    conn.close()
+
+
+def test_upgrade_legacy_db_is_idempotent(tmp_path):
+    path = tmp_path / 'boats.db'
+    _legacy_db(path)
+    engine = create_engine(f"sqlite:///{path}")
+
+    applied = upgrade(engine, log=None)
+    assert applied == [m[0] for m in MIGRATIONS]
+    assert upgrade(engine, log=None) == []
+
+    insp = inspect(engine)
+    assert 'note' in {c['name'] for c in insp.get_columns('boats')}
+    assert 'ix_boats_city' in {i['name'] for i in insp.get_indexes('boats')}
+    with engine.connect() as conn:
+        assert conn.exec_driver_sql("SELECT count(*) FROM boats").scalar() == 1
+        # 마이그레이션 3 이 기존 행의 파생 컬럼을 채움
+        assert conn.exec_driver_sql("SELECT host, base_url, parser_type FROM boats").one() == (
+            'a.test', 'http://a.test/?mid=bk', 'board')
+
+
+def test_upgrade_creates_added_tables_with_constraints(tmp_path):
+    path = tmp_path / 'boats.db'
+    _legacy_db(path)
+    engine = create_engine(f"sqlite:///{path}")
+    upgrade(engine, log=None)
+
+    insp = inspect(engine)
+    assert {u['name'] for u in insp.get_unique_constraints('status_snapshots')} == {'uq_status_snapshots_boat_date'}
+    assert 'ix_status_snapshots_query_date' in {i['name'] for i in insp.get_indexes('status_snapshots')}
+    assert {u['name'] for u in insp.get_unique_constraints('tide_forecasts')} == {'uq_tide_forecasts_port_date'}
+    assert 'ix_sea_temp_readings_fetched_at' in {i['name'] for i in insp.get_indexes('sea_temp_readings')}
@@ -0,0 +1,56 @@
+import os
+
+import pytest
+
+from services.parser_corpus import discover_captures, load_capture, load_golden, parse_capture, summarize
+
+CAPTURES = discover_captures()
+GOLDEN = load_golden()
+
+
+@pytest.mark.parametrize('path', CAPTURES, ids=os.path.basename)
+def test_capture_matches_golden(path):
+    capture = load_capture(path)
+    expected = GOLDEN[capture['name']]
+
+    assert summarize(parse_capture(capture)) == expected
+    # 기억된 어댑터로 바로 파싱해도 결과가 같아야 함
+    assert summarize(parse_capture(capture, parser_type=expected['parser'])) == expected
+
+
+@pytest.mark.parametrize('path', CAPTURES, ids=os.path.basename)
+def test_stream_cutoff_keeps_result(path):
+    """대상 날짜 블록이 닫힌 곳에서 수신을 멈춰도 파싱 결과는 같아야 함"""
+    from services.reservation_checker import DayBlockWatcher
+
+    capture = load_capture(path)
+    watcher = DayBlockWatcher(capture['url'], capture['year'], capture['month'], capture['day'])
+    content = capture['content']
+    for i in range(0, len(content), 4096):
+        if watcher.feed(content[i:i + 4096]):
+            break
+    truncated = dict(capture, content=bytes(watcher.buf))
+    assert summarize(parse_capture(truncated)) == GOLDEN[capture['name']]
+
+
+def test_choose_encoding_prefers_header_then_meta_then_host_cache():
+    from services.reservation_checker import choose_encoding
+
+    body = '<html><head><meta charset="euc-kr"></head><body>쭈꾸미</body></html>'.encode('cp949')
+    assert choose_encoding('http://enc-a.test/', 'text/html; charset=UTF-8', body) == ('utf-8', 'header')
+    assert choose_encoding('http://enc-b.test/', 'text/html', body) == ('cp949', 'meta')
+    # 헤더/meta 가 없으면 같은 host 에서 앞서 정한 값을 재사용
+    assert choose_encoding('http://enc-b.test/x', 'text/html', '<p>쭈꾸미</p>'.encode('cp949')) == ('cp949', 'host_cache')
+    assert choose_encoding('http://enc-c.test/', '', b'<p>x</p>', apparent=lambda: 'utf-8') == ('utf-8', 'detected')
+
+
+def test_ascii_page_does_not_pin_host_encoding():
+    from services.reservation_checker import choose_encoding, decode_body
+
+    # 영문만 있는 오류 페이지 뒤에 한글 페이지가 와도 다시 추정
+    assert choose_encoding('http://enc-d.test/err', '', b'<p>Not Found</p>', apparent=lambda: 'ascii') == \
+        ('ascii', 'detected')
+    korean = '<p>쭈꾸미 예약가능</p>'.encode('utf-8')
+    encoding, source = choose_encoding('http://enc-d.test/list', '', korean, apparent=lambda: 'utf-8')
+    assert (encoding, source) == ('utf-8', 'detected')
+    assert '쭈꾸미' in decode_body(korean, encoding)
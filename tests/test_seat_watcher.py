@@ -0,0 +1,92 @@
+from types import SimpleNamespace
+
+import pytest
+
+from services.seat_watcher import SeatWatcher, QueueSink
+
+BOAT = SimpleNamespace(id=1, name='금강호', city='보령', port='오천항', url='http://example.com')
+
+
+def _check(*ships, error=None):
+    out = {'entries': [{'ship_name': n, 'status': s, 'available': a} for n, s, a in ships]}
+    if error:
+        out['error'] = error
+    return out
+
+
+def test_first_observation_is_baseline_only():
+    sink = QueueSink()
+    watcher = SeatWatcher([sink])
+    assert watcher.observe(BOAT, '2025-11-22', _check(('금강1호', 'open', 3))) == []
+    assert sink.drain() == []
+
+
+def test_emits_only_deltas():
+    sink = QueueSink()
+    watcher = SeatWatcher([sink])
+    watcher.observe(BOAT, '2025-11-22', _check(('금강1호', 'full', 0), ('금강2호', 'open', 5), ('금강3호', 'open', 2)))
+    watcher.observe(BOAT, '2025-11-22', _check(('금강1호', 'open', 2), ('금강2호', 'open', 4), ('금강3호', 'full', 0)))
+    events = {e['ship_name']: e for e in sink.drain()}
+    assert events['금강1호']['type'] == 'opened'
+    assert events['금강2호']['type'] == 'seats_changed'
+    assert events['금강2호']['prev_available'] == 5
+    assert events['금강3호']['type'] == 'closed'
+
+    # 변화가 없으면 이벤트도 없음
+    watcher.observe(BOAT, '2025-11-22', _check(('금강1호', 'open', 2), ('금강2호', 'open', 4), ('금강3호', 'full', 0)))
+    assert sink.drain() == []
+
+
+def test_errors_do_not_look_like_closures():
+    watcher = SeatWatcher()
+    watcher.observe(BOAT, '2025-11-22', _check(('금강1호', 'open', 2)))
+    assert watcher.observe(BOAT, '2025-11-22', _check(error='http_status:500')) == []
+    assert watcher.observe(BOAT, '2025-11-22', _check(('금강1호', 'open', 2))) == []
+
+
+def test_live_hub_prunes_past_and_stale_subscriptions(monkeypatch):
+    from services.live_updates import LiveStatusHub
+
+    monkeypatch.setattr(LiveStatusHub, '_ensure_loop', lambda self: None)
+    hub = LiveStatusHub(None, SeatWatcher([]), push_ttl=100, max_push_subscriptions=2)
+    past = hub.subscribe('2025-11-20')
+    hub.subscribe('2025-11-22')
+    for i in range(3):
+        hub.add_push_subscription({'endpoint': f'e{i}'}, '2025-11-22')
+    assert hub.subscriber_count() == 4  # 가장 오래된 push 구독은 한도 초과로 제거
+
+    now = past.created + 50
+    assert hub.prune(now=now, today='2025-11-21') == 1
+    assert past.closed
+    assert hub.prune(now=now + 100, today='2025-11-21') == 2
+    assert hub.subscriber_count() == 1
+
+
+def test_live_hub_caps_and_times_out_sse_streams(monkeypatch):
+    from services.live_updates import LiveStatusHub, SubscriptionLimitReached
+
+    monkeypatch.setattr(LiveStatusHub, '_ensure_loop', lambda self: None)
+    hub = LiveStatusHub(None, SeatWatcher([]), sse_ttl=100, sse_idle_timeout=0.05, max_sse_subscriptions=1)
+    sub = hub.subscribe('2999-01-01')
+    with pytest.raises(SubscriptionLimitReached):
+        hub.subscribe('2999-01-01')
+
+    # 이벤트 없이 idle timeout 이 지나면 스트림이 끝나고 자리가 빔
+    assert list(hub.stream(sub, heartbeat=0.01))[0].startswith('event: ready')
+    assert hub.subscriber_count() == 0
+    sub = hub.subscribe('2999-01-01')
+    assert not sub.expired('2025-11-21', sub.created + 50)
+    assert sub.expired('2025-11-21', sub.created + 101)
+
+
+def test_queue_sink_cursor_serves_every_reader():
+    sink = QueueSink(maxlen=3)
+    sink.emit([{'n': 1}, {'n': 2}])
+    first, cursor = sink.since(0)
+    again, _ = sink.since(0)
+    assert [e['n'] for e in first] == [e['n'] for e in again] == [1, 2]
+    sink.emit([{'n': 3}, {'n': 4}])
+    newer, cursor = sink.since(cursor)
+    assert [e['n'] for e in newer] == [3, 4] and cursor == 4
+    assert sink.since(cursor) == ([], 4)
+    assert [e['n'] for e in sink.since(0)[0]] == [2, 3, 4]  # maxlen 초과분은 밀려남
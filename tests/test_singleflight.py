@@ -0,0 +1,47 @@
+from concurrent.futures import ThreadPoolExecutor
+from types import SimpleNamespace
+import threading
+import time
+
+from services import scrape_engine
+from services.singleflight import SingleFlight
+
+
+def test_concurrent_calls_share_one_run():
+    flights = SingleFlight()
+    calls = []
+
+    def slow(x):
+        calls.append(x)
+        time.sleep(0.1)
+        return x * 2
+
+    with ThreadPoolExecutor(max_workers=5) as pool:
+        outcomes = list(pool.map(lambda _: flights.do('k', slow, 21), range(5)))
+
+    assert calls == [21]
+    assert [value for value, _ in outcomes] == [42] * 5
+    assert sum(1 for _, shared in outcomes if shared) == 4
+    assert flights.in_flight() == 0
+
+
+def test_identical_scrapes_fetch_each_boat_once(monkeypatch):
+    boats = [SimpleNamespace(id=i, name=f'배{i}', url=f'http://op{i % 2}.test/?mid=bk&b={i}', city='보령',
+                             port='오천항', host=f'op{i % 2}.test', parser_type=None) for i in range(4)]
+    calls = []
+    lock = threading.Lock()
+
+    def fake_check(url, *args, **kwargs):
+        with lock:
+            calls.append(url)
+        time.sleep(0.1)
+        return {'entries': [{'ship_name': url}], 'parser': 'admin_right'}
+
+    monkeypatch.setattr(scrape_engine, 'check_single_boat', fake_check)
+    with ThreadPoolExecutor(max_workers=3) as pool:
+        runs = list(pool.map(lambda _: scrape_engine.scrape_boats(boats, 2025, 11, 22, parse_workers=0), range(3)))
+
+    assert sorted(calls) == sorted(b.url for b in boats)
+    for results in runs:
+        assert sorted(check['entries'][0]['ship_name'] for _, check in results) == sorted(b.url for b in boats)
+    assert scrape_engine.FLIGHTS.in_flight() == 0
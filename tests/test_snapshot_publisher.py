@@ -0,0 +1,41 @@
+from types import SimpleNamespace
+import gzip
+import json
+import os
+
+from services.snapshot_publisher import publish
+
+
+def _boat(i, city):
+    return SimpleNamespace(id=i, name=f'배{i}', url=f'http://op.test/{i}', city=city, port='오천항')
+
+
+def test_publish_writes_region_and_all_files(tmp_path):
+    results = [
+        (_boat(1, '보령'), {'entries': [{'ship_name': 'A', 'status': 'full'},
+                                        {'ship_name': 'B', 'status': 'open', 'available': 3}]}),
+        (_boat(2, '태안'), {'entries': [], 'error': 'http_error:timeout'}),
+    ]
+    publish(results, '2025-11-22', str(tmp_path), formats=('gzip',))
+
+    day_dir = tmp_path / '2025-11-22'
+    assert sorted(os.listdir(day_dir)) == ['보령.json', '보령.json.gz', '전체.json', '전체.json.gz',
+                                           '태안.json', '태안.json.gz']
+    boryeong = json.loads((day_dir / '보령.json').read_text(encoding='utf-8'))
+    assert [r['ship_name'] for r in boryeong['rows']] == ['B', 'A']
+    assert json.loads((day_dir / '태안.json').read_text(encoding='utf-8'))['rows'] == []
+    assert json.loads(gzip.decompress((day_dir / '전체.json.gz').read_bytes()))['count'] == 2
+
+
+def test_partial_publish_keeps_all_file(tmp_path):
+    publish([(_boat(1, '보령'), {'entries': [{'ship_name': 'A', 'status': 'open'}]})],
+            '2025-11-22', str(tmp_path), formats=(), regions=['보령', '인천'])
+    assert sorted(os.listdir(tmp_path / '2025-11-22')) == ['보령.json', '인천.json']
+
+
+def test_unsafe_or_unknown_regions_are_not_written(tmp_path):
+    out = tmp_path / 'out'
+    publish([], '2025-11-22', str(out), formats=(), regions=['../../escaped', 'a\\b', '.hidden', '없는지역', '보령'],
+            known_regions=['보령', '태안'])
+    assert not (tmp_path / 'escaped.json').exists()
+    assert sorted(os.listdir(out / '2025-11-22')) == ['보령.json']
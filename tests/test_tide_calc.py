@@ -0,0 +1,17 @@
+from datetime import date
+
+from services import tide_calc
+
+
+def test_new_moon_matches_meeus_example():
+    # Meeus 예제 49.a: 1977년 2월 18일 삭 (k = -283)
+    assert tide_calc.new_moon_utc(-283).date() == date(1977, 2, 18)
+
+
+def test_tide_phase_matches_captured_pages():
+    # 오천항 캡처 페이지의 물때 표기
+    assert tide_calc.lunar_day(date(2025, 11, 22)) == 3
+    assert tide_calc.tide_phase(date(2025, 11, 22)) == '9물'
+    assert tide_calc.tide_phase(date(2025, 11, 7)) == '9물'
+    assert tide_calc.tide_phase(date(2025, 11, 27), tide_calc.SCHEME_WEST) == '조금'
+    assert tide_calc.tide_phase(date(2025, 11, 27), tide_calc.SCHEME_SOUTH) == '조금'